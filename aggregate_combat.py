@@ -0,0 +1,264 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Final, List, Optional, Tuple
+import numpy as np
+
+from data_globals import DAMAGE_BEAM, DAMAGE_CANNON, DAMAGE_TORPEDO
+from game_events import ShipDamaged
+from ship_class import ShipCapability
+
+if TYPE_CHECKING:
+    from starship import Starship
+    from torpedo import Torpedo
+
+# the weapons that a ship can use in an off screen battle, in the order of the columns of OffScreenBattle.output
+BATTLE_DAMAGE_TYPES:Final = (DAMAGE_BEAM, DAMAGE_CANNON, DAMAGE_TORPEDO)
+
+TORPEDO_COLUMN:Final = 2
+
+def get_damage_type_values(name:str):
+    """Returns one of the values of BATTLE_DAMAGE_TYPES as an array, so that it can be looked up with the weapon that each ship used.
+    
+    Args:
+        name (str): The name of the value, such as "damage_vs_hull_multiplier".
+    
+    Returns:
+        np.ndarray: The value for each damage type.
+    """
+    return np.array([getattr(damage_type, name) for damage_type in BATTLE_DAMAGE_TYPES], dtype=np.float64)
+
+def can_fire_weapons(ship:Starship):
+    """Checks if the ship has a weapon that it could use in an off screen battle.
+    
+    Args:
+        ship (Starship): The ship in question.
+    
+    Returns:
+        bool: True if it has.
+    """
+    capabilities = ship.capabilities
+    
+    has_energy = ship.power_generator.energy > 0
+    
+    return bool(
+        (capabilities & ShipCapability.BEAM_ARRAY and has_energy and ship.beam_array.is_opperational) or
+        (capabilities & ShipCapability.CANNONS and has_energy and ship.cannons.is_opperational) or
+        (capabilities & ShipCapability.TORPEDOS and ship.torpedo_launcher.can_fire_torpedos)
+    )
+
+class OffScreenBattle:
+    """Resolves one turn of fighting between AI ships in a sub sector that the player isn't in. Instead of each ship picking an order and rolling every shot with roll_to_hit and take_damage, each ship fires the weapon that would do the most damage at a random hostile ship, using the same hit chances and shield and hull multipliers as the real thing, and the damage to all of the ships is added up at once. The results are then written back into the ships.
+    
+    Since the player can't see what is going on, no messages are printed, and the ship systems are not damaged. Once the player arrives in the sub sector, the ships go back to taking their turns with their AI, see Engine.find_off_screen_battles.
+    
+    Args:
+        ships (List[Starship]): The active, visible ships in the sub sector. There should be ships from both sides.
+        rng (np.random.Generator): The random number generator that is used for the rolls.
+    """
+    
+    def __init__(self, ships:List[Starship], rng:np.random.Generator) -> None:
+        
+        self.ships = ships
+        self.rng = rng
+        
+        n = len(ships)
+        
+        def read(get_value):
+            return np.fromiter((get_value(ship) for ship in ships), dtype=np.float64, count=n)
+        
+        self.is_enemy = np.fromiter((ship.is_enemy for ship in ships), dtype=np.bool_, count=n)
+        self.x = read(lambda ship: ship.local_coords.x)
+        self.y = read(lambda ship: ship.local_coords.y)
+        self.hull = read(lambda ship: ship.hull)
+        self.max_hull = read(lambda ship: ship.ship_class.max_hull)
+        self.size = read(lambda ship: ship.ship_class.size)
+        
+        # shields that are down or can't work count as no shields at all, the same as in Starship.calculate_damage
+        self.shields = read(
+            lambda ship: ship.shield_generator.shields if (
+                ship.capabilities & ShipCapability.SHIELDS and ship.shield_generator.shields_up and
+                ship.shield_generator.get_effective_value > 0 and ship.ship_status.do_shields_work
+            ) else 0
+        )
+        self.max_shields = read(lambda ship: ship.ship_class.max_shields)
+        
+        self.able_crew = read(
+            lambda ship: ship.life_support.able_crew if ship.capabilities & ShipCapability.CREW else 0
+        )
+        crew_readyness = read(
+            lambda ship: ship.life_support.crew_readyness if ship.capabilities & ShipCapability.CREW else 1
+        )
+        self.evasion = read(
+            lambda ship: ship.ship_class.evasion * ship.impulse_engine.get_effective_value
+            if ship.capabilities & ShipCapability.IMPULSE else 0.0
+        ) * crew_readyness
+        
+        self.output = np.zeros((n, len(BATTLE_DAMAGE_TYPES)), dtype=np.float64)
+        """The damage that each ship would do with each of its weapons this turn.
+        """
+        self.energy_cost = np.zeros((n, len(BATTLE_DAMAGE_TYPES)), dtype=np.float64)
+        self.attack_value = np.zeros((n, len(BATTLE_DAMAGE_TYPES)), dtype=np.float64)
+        
+        self.torpedos:List[Optional[Tuple[Torpedo, int]]] = [None] * n
+        """The type and number of torpedos that each ship would fire.
+        """
+        for row, ship in enumerate(ships):
+            
+            capabilities = ship.capabilities
+            energy = ship.power_generator.energy
+            sensors = ship.sensors.get_effective_value
+            
+            targeting = crew_readyness[row] * ship.ship_class.targeting
+            
+            if capabilities & ShipCapability.BEAM_ARRAY and ship.beam_array.is_opperational:
+                
+                beam_array = ship.beam_array.get_effective_value
+                
+                # the same systems that get_to_hit_arguments uses
+                self.attack_value[row, 0] = targeting * (beam_array + sensors) * 0.5
+                
+                cost = min(energy, ship.ship_class.max_beam_energy)
+                
+                self.energy_cost[row, 0] = cost
+                self.output[row, 0] = cost * beam_array
+            
+            if capabilities & ShipCapability.CANNONS and ship.cannons.is_opperational:
+                
+                cannons = ship.cannons.get_effective_value
+                
+                self.attack_value[row, 1] = targeting * (cannons + sensors) * 0.5
+                
+                cost = min(energy, ship.ship_class.max_cannon_energy)
+                
+                self.energy_cost[row, 1] = cost
+                self.output[row, 1] = cost * cannons
+            
+            if capabilities & ShipCapability.TORPEDOS and ship.torpedo_launcher.can_fire_torpedos:
+                
+                torpedo_launcher = ship.torpedo_launcher
+                
+                torpedo, number = torpedo_launcher.get_most_powerful_torp_avaliable()
+                
+                number = min(number, torpedo_launcher.get_no_of_avalible_torp_tubes())
+                
+                self.torpedos[row] = (torpedo, number)
+                
+                self.attack_value[row, TORPEDO_COLUMN] = targeting * (torpedo_launcher.get_effective_value + sensors) * 0.5
+                self.output[row, TORPEDO_COLUMN] = number * torpedo.damage
+    
+    def resolve(self):
+        """Has every ship fire once, and writes the damage, the energy and torpedos that were used, and any crew losses back into the ships. Ships that are destroyed are destroyed with Starship.destroy.
+        """
+        rng = self.rng
+        
+        n = len(self.ships)
+        
+        rows = np.arange(n)
+        
+        hostile = self.is_enemy[:, np.newaxis] != self.is_enemy[np.newaxis, :]
+        
+        # each ship uses the weapon that would do the most damage to an unshielded hull
+        weapon = np.argmax(self.output * get_damage_type_values("damage_vs_no_shield_multiplier"), axis=1)
+        
+        amount = self.output[rows, weapon]
+        
+        firing = (amount > 0) & hostile.any(axis=1)
+        
+        # each ship picks one of the hostile ships at random
+        target = np.argmax(np.where(hostile, rng.random((n, n)), -1.0), axis=1)
+        
+        distance = np.hypot(self.x[target] - self.x, self.y[target] - self.y)
+        
+        distance_penalty = (
+            get_damage_type_values("accuracy_loss_per_distance_unit")[weapon] * distance +
+            get_damage_type_values("flat_accuracy_loss")[weapon]
+        ) / self.size[target]
+        
+        # get_to_hit_arguments passes an estimated_enemy_impulse of -1 for energy weapons, so only torpedos can be
+        # dodged
+        impulse = np.where(weapon == TORPEDO_COLUMN, 1.0, -1.0) * self.evasion[target]
+        
+        hit = firing & (
+            self.attack_value[rows, weapon] + rng.random(n) > impulse + distance_penalty
+        )
+        damage_variation = get_damage_type_values("damage_variation")[weapon]
+        
+        amount = np.where(hit, amount * rng.uniform(1.0 - damage_variation, 1.0), 0.0)
+        
+        shields = self.shields[target]
+        
+        shields_are_up = shields > 0
+        
+        bleedthru_factor = np.where(
+            shields_are_up, np.minimum(shields / np.maximum(self.max_shields[target], 1.0) + 0.5, 1.0), 0.0
+        )
+        shields_dam = amount * bleedthru_factor * get_damage_type_values("damage_vs_shields_multiplier")[weapon]
+        
+        hull_dam = amount * (1.0 - bleedthru_factor) * np.where(
+            shields_are_up,
+            get_damage_type_values("damage_vs_hull_multiplier")[weapon],
+            get_damage_type_values("damage_vs_no_shield_multiplier")[weapon]
+        )
+        # all of the shots land at the same time, so the damage to each ship is added up before it is taken off of
+        # the shields, and whatever the shields can't stop goes through to the hull
+        total_damage = np.bincount(target, weights=amount, minlength=n)
+        total_shields_dam = np.bincount(target, weights=shields_dam, minlength=n)
+        total_hull_dam = np.bincount(target, weights=hull_dam, minlength=n)
+        
+        overflow = np.maximum(total_shields_dam - self.shields, 0.0)
+        
+        total_shields_dam -= overflow
+        total_hull_dam += overflow
+        
+        new_shields = self.shields - total_shields_dam
+        new_hull = self.hull - total_hull_dam
+        
+        crew_lost = np.where(
+            new_hull > 0, self.able_crew * np.minimum(total_hull_dam / self.max_hull, 1.0) * rng.random(n), 0.0
+        )
+        killed_outright = np.round(crew_lost * 0.5).astype(np.int64)
+        wounded = np.round(crew_lost * 0.5).astype(np.int64)
+        
+        # the last ship to hit each target gets the credit for destroying it
+        attacker = np.full(n, -1, dtype=np.intp)
+        attacker[target[hit]] = rows[hit]
+        
+        for row in np.flatnonzero(firing):
+            
+            ship = self.ships[row]
+            
+            if weapon[row] == TORPEDO_COLUMN:
+                
+                torpedo, number = self.torpedos[row]
+                
+                ship.torpedo_launcher.torps[torpedo] -= number
+            else:
+                ship.power_generator.energy -= round(self.energy_cost[row, weapon[row]])
+            
+            ship.turn_repairing = 0
+        
+        for row in np.flatnonzero(total_damage > 0):
+            
+            ship = self.ships[row]
+            
+            was_destroyed = ship.ship_status.is_destroyed
+            
+            # if the shields were counted as down, then they are left alone
+            if total_shields_dam[row] > 0:
+                ship.shield_generator.shields = round(new_shields[row])
+            
+            ship.hull = new_hull[row]
+            ship.hull_damage += total_hull_dam[row] * 0.15
+            
+            if ship.capabilities & ShipCapability.CREW and (killed_outright[row] or wounded[row]):
+                ship.life_support.injuries_and_deaths(int(wounded[row]), int(killed_outright[row]), 0)
+            
+            if ship.turn_repairing > 0:
+                ship.turn_repairing -= 1
+            
+            ship.clear_scan_cache()
+            
+            ship.game_data.event_bus.publish(ShipDamaged(ship.sector_coords.create_coords(), ship, total_damage[row]))
+            
+            if new_hull[row] < 0 and not was_destroyed:
+                
+                ship.destroy(f"Destroyed in a battle with the {self.ships[attacker[row]].name}.")
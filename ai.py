@@ -1,26 +1,112 @@
 from __future__ import annotations
 from collections import Counter
-from random import choices
-from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Dict, Final, Iterable, Optional, Set, Tuple, Union
 from itertools import chain
+from coords import Coords
+import numpy as np
 
 from get_config import CONFIG_OBJECT
 from global_functions import ajust_system_integrity, average
-from data_globals import PLANET_FRIENDLY, PLANET_NEUTRAL, STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED, STATUS_DERLICT, STATUS_HULK, WARP_FACTOR, CloakStatus, ShipStatus
+from data_globals import PLANET_FRIENDLY, PLANET_NEUTRAL, STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED, STATUS_DERLICT, STATUS_HULK, CloakStatus, ShipStatus
 
+from ship_class import ShipCapability
 from order import CloakOrder, MoveOrder, Order, EnergyWeaponOrder, OrderWarning, PolarizeOrder, RechargeOrder, RepairOrder, SelfDestructOrder, TorpedoOrder, TransportOrder, WarpOrder, WarpTravelOrder
 #from space_objects import SubSectorInfo
 
 if TYPE_CHECKING:
     from starship import Starship
-    from space_objects import SubSectorInfo
+    from space_objects import SubSector, SubSectorInfo
     from game_data import GameData
     from ship_class import ShipClass
 
+NEARBYE_SHIP_STATUSES:Final = frozenset({
+    STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED, STATUS_DERLICT, STATUS_HULK
+})
+
+class TacticalContext:
+    """Information about a sub sector that every AI in it needs. It is built once by get_tactical_context and then shared by all of the AIs in the sub sector, until a ship enters, leaves or moves, or the turn ends.
+    
+    The lists only sort ships by nation. Ships can be destroyed or cloak during the turn, so their status is checked each time a list is asked for.
+    """
+    
+    def __init__(self, sub_sector:SubSector) -> None:
+        
+        scenerio = sub_sector.game_data.scenerio
+        
+        enemy_nations = scenerio.get_set_of_enemy_nations
+        allied_nations = scenerio.get_set_of_allied_nations
+        
+        self.ships:Tuple[Starship, ...] = tuple(sub_sector.ships)
+        
+        self.player_allies:Tuple[Starship, ...] = tuple(ship for ship in self.ships if ship.nation in allied_nations)
+        self.player_enemies:Tuple[Starship, ...] = tuple(ship for ship in self.ships if ship.nation in enemy_nations)
+        
+        self.index:Dict[Starship, int] = {ship:i for i, ship in enumerate(self.ships)}
+        
+        positions = np.array(
+            [(ship.local_coords.x, ship.local_coords.y) for ship in self.ships], dtype=float
+        ).reshape(len(self.ships), 2)
+        
+        difference = positions[:, np.newaxis, :] - positions[np.newaxis, :, :]
+        
+        self.distances = np.hypot(difference[..., 0], difference[..., 1])
+        """A matrix of the distance between each pair of ships. The rows and collums are in the same order as ships.
+        """
+    
+    def distance(self, ship:Starship, other_ship:Starship) -> float:
+        try:
+            return float(self.distances[self.index[ship], self.index[other_ship]])
+        except KeyError:
+            return ship.local_coords.distance(coords=other_ship.local_coords)
+    
+    @staticmethod
+    def grab_ships(ships:Iterable[Starship], entity:Starship, accptable_ship_statuses:Set[ShipStatus]):
+        
+        return [ship for ship in ships if ship is not entity and ship.ship_status in accptable_ship_statuses]
+    
+    def get_player_allies(self, entity:Starship):
+        return self.grab_ships(
+            self.player_allies, entity, {STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED}
+        )
+    
+    def get_player_enemies(self, entity:Starship):
+        return self.grab_ships(
+            self.player_enemies, entity, {STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED}
+        )
+    
+    def get_nearbye_ships(self, entity:Starship):
+        return self.grab_ships(self.ships, entity, NEARBYE_SHIP_STATUSES)
+    
+    @staticmethod
+    def get_scans(ships:Iterable[Starship], precision:int, *, scan_for_crew:bool=False, scan_for_systems:bool=False):
+        """Returns a scan of each ship. Scans are cached by the ships themselves, so AIs with the same sensor precision will share the same scans.
+        """
+        return [
+            ship.scan_this_ship(
+                precision=precision, scan_for_crew=scan_for_crew, scan_for_systems=scan_for_systems
+            ) for ship in ships
+        ]
+
+def get_tactical_context(sub_sector:SubSector):
+    """Returns the tactical context of the sub sector, building it if it does not exist yet.
+    """
+    context = sub_sector.tactical_context
+    
+    if context is None:
+        
+        context = TacticalContext(sub_sector)
+        
+        sub_sector.tactical_context = context
+    
+    return context
+
 class BaseAi(Order):
     
     order:Optional[Order]
     
+    use_damage_estimates:bool = False
+    """If True, the calc_* functions will work out the expected damage of an attack directly instead of running simulations. This is much faster, but crew casulties are not taken into account."""
+    
     def __init__(self, entity: Starship):
         
         self.entity = entity
@@ -42,15 +128,24 @@ class BaseAi(Order):
         self.order_dict_size = 0
         
         self.precision = self.entity.sensors.determin_precision
-        try:
-            if self.entity.warp_drive.is_at_warp:
-                wto = WarpTravelOrder(self.entity)
-                wto.perform()
-                return True
-            return False
-        except AttributeError:
-            return False
+        
+        return bool(self.entity.capabilities & ShipCapability.WARP_DRIVE and self.entity.warp_drive.is_at_warp)
     
+    def decide(self) -> Optional[Order]:
+        """Works out what the ship will do this turn. This only looks at the game, it doesn't change it (apart from the scan caches and tactical context of the ships sub sector), so the order can be looked at or thrown away before it is carried out. Any randomness comes from the rng of the ship, so the same game will always give the same orders.
+        
+        Returns:
+            Optional[Order]: The order that the ship will carry out, or None if it will do nothing.
+        """
+        raise NotImplementedError()
+    
+    def perform(self) -> None:
+        
+        order = self.decide()
+        
+        if order is not None:
+            order.perform()
+
     def determin_order(self):
         
         if self.order_dict_size == 0:
@@ -74,21 +169,24 @@ class BaseAi(Order):
                     self.order = tuple(self.order_dict.keys())[0]
                 else:
                     keys = tuple(order_counter.keys())
-                    weights = tuple(order_counter.values())
-                    self.order = choices(population=keys, weights=weights, k=1)[0]
+                    weights = np.fromiter(order_counter.values(), dtype=float)
+                    self.order = keys[self.entity.decision_rng.choice(len(keys), p=weights / weights.sum())]
                     
             except IndexError:
                 pass
     
+    @property
+    def tactical_context(self):
+        return get_tactical_context(self.entity.get_sub_sector)
+    
     def get_player_enemies_in_same_system(self):
-        return [ship for ship in  self.entity.game_data.grab_ships_in_same_sub_sector(
-            self.entity, accptable_ship_statuses={STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED}
-        ) if ship.nation in self.game_data.scenerio.get_set_of_enemy_nations]
+        return self.tactical_context.get_player_enemies(self.entity)
     
     def get_player_allies_in_same_system(self):
-        return [ship for ship in  self.entity.game_data.grab_ships_in_same_sub_sector(
-            self.entity, accptable_ship_statuses={STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED}
-        ) if ship.nation in self.game_data.scenerio.get_set_of_allied_nations]
+        return self.tactical_context.get_player_allies(self.entity)
+    
+    def get_nearbye_ships(self):
+        return self.tactical_context.get_nearbye_ships(self.entity)
     
 def evaluate_scan(scan: Dict[str, Union[int, Tuple, ShipStatus, ShipClass]]):
     try:
@@ -110,16 +208,17 @@ def evaluate_scan(scan: Dict[str, Union[int, Tuple, ShipStatus, ShipClass]]):
     
 def find_unopressed_planets(game_data:GameData, ship:Starship):
 
-    sub_sector_info = game_data.enemy_subsector_info if ship.is_enemy else game_data.player_subsector_info
-
-    for y in sub_sector_info:
-        for x in y:
-            
-            sector:SubSectorInfo = x
+    knowledge = game_data.enemy_sector_knowledge if ship.is_enemy else game_data.player_sector_knowledge
+    
+    known = knowledge.known
+    
+    unopressed = (known["allied_ships"] < 1) & (known["unfriendly_planets"] > 0)
+    
+    unopressed[ship.sector_coords.y, ship.sector_coords.x] = False
 
-            if sector.coords != ship.sector_coords and sector.allied_ships < 1 and sector.unfriendly_planets:
+    for y, x in np.argwhere(unopressed):
 
-                yield sector.coords
+        yield Coords(x=int(x), y=int(y))
 
 def calc_torpedos_easy(
     self:BaseAi, enemies_in_same_system:Iterable[Starship], 
@@ -141,6 +240,7 @@ def calc_torpedos_easy(
             torpedo_order = TorpedoOrder.from_coords(
                 entity=self.entity, amount=times_to_fire, 
                 torpedo=torpedo,
+                cost=times_to_fire * CONFIG_OBJECT.energy_cost_per_torpedo,
                 x=ship.local_coords.x, y=ship.local_coords.y
             )
             self.order_dict[torpedo_order] = 1000
@@ -150,9 +250,9 @@ def calc_torpedos_medium(
     self:BaseAi, enemies_in_same_system:Iterable[Starship], 
     enemy_scans:Iterable[Dict[str, Union[int, Tuple, ShipStatus, ShipClass]]]
 ):
-    try:
+    if self.entity.capabilities & ShipCapability.CLOAK:
         c_value = 300 if self.entity.cloak.cloak_status != CloakStatus.INACTIVE else 100
-    except AttributeError:
+    else:
         c_value = 100
     
     torpedo, number_of_torps = self.entity.torpedo_launcher.get_most_powerful_torp_avaliable()
@@ -164,7 +264,7 @@ def calc_torpedos_medium(
     )
     for ship, scan in zip(enemies_in_same_system, enemy_scans):
         
-        chance_of_hit = self.entity.check_torpedo_los(self.entity.game_data.player)
+        chance_of_hit = self.entity.check_torpedo_los(ship)
         
         if chance_of_hit > 0.0:
             
@@ -173,7 +273,8 @@ def calc_torpedos_medium(
                 torpedo,
                 5,
                 times_to_fire=number_of_torps,
-                target_scan=scan
+                target_scan=scan,
+                use_estimate=self.use_damage_estimates
             )
             torpedo_order = TorpedoOrder.from_coords(
                 entity=self.entity, amount=times_to_fire, 
@@ -200,9 +301,9 @@ def calc_torpedos_hard(
     self:BaseAi, enemies_in_same_system:Iterable[Starship], 
     enemy_scans:Iterable[Dict[str, Union[int, Tuple, ShipStatus, ShipClass]]]
 ):
-    try:
+    if self.entity.capabilities & ShipCapability.CLOAK:
         c_value = 300 if self.entity.cloak.cloak_status != CloakStatus.INACTIVE else 100
-    except AttributeError:
+    else:
         c_value = 100
         
     torpedo, number_of_torps = self.entity.torpedo_launcher.get_most_powerful_torp_avaliable()
@@ -221,10 +322,13 @@ def calc_torpedos_hard(
             averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, ship_kills, crew_kills, averaged_crew_readyness = self.entity.simulate_torpedo_hit(
                 ship, torpedo, 10,
                 times_to_fire=times_to_fire,
-                simulate_systems=True, simulate_crew=True, target_scan=scan
+                simulate_systems=True, simulate_crew=True, target_scan=scan,
+                use_estimate=self.use_damage_estimates
             )
             torpedo_order = TorpedoOrder.from_coords(
                 entity=self.entity, amount=times_to_fire, 
+                torpedo=torpedo,
+                cost=times_to_fire * CONFIG_OBJECT.energy_cost_per_torpedo,
                 x=ship.local_coords.x, y=ship.local_coords.y
             )
             warning = torpedo_order.raise_warning()
@@ -261,16 +365,17 @@ def calc_beam_weapon_medium(
     enemy_scans:Iterable[Dict[str, Union[int, Tuple, ShipStatus, ShipClass]]]
 ):    
     energy_to_use = min(self.entity.beam_array.get_max_effective_beam_firepower, self.entity.power_generator.energy)
-    try:
+    if self.entity.capabilities & ShipCapability.CLOAK:
         c_value = 300 if self.entity.cloak.cloak_status != CloakStatus.INACTIVE else 100
-    except AttributeError:
+    else:
         c_value = 100
     
     for ship, scan in zip(enemies_in_same_system, enemy_scans):
     
         averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, ship_kills, crew_kills, averaged_crew_readyness = self.entity.simulate_energy_hit(
             ship, 5, energy_to_use,
-            target_scan=scan
+            target_scan=scan,
+            use_estimate=self.use_damage_estimates
         )
         if total_shield_dam + total_hull_dam > 0:
             
@@ -289,9 +394,9 @@ def calc_beam_weapon_hard(
     user = self.entity
             
     max_energy = min(user.power_generator.energy, user.beam_array.get_max_effective_beam_firepower)
-    try:
+    if self.entity.capabilities & ShipCapability.CLOAK:
         c_value = 300 if self.entity.cloak.cloak_status != CloakStatus.INACTIVE else 100
-    except AttributeError:
+    else:
         c_value = 100
     
     if enemies_in_same_system:
@@ -306,7 +411,8 @@ def calc_beam_weapon_hard(
                 user.simulate_energy_hit(
                     ship, 5, per_enemy_energy, 
                     simulate_systems=True, simulate_crew=True,
-                    target_scan=scan
+                    target_scan=scan,
+                    use_estimate=self.use_damage_estimates
                 ) for ship, scan in zip(enemies_in_same_system, enemy_scans)
             ]
             #averaged_shields = max([value[0] for value in collected_values])
@@ -329,11 +435,13 @@ def calc_beam_weapon_hard(
                 )
                 self.order_dict_size+=1
         
-        for enemy in enemies_in_same_system:
-            
-            averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, averaged_number_of_ship_kills, averaged_number_of_crew_kills, averaged_crew_readyness = user.simulate_energy_hit(
+        for enemy, scan in zip(enemies_in_same_system, enemy_scans):
+        
+            averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, ship_kills, crew_kills, averaged_crew_readyness = user.simulate_energy_hit(
                 enemy, 5, max_energy, 
                 simulate_systems=True, simulate_crew=True,
+                target_scan=scan,
+                use_estimate=self.use_damage_estimates
             )
             if total_shield_dam + total_hull_dam > 0:
             
@@ -371,7 +479,8 @@ def calc_cannon_weapon_medium(
         
         averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, ship_kills, crew_kills, averaged_crew_readyness = self.entity.simulate_energy_hit(
             ship, 5, energy_to_use, 
-            cannon=True, target_scan=scan
+            cannon=True, target_scan=scan,
+            use_estimate=self.use_damage_estimates
         )
         if total_shield_dam + total_hull_dam > 0:
             
@@ -390,18 +499,20 @@ def calc_cannon_weapon_hard(
     user = self.entity
     
     max_energy = min(user.power_generator.energy, user.beam_array.get_max_effective_beam_firepower)
-    try:
+    if self.entity.capabilities & ShipCapability.CLOAK:
         c_value = 300 if self.entity.cloak.cloak_status != CloakStatus.INACTIVE else 100
-    except AttributeError:
+    else:
         c_value = 100
     
     if enemies_in_same_system:
         
-        for enemy in enemies_in_same_system:
-            
+        for enemy, scan in zip(enemies_in_same_system, enemy_scans):
+        
             averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, ship_kills, crew_kills, averaged_crew_readyness = user.simulate_energy_hit(
                 enemy, 5, max_energy, True,
                 simulate_systems=True, simulate_crew=True,
+                target_scan=scan,
+                use_estimate=self.use_damage_estimates
             )
             if total_shield_dam + total_hull_dam > 0:
             
@@ -608,11 +719,11 @@ def calc_cloak_hard(
         
 def calc_oppress_hard(self:BaseAi):
     
-    try:
-        affect_cost_multiplier = self.entity.warp_drive.affect_cost_multiplier
-    except AttributeError:
+    if not self.entity.capabilities & ShipCapability.WARP_DRIVE:
         return
-        
+    
+    affect_cost_multiplier = self.entity.warp_drive.affect_cost_multiplier
+
     unopressed_planets = tuple(
         planet for planet in find_unopressed_planets(
             self.entity.game_data, self.entity
@@ -630,7 +741,10 @@ def calc_oppress_hard(self:BaseAi):
             coords=planet
         ) * CONFIG_OBJECT.sector_energy_cost * self.entity.warp_drive.affect_cost_multiplier
             
-        warp_to = WarpOrder.from_coords(self.entity, planet.x, planet.y)
+        warp_to = WarpOrder.from_coords(
+            entity=self.entity, x=planet.x, y=planet.y, speed=1, 
+            start_x=self.entity.sector_coords.x, start_y=self.entity.sector_coords.y
+        )
         
         self.order_dict[warp_to] = self.entity.power_generator.energy - round(energy_cost)
         
@@ -650,7 +764,7 @@ def calc_oppress_hard(self:BaseAi):
         planet = most_common[0]
         
         warp_to = WarpOrder.from_coords(
-            self.entity, planet.x, planet.y, speed=WARP_FACTOR[1], 
+            entity=self.entity, x=planet.x, y=planet.y, speed=1, 
             start_x=self.entity.sector_coords.x, start_y=self.entity.sector_coords.y
         )
         energy_cost = self.entity.sector_coords.distance(
@@ -675,7 +789,8 @@ def calc_auto_destruct_medium(
     enemy_collected_values = [
         user.simulate_self_destruct(
             enemy, 
-            scan=scan
+            scan=scan,
+            use_estimate=self.use_damage_estimates
         ) for enemy, scan in zip(nearbye_enemy_ships, enemy_scans)
     ]
     #averaged_shields = max([value[0] for value in collected_values])
@@ -714,6 +829,7 @@ def calc_auto_destruct_hard(
             scan=scan,
             number_of_simulations=3, 
             simulate_systems=True, simulate_crew=True,
+            use_estimate=self.use_damage_estimates
         ) for enemy, scan in zip(nearbye_enemy_ships, enemy_scans)
     ]
     #averaged_shields = max([value[0] for value in collected_values])
@@ -741,6 +857,7 @@ def calc_auto_destruct_hard(
                 ),
                 number_of_simulations=3, 
                 simulate_systems=True, simulate_crew=True,
+                use_estimate=self.use_damage_estimates
             ) for enemy in nearbye_allied_ships
         ]
         ff_total_shield_dam = max([value[2] for value in allied_collected_values])
@@ -765,12 +882,12 @@ def calc_ram_hard(
     enemy_ships:Iterable[Starship], 
     enemy_ship_scans:Iterable[Dict[str,Union[int,Tuple,ShipStatus]]]
 ):
+    context = self.tactical_context
+    
     for ship, scan in zip(enemy_ships, enemy_ship_scans):
         
         energy_cost = round(
-            self.entity.local_coords.distance(
-                x=ship.local_coords.x, y=ship.local_coords.y
-            ) * CONFIG_OBJECT.local_energy_cost * self.entity.impulse_engine.affect_cost_multiplier
+            context.distance(self.entity, ship) * CONFIG_OBJECT.local_energy_cost * self.entity.impulse_engine.affect_cost_multiplier
         )
         if energy_cost > self.entity.power_generator.energy:
             
@@ -779,7 +896,8 @@ def calc_ram_hard(
         averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, ship_kills, crew_kills, averaged_crew_readyness = self.entity.simulate_ram_attack(
             ship, number_of_simulations=3, 
             simulate_systems=True, simulate_crew=True,
-            target_scan=scan
+            target_scan=scan,
+            use_estimate=self.use_damage_estimates
         )
         shields_score = min(ship.ship_class.max_shields - averaged_shields, total_shield_dam)
         hull_score = min(ship.ship_class.max_hull - averaged_hull, total_hull_dam)
@@ -790,7 +908,9 @@ def calc_ram_hard(
                 shields_score + hull_score + (1000 * ship_kills) + (1000 * crew_kills)
             ) * 500
             
-            ram_order = MoveOrder.from_coords(self.entity, ship.local_coords.x, ship.local_coords.y)
+            ram_order = MoveOrder.from_coords(
+                entity=self.entity, x=ship.local_coords.x, y=ship.local_coords.y, cost=energy_cost
+            )
         
             self.order_dict[ram_order] = score
             
@@ -800,28 +920,32 @@ def reactivate_derelict_hard(self:BaseAi):
     
     if self.game_data.player.sector_coords == self.entity.sector_coords or self.entity.ship_class.is_automated:
         return
-    try:
-        able_crew = min(self.entity.life_support.able_crew-1, self.entity.transporter.get_max_number)
-    except AttributeError:
+    if not self.entity.capabilities & ShipCapability.CREW:
         return
+    
+    able_crew = min(self.entity.life_support.able_crew-1, self.entity.transporter.get_max_number)
+    
     if able_crew < 1:
         return
-    try:
-        transport_power = self.entity.transporter.get_effective_value
-    except AttributeError:
-        transport_power = -1
     
+    transport_power = self.entity.transporter.get_effective_value
+
     self.entity.get_sub_sector.get_enemy_subsector_info
     
     if self.entity.get_sub_sector.get_enemy_subsector_info.derelicts > 0:
         
         transport_range = self.entity.transporter.get_range
         
-        ships_in_same_sector = self.game_data.grab_ships_in_same_sub_sector(
-            self.entity, accptable_ship_statuses={STATUS_DERLICT}
-        )
+        context = self.tactical_context
+        
+        ships_in_same_sector = context.grab_ships(context.ships, self.entity, {STATUS_DERLICT})
+        
+        if not ships_in_same_sector:
+            # the derlict was recrewed or destroyed since this sub sector was last scanned
+            return
+        
         ships_in_same_sector.sort(
-            key=lambda a: a.local_coords.distance(coords=self.entity.local_coords)
+            key=lambda a: context.distance(self.entity, a)
         )
         nearest = ships_in_same_sector[0]
         
@@ -839,30 +963,31 @@ def reactivate_derelict_hard(self:BaseAi):
             # find a way to move towards the derlict
             pass
     else:            
-        all_subsectors_with_derelicts = [
-            sub for sub in list(chain.from_iterable(self.game_data.enemy_subsector_info)) if sub.derelicts > 0
-        ]
+        derelicts = self.game_data.enemy_sector_knowledge.known["derelicts"]
+        
         sector_coords = self.entity.sector_coords
                 
-        for subsector in all_subsectors_with_derelicts:
+        for y, x in np.argwhere(derelicts > 0):
+            
+            x, y = int(x), int(y)
             
-            dist = self.entity.sector_coords.distance(coords=subsector.coords)
+            dist = self.entity.sector_coords.distance(x=x, y=y)
         
             order = WarpOrder.from_coords(
-                entity=self.entity, x=subsector.coords.x, y=subsector.coords.y,
+                entity=self.entity, x=x, y=y,
                 start_x=sector_coords.x, start_y=sector_coords.y,
                 speed=1
             )
-            self.order_dict[order] = subsector.derelicts / dist
+            self.order_dict[order] = derelicts[y, x] / dist
             
             self.order_dict_size += 1
 
 class EasyEnemy(BaseAi):
         
-    def perform(self) -> None:
+    def decide(self) -> Optional[Order]:
         
         if self.clear_orders_and_check_for_at_warp():
-            return
+            return WarpTravelOrder(self.entity)
         
         player_status = self.game_data.player.ship_status
         
@@ -870,7 +995,7 @@ class EasyEnemy(BaseAi):
         
         if not player_status.is_active:
             # player is not alive = do nothing
-            return
+            return None
         self.order:Optional[Order] = None
 
         if self.entity.power_generator.energy <= 0:
@@ -879,45 +1004,31 @@ class EasyEnemy(BaseAi):
         else:
             enemy_ships = self.get_player_allies_in_same_system()
                         
-            enemy_scans = [
-                ship.scan_this_ship(
-                    precision=self.precision, scan_for_crew=False, scan_for_systems=False
-                ) for ship in enemy_ships
-            ]
-            try:
-                if self.entity.shield_generator.is_opperational:
-                    
-                    calc_shields_easy(self, enemy_ships, enemy_scans)
-            except AttributeError:
-                pass
-            try:
-                if self.entity.beam_array.is_opperational:
+            enemy_scans = self.tactical_context.get_scans(enemy_ships, self.precision)
+            if self.entity.capabilities & ShipCapability.SHIELDS and self.entity.shield_generator.is_opperational:
                 
-                    calc_beam_weapon_easy(self, enemy_ships, enemy_scans)
-            except AttributeError:
-                pass
-            try:
-                if self.entity.cannons.is_opperational:
+                calc_shields_easy(self, enemy_ships, enemy_scans)
+            if self.entity.capabilities & ShipCapability.BEAM_ARRAY and self.entity.beam_array.is_opperational:
+            
+                calc_beam_weapon_easy(self, enemy_ships, enemy_scans)
+            if self.entity.capabilities & ShipCapability.CANNONS and self.entity.cannons.is_opperational:
+                
+                calc_cannon_weapon_easy(self, enemy_ships, enemy_scans)
+            if self.entity.capabilities & ShipCapability.TORPEDOS and self.entity.torpedo_launcher.is_opperational:
                     
-                    calc_cannon_weapon_easy(self, enemy_ships, enemy_scans)
-            except AttributeError:
-                pass
-            try:
-                if self.entity.torpedo_launcher.is_opperational:
-                        
-                    calc_torpedos_easy(self, enemy_ships, enemy_scans)
-            except AttributeError:
-                pass
+                calc_torpedos_easy(self, enemy_ships, enemy_scans)
                 
         self.determin_order()
-        self.order.perform()         
+        return self.order
                  
 class MediumEnemy(BaseAi):
     
-    def perform(self) -> None:
+    use_damage_estimates = True
+    
+    def decide(self) -> Optional[Order]:
                 
         if self.clear_orders_and_check_for_at_warp():
-            return
+            return WarpTravelOrder(self.entity)
         
         player_status = self.game_data.player.ship_status
         
@@ -925,7 +1036,7 @@ class MediumEnemy(BaseAi):
         
         if not player_status.is_active:
             # player is not alive = do nothing
-            return
+            return None
         self.order:Optional[Order] = None
 
         if self.entity.power_generator.energy <= 0:
@@ -936,11 +1047,7 @@ class MediumEnemy(BaseAi):
             
             precision = self.entity.sensors.determin_precision
             
-            enemy_scans = [
-                ship.scan_this_ship(
-                    precision=precision, scan_for_crew=False, scan_for_systems=False
-                ) for ship in enemy_ships
-            ]
+            enemy_scans = self.tactical_context.get_scans(enemy_ships, precision)
             enemy_is_present = bool(enemy_ships)
             
             if enemy_is_present:
@@ -949,12 +1056,7 @@ class MediumEnemy(BaseAi):
                     
                     calc_auto_destruct_medium(
                         self,
-                        all_nearbye_ships=self.game_data.grab_ships_in_same_sub_sector(
-                            self.entity,
-                            accptable_ship_statuses={
-                                STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED,STATUS_CLOAKED,STATUS_DERLICT,STATUS_HULK
-                            }
-                        ),
+                        all_nearbye_ships=self.get_nearbye_ships(),
                         enemy_scans=enemy_scans,
                         nearbye_allied_ships=[], 
                         nearbye_enemy_ships=enemy_ships,
@@ -962,46 +1064,31 @@ class MediumEnemy(BaseAi):
             has_energy = self.entity.power_generator.energy > 0
             
             if has_energy:
-                try:
-                    if self.entity.beam_array.is_opperational:
-                        
-                        calc_beam_weapon_medium(self, enemy_ships, enemy_scans)
-                except AttributeError:
-                    pass
-                try:
-                    if self.entity.cannons.is_opperational:
-                        
-                        calc_cannon_weapon_medium(self, enemy_ships, enemy_scans)
-                except AttributeError:
-                    pass
-            try:
-                if self.entity.torpedo_launcher.is_opperational:
-                        
-                    calc_torpedos_medium(self, enemy_ships, enemy_scans)
-            except AttributeError:
-                pass    
-            try:
-                if self.entity.cloak.is_opperational:
+                if self.entity.capabilities & ShipCapability.BEAM_ARRAY and self.entity.beam_array.is_opperational:
                     
-                    calc_cloak_medium(self, enemy_ships, enemy_scans)
-            except AttributeError:
-                pass
-            try:
-                if self.entity.shield_generator.is_opperational:
+                    calc_beam_weapon_medium(self, enemy_ships, enemy_scans)
+                if self.entity.capabilities & ShipCapability.CANNONS and self.entity.cannons.is_opperational:
                     
-                    calc_shields_medium(self, enemy_ships, enemy_scans)
-            except AttributeError:
-                pass
+                    calc_cannon_weapon_medium(self, enemy_ships, enemy_scans)
+            if self.entity.capabilities & ShipCapability.TORPEDOS and self.entity.torpedo_launcher.is_opperational:
+                    
+                calc_torpedos_medium(self, enemy_ships, enemy_scans)
+            if self.entity.capabilities & ShipCapability.CLOAK and self.entity.cloak.is_opperational:
+                
+                calc_cloak_medium(self, enemy_ships, enemy_scans)
+            if self.entity.capabilities & ShipCapability.SHIELDS and self.entity.shield_generator.is_opperational:
+                
+                calc_shields_medium(self, enemy_ships, enemy_scans)
                 
         self.determin_order()
-        self.order.perform()
+        return self.order
 
 class HardEnemy(BaseAi):
     
-    def perform(self) -> None:
+    def decide(self) -> Optional[Order]:
                 
         if self.clear_orders_and_check_for_at_warp():
-            return
+            return WarpTravelOrder(self.entity)
         
         player_status = self.game_data.player.ship_status
         
@@ -1009,7 +1096,7 @@ class HardEnemy(BaseAi):
         
         if not player_status.is_active:
             # player is not alive = do nothing
-            return
+            return None
 
         if self.entity.power_generator.energy <= 0:
             
@@ -1021,11 +1108,7 @@ class HardEnemy(BaseAi):
             
             friendly_ships = self.get_player_enemies_in_same_system()
             
-            enemy_scans = [
-                ship.scan_this_ship(
-                    precision=precision, scan_for_crew=False, scan_for_systems=False
-                ) for ship in enemy_ships
-            ]
+            enemy_scans = self.tactical_context.get_scans(enemy_ships, precision)
             enemy_is_present = bool(enemy_ships)
             
             has_energy = self.entity.power_generator.energy > 0
@@ -1036,46 +1119,26 @@ class HardEnemy(BaseAi):
                     
                     calc_auto_destruct_hard(
                         self,
-                        all_nearbye_ships=self.game_data.grab_ships_in_same_sub_sector(
-                            self.entity,
-                            accptable_ship_statuses={
-                                STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED,STATUS_CLOAKED,STATUS_DERLICT,STATUS_HULK
-                            }
-                        ),
+                        all_nearbye_ships=self.get_nearbye_ships(),
                         enemy_scans=enemy_scans,
                         nearbye_allied_ships=friendly_ships, 
-                        nearbye_enemy_ships=enemy_is_present,
+                        nearbye_enemy_ships=enemy_ships,
                     )
-                try:
-                    if self.entity.torpedo_launcher.is_opperational:
-                        
-                        calc_torpedos_hard(self, enemy_ships, enemy_scans)
-                except AttributeError:
-                    pass
+                if self.entity.capabilities & ShipCapability.TORPEDOS and self.entity.torpedo_launcher.is_opperational:
+                    
+                    calc_torpedos_hard(self, enemy_ships, enemy_scans)
                 if has_energy:
-                    try:
-                        if self.entity.beam_array.is_opperational:
-                            
-                            calc_beam_weapon_hard(self, enemy_ships, enemy_scans)
-                    except AttributeError:
-                        pass
-                    try:
-                        if self.entity.cannons.is_opperational:
-                        
-                            calc_cannon_weapon_hard(self, enemy_ships, enemy_scans)
-                    except AttributeError:
-                        pass
-                    try:
-                        if self.entity.impulse_engine:
-                            calc_ram_hard(self, enemy_ships, enemy_scans)
-                    except AttributeError:
-                        pass
-                try:
-                    if self.entity.cloak.cloak_status == CloakStatus.INACTIVE:
+                    if self.entity.capabilities & ShipCapability.BEAM_ARRAY and self.entity.beam_array.is_opperational:
                         
-                        calc_cloak_hard(self, enemy_ships, enemy_scans)
-                except AttributeError:
-                    pass
+                        calc_beam_weapon_hard(self, enemy_ships, enemy_scans)
+                    if self.entity.capabilities & ShipCapability.CANNONS and self.entity.cannons.is_opperational:
+                    
+                        calc_cannon_weapon_hard(self, enemy_ships, enemy_scans)
+                    if self.entity.capabilities & ShipCapability.IMPULSE and self.entity.impulse_engine:
+                        calc_ram_hard(self, enemy_ships, enemy_scans)
+                if self.entity.capabilities & ShipCapability.CLOAK and self.entity.cloak.cloak_status == CloakStatus.INACTIVE:
+                    
+                    calc_cloak_hard(self, enemy_ships, enemy_scans)
             else:
                 # if the player is not present:
                 
@@ -1084,23 +1147,20 @@ class HardEnemy(BaseAi):
                 if friendly_ships or system.unfriendly_planets == 0:
                 
                     calc_oppress_hard(self)            
-            try:
-                if self.entity.shield_generator.is_opperational:
-                
-                    calc_shields_hard(self, enemy_ships)
-            except AttributeError:
-                pass
+            if self.entity.capabilities & ShipCapability.SHIELDS and self.entity.shield_generator.is_opperational:
+            
+                calc_shields_hard(self, enemy_ships, enemy_scans)
             
         self.determin_order()
             
-        self.order.perform()
+        return self.order
         
 class AllyAI(BaseAi):
     
-    def perform(self) -> None:
+    def decide(self) -> Optional[Order]:
                 
         if self.clear_orders_and_check_for_at_warp():
-            return
+            return WarpTravelOrder(self.entity)
         
         player_status = self.game_data.player.ship_status
         
@@ -1108,7 +1168,7 @@ class AllyAI(BaseAi):
         
         if not player_status.is_active:
             # player is not alive = do nothing
-            return
+            return None
 
         if self.entity.power_generator.energy <= 0:
             
@@ -1120,11 +1180,7 @@ class AllyAI(BaseAi):
             
             friendly_ships = self.get_player_allies_in_same_system()
             
-            enemy_scans = [
-                ship.scan_this_ship(
-                    precision=precision, scan_for_crew=False, scan_for_systems=False
-                ) for ship in enemy_ships
-            ]
+            enemy_scans = self.tactical_context.get_scans(enemy_ships, precision)
             enemy_is_present = bool(enemy_ships)
             
             has_energy = self.entity.power_generator.energy > 0
@@ -1135,52 +1191,29 @@ class AllyAI(BaseAi):
                     
                     calc_auto_destruct_hard(
                         self,
-                        all_nearbye_ships=self.game_data.grab_ships_in_same_sub_sector(
-                            self.entity,
-                            accptable_ship_statuses={
-                                STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED,STATUS_CLOAKED,STATUS_DERLICT,STATUS_HULK
-                            }
-                        ),
+                        all_nearbye_ships=self.get_nearbye_ships(),
                         enemy_scans=enemy_scans,
                         nearbye_allied_ships=friendly_ships, 
-                        nearbye_enemy_ships=enemy_is_present,
+                        nearbye_enemy_ships=enemy_ships,
                     )
-                try:
-                    if self.entity.torpedo_launcher.is_opperational:
-                        
-                        calc_torpedos_hard(self, enemy_ships, enemy_scans)
-                except AttributeError:
-                    pass
+                if self.entity.capabilities & ShipCapability.TORPEDOS and self.entity.torpedo_launcher.is_opperational:
+                    
+                    calc_torpedos_hard(self, enemy_ships, enemy_scans)
                 if has_energy:
-                    try:
-                        if self.entity.beam_array.is_opperational:
-                            
-                            calc_beam_weapon_hard(self, enemy_ships, enemy_scans)
-                    except AttributeError:
-                        pass
-                    try:
-                        if self.entity.cannons.is_opperational:
-                            
-                            calc_cannon_weapon_hard(self, enemy_ships, enemy_scans)
-                    except AttributeError:
-                        pass
-                    try:
-                        if self.entity.impulse_engine:
-                            calc_ram_hard(self, enemy_ships, enemy_scans)
-                    except AttributeError:
-                        pass
-                    try:
-                        if self.entity.shield_generator.is_opperational:
-                            
-                            calc_shields_hard(self, enemy_ships, enemy_scans)
-                    except AttributeError:
-                        pass
-                try:
-                    if self.entity.cloak.cloak_status == CloakStatus.INACTIVE:
+                    if self.entity.capabilities & ShipCapability.BEAM_ARRAY and self.entity.beam_array.is_opperational:
+                        
+                        calc_beam_weapon_hard(self, enemy_ships, enemy_scans)
+                    if self.entity.capabilities & ShipCapability.CANNONS and self.entity.cannons.is_opperational:
                         
-                        calc_cloak_hard(self, enemy_ships, enemy_scans)
-                except AttributeError:
-                    pass
+                        calc_cannon_weapon_hard(self, enemy_ships, enemy_scans)
+                    if self.entity.capabilities & ShipCapability.IMPULSE and self.entity.impulse_engine:
+                        calc_ram_hard(self, enemy_ships, enemy_scans)
+                    if self.entity.capabilities & ShipCapability.SHIELDS and self.entity.shield_generator.is_opperational:
+                        
+                        calc_shields_hard(self, enemy_ships, enemy_scans)
+                if self.entity.capabilities & ShipCapability.CLOAK and self.entity.cloak.cloak_status == CloakStatus.INACTIVE:
+                    
+                    calc_cloak_hard(self, enemy_ships, enemy_scans)
             else:# if the player is not present:
                 system = self.entity.get_sub_sector
                 
@@ -1190,14 +1223,14 @@ class AllyAI(BaseAi):
                     
         self.determin_order()
         
-        self.order.perform()
+        return self.order
         
 class MissionCriticalAllyAI(BaseAi):
     
-    def perform(self) -> None:
+    def decide(self) -> Optional[Order]:
                 
         if self.clear_orders_and_check_for_at_warp():
-            return
+            return WarpTravelOrder(self.entity)
         
         player_status = self.game_data.player.ship_status
         
@@ -1205,7 +1238,7 @@ class MissionCriticalAllyAI(BaseAi):
         
         if not player_status.is_active:
             # player is not alive = do nothing
-            return
+            return None
 
         if self.entity.power_generator.energy <= 0:
             
@@ -1215,51 +1248,32 @@ class MissionCriticalAllyAI(BaseAi):
             
             enemy_ships = self.get_player_enemies_in_same_system()
                         
-            enemy_scans = [
-                ship.scan_this_ship(
-                    precision=precision, scan_for_crew=False, scan_for_systems=False
-                ) for ship in enemy_ships
-            ]
+            enemy_scans = self.tactical_context.get_scans(enemy_ships, precision)
             enemy_is_present = bool(enemy_ships)
             
             has_energy = self.entity.power_generator.energy > 0
             
             if enemy_is_present:
-                try:
-                    if self.entity.torpedo_launcher.is_opperational:
-                        
-                        calc_torpedos_hard(self, enemy_ships, enemy_scans)
-                except AttributeError:
-                    pass
+                if self.entity.capabilities & ShipCapability.TORPEDOS and self.entity.torpedo_launcher.is_opperational:
+                    
+                    calc_torpedos_hard(self, enemy_ships, enemy_scans)
                 if has_energy:
-                    try:
-                        if self.entity.beam_array.is_opperational:
-                            
-                            calc_beam_weapon_hard(self, enemy_ships, enemy_scans)
-                    except AttributeError:
-                        pass
-                    try:
-                        if self.entity.cannons.is_opperational:
-                            
-                            calc_cannon_weapon_hard(self, enemy_ships, enemy_scans)
-                    except AttributeError:
-                        pass
-                    try:
-                        if self.entity.shield_generator.is_opperational:
-                            
-                            calc_shields_hard(self, enemy_ships, enemy_scans)
-                    except AttributeError:
-                        pass
-                try:
-                    if self.entity.cloak.cloak_status == CloakStatus.INACTIVE:
+                    if self.entity.capabilities & ShipCapability.BEAM_ARRAY and self.entity.beam_array.is_opperational:
+                        
+                        calc_beam_weapon_hard(self, enemy_ships, enemy_scans)
+                    if self.entity.capabilities & ShipCapability.CANNONS and self.entity.cannons.is_opperational:
                         
-                        calc_cloak_hard(self, enemy_ships, enemy_scans)
-                except AttributeError:
-                    pass
+                        calc_cannon_weapon_hard(self, enemy_ships, enemy_scans)
+                    if self.entity.capabilities & ShipCapability.SHIELDS and self.entity.shield_generator.is_opperational:
+                        
+                        calc_shields_hard(self, enemy_ships, enemy_scans)
+                if self.entity.capabilities & ShipCapability.CLOAK and self.entity.cloak.cloak_status == CloakStatus.INACTIVE:
+                    
+                    calc_cloak_hard(self, enemy_ships, enemy_scans)
             
         self.determin_order()
             
-        self.order.perform()
+        return self.order
 
 ALL_DIFFICULTIES = {
     EasyEnemy,
@@ -0,0 +1,656 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple, Union
+import numpy as np
+
+from global_functions import ajust_system_integrity
+from ship_class import ShipCapability
+from data_globals import DAMAGE_BEAM, DAMAGE_CANNON, DAMAGE_EXPLOSION, DAMAGE_RAMMING, DAMAGE_TORPEDO, DamageType
+
+if TYPE_CHECKING:
+    from ship_class import ShipClass
+    from starship import Starship
+
+# used when a simulation isn't given an rng of its own. The AI always passes in the decision_rng of the ship that is 
+# deciding, so that its decisions don't depend on what other ships have done with this one
+shared_rng = np.random.default_rng()
+
+SIMULATED_SYSTEMS: Dict[str, str] = {
+    "sys_shield" : "max_shields",
+    "sys_beam_array" : "max_beam_energy",
+    "sys_cannon_weapon" : "max_cannon_energy",
+    "sys_impulse" : "evasion",
+    "sys_warp_drive" : "max_warp",
+    "sys_sensors" : "",
+    "sys_torpedos" : "max_torpedos",
+    "sys_warp_core" : "",
+    "sys_cloak" : "cloak_strength",
+    "sys_transporter" : "max_crew",
+    "sys_polarize" : "polarized_hull",
+    "sys_scanners" : ""
+}
+"""The keys are the names of the system values in a ship scan. The values are the name of the ShipClass attribute that the ship needs to have in order to have that system. If the value is an empty string, then every ship has that system.
+"""
+
+def scan_assistant_array(v:np.ndarray, precision:int):
+    """The same as global_functions.scan_assistant, but works on arrays.
+    """
+    if precision == 1:
+        return np.round(v)
+    return np.round(v / precision) * precision
+
+def calculate_polarization_array(damage:np.ndarray, polarization:Union[int,np.ndarray]):
+    """The same as global_functions.calculate_polarization, but works on arrays.
+    """
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+
+        dp = np.where(polarization != 0, np.exp(damage / np.where(polarization != 0, polarization, 1)), 0.0)
+
+    return np.maximum((damage - polarization) + dp, dp)
+
+def ajust_system_integrity_array(value:np.ndarray):
+    """The same as global_functions.ajust_system_integrity, but works on arrays.
+    """
+    return np.where(value < 0.15, 0.0, np.minimum(1.0, value * 1.25))
+
+def calculate_crew_readyness_array(ship_class:ShipClass, able_crew:np.ndarray, injured_crew:np.ndarray):
+    """The same as LifeSupport.caluclate_crew_readyness, but works on arrays.
+    """
+    if ship_class.is_automated:
+        return np.ones(able_crew.shape)
+
+    total = able_crew + injured_crew * 0.25
+
+    return np.where(total == 0.0, 0.0, (total / ship_class.max_crew) * 0.5 + 0.5)
+
+class BatchedScan:
+    """Holds the values of a ship scan (see Starship.scan_this_ship) for many simulations at once. Each value is an array with one entry for each simulation.
+    """
+
+    def __init__(self, scan:Dict, number_of_simulations:int) -> None:
+
+        self.number_of_simulations = number_of_simulations
+
+        self.ship_class:ShipClass = scan["class"]
+
+        self.hull = np.full(number_of_simulations, scan["hull"], dtype=float)
+
+        self.shields = np.full(number_of_simulations, scan.get("shields", 0), dtype=float)
+
+        self.polarization:int = scan.get("polarization", 0)
+
+        self.has_crew = "able_crew" in scan and "injured_crew" in scan
+
+        self.able_crew = np.full(number_of_simulations, scan.get("able_crew", 0), dtype=float)
+        self.injured_crew = np.full(number_of_simulations, scan.get("injured_crew", 0), dtype=float)
+
+        self.systems:Dict[str, np.ndarray] = {
+            k : np.full(number_of_simulations, scan[k], dtype=float) for k in SIMULATED_SYSTEMS.keys() if k in scan
+        }
+
+    def get_system(self, key:str, use_effective_values:bool):
+        """Returns the integrety of the system. If the system was not scanned, returns None.
+        """
+        try:
+            system = self.systems[key]
+        except KeyError:
+            return None
+        return ajust_system_integrity_array(system) if use_effective_values else system
+
+    def crew_readyness(self):
+
+        return calculate_crew_readyness_array(self.ship_class, self.able_crew, self.injured_crew)
+
+    def apply_damage(self, damage:BatchedDamage, mask:np.ndarray, *, apply_to_crew:bool, apply_to_systems:bool):
+        """Updates the values of the simulations where mask is True.
+        """
+        self.shields = np.where(mask, damage.new_shields, self.shields)
+        self.hull = np.where(mask, damage.new_hull, self.hull)
+
+        if apply_to_crew:
+
+            self.able_crew = np.where(
+                mask, np.maximum(self.able_crew - (damage.wounded + damage.killed_outright), 0), self.able_crew
+            )
+            self.injured_crew = np.where(
+                mask, np.maximum(self.injured_crew + damage.wounded - damage.killed_in_sickbay, 0), self.injured_crew
+            )
+        if apply_to_systems:
+
+            for k, v in damage.system_damage.items():
+
+                self.systems[k] = np.where(mask, np.maximum(self.systems[k] - v, 0.0), self.systems[k])
+
+class BatchedDamage:
+    """The result of calculate_damage_batch. Each value is an array with one entry for each simulation.
+    """
+
+    def __init__(
+        self, *,
+        new_shields:np.ndarray, new_hull:np.ndarray, shields_dam:np.ndarray, hull_dam:np.ndarray,
+        killed_outright:np.ndarray, killed_in_sickbay:np.ndarray, wounded:np.ndarray,
+        system_damage:Dict[str, np.ndarray]
+    ) -> None:
+        self.new_shields = new_shields
+        self.new_hull = new_hull
+        self.shields_dam = shields_dam
+        self.hull_dam = hull_dam
+        self.killed_outright = killed_outright
+        self.killed_in_sickbay = killed_in_sickbay
+        self.wounded = wounded
+        self.system_damage = system_damage
+
+def calculate_damage_batch(
+    target:Starship, amount:float, scan:BatchedScan, *,
+    precision:int=1,
+    calculate_crew:bool=True,
+    calculate_systems:bool=True,
+    damage_type:DamageType,
+    use_effective_values:bool=True,
+    rng:Optional[np.random.Generator]=None
+):
+    """Runs Starship.calculate_damage for every simulation in the scan at once. This follows the same rules as calculate_damage.
+
+    Args:
+        target (Starship): The ship that is taking the damage.
+        amount (float): The amount of damage.
+        scan (BatchedScan): The current state of the target in each simulation.
+        precision (int, optional): The precision of the scan. Defaults to 1.
+        calculate_crew (bool, optional): If true, the calculation will take into account the result of killed/injured crewmembers. Defaults to True.
+        calculate_systems (bool, optional): If true, the calculation will take into account the result of damaged systems. Defaults to True.
+        damage_type (DamageType): The type of damage.
+        use_effective_values (bool, optional): If true, system integrety will be ajusted with ajust_system_integrity. Defaults to True.
+        rng (Optional[np.random.Generator], optional): The random number generator to use. If this is None, shared_rng is used. Defaults to None.
+
+    Returns:
+        BatchedDamage: The damage for each simulation.
+    """
+    if rng is None:
+        rng = shared_rng
+
+    n = scan.number_of_simulations
+
+    ship_class = target.ship_class
+
+    random_varation = damage_type.damage_variation
+
+    amount = np.round(
+        amount * rng.uniform(1.0 - random_varation, 1.0, n)
+    ) if random_varation > 0.0 else np.full(n, amount, dtype=float)
+
+    current_shields = scan.shields
+    current_hull = scan.hull
+
+    polarization = scan.polarization
+
+    sys_polarize = scan.get_system("sys_polarize", use_effective_values)
+
+    if calculate_systems and polarization and sys_polarize is not None:
+        polarization = np.round(polarization * sys_polarize)
+
+    old_status = target.ship_status
+
+    is_hulk = current_hull < 0
+
+    is_derlict = (
+        scan.able_crew + scan.injured_crew <= 0
+    ) if scan.has_crew else np.zeros(n, dtype=bool)
+
+    shield_effectiveness = scan.get_system("sys_shield", use_effective_values)
+
+    if shield_effectiveness is None:
+        shield_effectiveness = np.ones(n)
+    if target.capabilities & ShipCapability.SHIELDS:
+        shields_up = target.shield_generator.shields_up
+    else:
+        shields_up = False
+
+    shields_are_already_down = (shield_effectiveness <= 0) | (current_shields <= 0)
+
+    if not old_status.do_shields_work or not shields_up or ship_class.max_shields == 0:
+        shields_are_already_down = np.ones(n, dtype=bool)
+
+    shields_percentage = current_shields / ship_class.max_shields if ship_class.max_shields else np.zeros(n)
+
+    bleedthru_factor = np.minimum(shields_percentage + 0.5, 1.0)
+
+    shields_dam = np.minimum(amount * bleedthru_factor * damage_type.damage_vs_shields_multiplier, current_shields)
+
+    to_add = np.maximum(amount * bleedthru_factor * damage_type.damage_vs_shields_multiplier - current_shields, 0.0)
+
+    shields_dam = np.where(shields_are_already_down, 0.0, shields_dam)
+
+    hull_dam = np.where(
+        shields_are_already_down,
+        amount * damage_type.damage_vs_no_shield_multiplier,
+        (amount * (1 - bleedthru_factor) + to_add) * damage_type.damage_vs_hull_multiplier
+    )
+    hull_dam = np.round(calculate_polarization_array(hull_dam, polarization))
+
+    new_shields = np.where(shields_dam > 0, scan_assistant_array(current_shields - shields_dam, precision), current_shields)
+    new_hull = np.where(hull_dam > 0, scan_assistant_array(current_hull - hull_dam, precision), current_hull)
+
+    hull_damage_as_a_percent = hull_dam / ship_class.max_hull
+    new_hull_as_a_percent = new_hull / ship_class.max_hull
+
+    killed_outright = np.zeros(n)
+    killed_in_sickbay = np.zeros(n)
+    wounded = np.zeros(n)
+
+    if calculate_crew and scan.has_crew and not ship_class.is_automated:
+
+        crew_killed = ~is_derlict & ~is_hulk & (hull_dam > 0) & (new_hull_as_a_percent < rng.random(n))
+
+        able_crew = scan.able_crew
+        injured_crew = scan.injured_crew
+
+        percentage_of_crew_killed = hull_damage_as_a_percent * rng.random(n)
+
+        total_crew = np.where(crew_killed, able_crew + injured_crew, 1)
+
+        wounded_fac = rng.uniform(0.25, 0.75, n)
+
+        _able_crew_percentage = able_crew / total_crew
+
+        percentage_of_able_crew_killed = _able_crew_percentage * (percentage_of_crew_killed * (1 - wounded_fac))
+        percentage_of_able_crew_wounded = _able_crew_percentage * (percentage_of_crew_killed * wounded_fac)
+        percentage_of_injured_crew_killed = (injured_crew / total_crew) * percentage_of_crew_killed
+
+        ship_able_crew = target.life_support.able_crew
+
+        killed_outright = np.where(crew_killed, np.round(ship_able_crew * percentage_of_able_crew_killed), 0)
+        killed_in_sickbay = np.where(crew_killed, np.round(0.5 * ship_able_crew * percentage_of_injured_crew_killed), 0)
+        wounded = np.where(crew_killed, np.round(ship_able_crew * percentage_of_able_crew_wounded), 0)
+
+    system_damage:Dict[str, np.ndarray] = {}
+
+    if calculate_systems:
+
+        chance_to_damage_system = damage_type.chance_to_damage_system
+        system_damage_chance = damage_type.damage_chance_vs_systems_multiplier
+
+        systems_damaged = ~is_hulk & (hull_dam > 0) & (
+            new_hull_as_a_percent < rng.uniform(hull_damage_as_a_percent, 1.25 + hull_damage_as_a_percent)
+        )
+        for k in scan.systems.keys():
+
+            attribute = SIMULATED_SYSTEMS[k]
+
+            if attribute and not getattr(ship_class, attribute):
+                continue
+
+            chance_of_system_damage = rng.uniform(
+                hull_damage_as_a_percent, chance_to_damage_system + hull_damage_as_a_percent
+            ) > new_hull_as_a_percent
+
+            system_damage[k] = np.where(
+                systems_damaged & chance_of_system_damage,
+                rng.uniform(0.0, system_damage_chance * hull_damage_as_a_percent),
+                0.0
+            )
+
+    return BatchedDamage(
+        new_shields=new_shields, new_hull=new_hull, shields_dam=shields_dam, hull_dam=hull_dam,
+        killed_outright=killed_outright, killed_in_sickbay=killed_in_sickbay, wounded=wounded,
+        system_damage=system_damage
+    )
+
+def chance_to_hit(attack_value:float, deffence_value:float):
+    """Returns the chance that attack_value plus a random number between 0 and 1 will be greater then deffence_value.
+    """
+    return min(max(attack_value + 1.0 - deffence_value, 0.0), 1.0)
+
+def chance_to_hit_array(attack_value:Union[float,np.ndarray], deffence_value:Union[float,np.ndarray]):
+    """The same as chance_to_hit, but works on arrays.
+    """
+    return np.clip(attack_value + 1.0 - deffence_value, 0.0, 1.0)
+
+def roll_to_hit_batch(
+    attacker:Starship, target:Starship, number_of_simulations:int, *,
+    systems_used_for_accuray:Iterable[float], precision:int=1,
+    estimated_enemy_impulse:Optional[Union[float,np.ndarray]]=None,
+    damage_type:DamageType, crew_readyness:float, target_crew_readyness:Union[float,np.ndarray],
+    rng:Optional[np.random.Generator]=None
+):
+    """Runs Starship.roll_to_hit for every simulation at once.
+
+    Returns:
+        np.ndarray: An array of bools, True for each simulation where the attack hit.
+    """
+    if rng is None:
+        rng = shared_rng
+
+    attack_value, deffence_value = attacker.calculate_to_hit_values(
+        target,
+        systems_used_for_accuray=systems_used_for_accuray,
+        precision=precision,
+        estimated_enemy_impulse=estimated_enemy_impulse,
+        damage_type=damage_type,
+        crew_readyness=crew_readyness,
+        target_crew_readyness=target_crew_readyness
+    )
+    return attack_value + rng.random(number_of_simulations) > deffence_value
+
+def _get_crew_readyness(attacker:Starship):
+    return attacker.life_support.crew_readyness if attacker.capabilities & ShipCapability.CREW else 1
+
+def _estimated_impulse(scan:BatchedScan, use_effective_values:bool):
+
+    impulse = scan.get_system("sys_impulse", use_effective_values)
+
+    if impulse is None:
+        return 1.0 if scan.ship_class.evasion else 0.0
+    return impulse
+
+def _scan_impulse(target_scan:Dict, use_effective_values:bool):
+
+    try:
+        impulse = target_scan["sys_impulse"]
+    except KeyError:
+        return 1.0 if target_scan["class"].evasion else 0.0
+    return ajust_system_integrity(impulse) if use_effective_values else impulse
+
+def _weight_by_hit_chance(hit_chance:float, if_hit:Tuple[float, ...], if_missed:Tuple[float, ...]):
+
+    return tuple(hit_chance * h + (1.0 - hit_chance) * m for h, m in zip(if_hit, if_missed))
+
+def _summarize(
+    scan:BatchedScan, total_shield_dam:np.ndarray, total_hull_dam:np.ndarray, ship_kills:np.ndarray, scan_target_crew:bool
+):
+    if scan_target_crew:
+        crew_readyness = scan.crew_readyness()
+
+        averaged_crew_readyness = float(crew_readyness.mean())
+        crew_kills = float(np.mean(crew_readyness == 0.0))
+    else:
+        averaged_crew_readyness = 1.0
+        crew_kills = 0.0
+
+    return (
+        float(scan.shields.mean()), float(scan.hull.mean()), float(total_shield_dam.mean()), float(total_hull_dam.mean()),
+        float(ship_kills.mean()), crew_kills, averaged_crew_readyness
+    )
+
+def simulate_torpedo_hit_batch(
+    attacker:Starship, target:Starship, damage:float, number_of_simulations:int, target_scan:Dict, *,
+    times_to_fire:int, precision:int,
+    simulate_systems:bool=False, simulate_crew:bool=False, use_effective_values:bool=False,
+    rng:Optional[np.random.Generator]=None
+) -> Tuple[float, float, float, float, float, float, float]:
+    """Simulates a volley of torpedos fired at the target. Every simulation is run at the same time.
+
+    Returns:
+        Tuple[float, float, float, float, float, float, float]: averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, averaged_number_of_ship_kills, averaged_number_of_crew_kills, averaged_crew_readyness
+    """
+    scan = BatchedScan(target_scan, number_of_simulations)
+
+    crew_readyness = _get_crew_readyness(attacker)
+
+    scan_target_crew = not target.ship_class.is_automated and simulate_crew and scan.has_crew
+
+    total_shield_dam = np.zeros(number_of_simulations)
+    total_hull_dam = np.zeros(number_of_simulations)
+
+    systems_used_for_accuray = (
+        attacker.sensors.get_effective_value,
+        attacker.torpedo_launcher.get_effective_value
+    )
+    for attack in range(times_to_fire):
+
+        hits = roll_to_hit_batch(
+            attacker, target, number_of_simulations,
+            estimated_enemy_impulse=_estimated_impulse(scan, use_effective_values),
+            systems_used_for_accuray=systems_used_for_accuray,
+            damage_type=DAMAGE_TORPEDO,
+            crew_readyness=crew_readyness,
+            target_crew_readyness=scan.crew_readyness() if scan_target_crew else 1.0,
+            rng=rng
+        )
+        result = calculate_damage_batch(
+            target, damage, scan, precision=precision, calculate_crew=scan_target_crew,
+            calculate_systems=simulate_systems, damage_type=DAMAGE_TORPEDO,
+            use_effective_values=use_effective_values, rng=rng
+        )
+        total_shield_dam += np.where(hits, result.shields_dam, 0.0)
+        total_hull_dam += np.where(hits, result.hull_dam, 0.0)
+
+        scan.apply_damage(result, hits, apply_to_crew=scan_target_crew, apply_to_systems=simulate_systems)
+
+    return _summarize(scan, total_shield_dam, total_hull_dam, scan.hull <= 0, scan_target_crew)
+
+def _simulate_single_hit(
+    target:Starship, amount:float, scan:BatchedScan, *,
+    hit_chance:float, damage_type:DamageType, precision:int,
+    scan_target_crew:bool, simulate_systems:bool, use_effective_values:bool,
+    rng:Optional[np.random.Generator]=None
+):
+    n = scan.number_of_simulations
+
+    if_missed = _summarize(scan, np.zeros(n), np.zeros(n), scan.hull <= 0, scan_target_crew)
+
+    if hit_chance <= 0.0:
+        return if_missed
+
+    result = calculate_damage_batch(
+        target, amount, scan, precision=precision, calculate_crew=scan_target_crew,
+        calculate_systems=simulate_systems, damage_type=damage_type,
+        use_effective_values=use_effective_values, rng=rng
+    )
+    scan.apply_damage(result, np.ones(n, dtype=bool), apply_to_crew=scan_target_crew, apply_to_systems=simulate_systems)
+
+    if_hit = _summarize(scan, result.shields_dam, result.hull_dam, scan.hull <= 0, scan_target_crew)
+
+    return _weight_by_hit_chance(hit_chance, if_hit, if_missed)
+
+def simulate_energy_hit_batch(
+    attacker:Starship, target:Starship, amount:float, number_of_simulations:int, target_scan:Dict, *,
+    damage_type:DamageType, precision:int,
+    simulate_systems:bool=False, simulate_crew:bool=False, use_effective_values:bool=False,
+    rng:Optional[np.random.Generator]=None
+) -> Tuple[float, float, float, float, float, float, float]:
+    """Simulates a single beam or cannon attack against the target. Every simulation is run at the same time.
+
+    Returns:
+        Tuple[float, float, float, float, float, float, float]: averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, averaged_number_of_ship_kills, averaged_number_of_crew_kills, averaged_crew_readyness
+    """
+    assert damage_type in {DAMAGE_BEAM, DAMAGE_CANNON}
+
+    scan = BatchedScan(target_scan, number_of_simulations)
+
+    scan_target_crew = not target.ship_class.is_automated and simulate_crew and scan.has_crew
+
+    # there is only one roll to hit, so instead of rolling it for each simulation, every simulation is a hit and the 
+    # result is weighted by the chance of hitting
+    hit_chance = chance_to_hit(*attacker.calculate_to_hit_values(
+        target,
+        precision=precision,
+        systems_used_for_accuray=(
+            attacker.sensors.get_effective_value,
+            attacker.beam_array.get_effective_value
+        ),
+        damage_type=damage_type,
+        crew_readyness=_get_crew_readyness(attacker),
+        target_crew_readyness=float(scan.crew_readyness()[0]) if scan_target_crew else 1.0
+    ))
+    return _simulate_single_hit(
+        target, amount, scan, hit_chance=hit_chance, damage_type=damage_type, precision=precision,
+        scan_target_crew=scan_target_crew, simulate_systems=simulate_systems, use_effective_values=use_effective_values,
+        rng=rng
+    )
+
+def simulate_ram_attack_batch(
+    attacker:Starship, target:Starship, amount:float, number_of_simulations:int, target_scan:Dict, *,
+    precision:int, simulate_systems:bool=False, simulate_crew:bool=False, use_effective_values:bool=False,
+    rng:Optional[np.random.Generator]=None
+) -> Tuple[float, float, float, float, float, float, float]:
+    """Simulates the attacker ramming the target. Every simulation is run at the same time.
+
+    Returns:
+        Tuple[float, float, float, float, float, float, float]: averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, averaged_number_of_ship_kills, averaged_number_of_crew_kills, averaged_crew_readyness
+    """
+    scan = BatchedScan(target_scan, number_of_simulations)
+
+    scan_target_crew = not target.ship_class.is_automated and simulate_crew and scan.has_crew
+
+    hit_chance = attacker.hit_probability(
+        target, DAMAGE_RAMMING,
+        estimated_enemy_impulse=_scan_impulse(target_scan, use_effective_values),
+        target_crew_readyness=float(scan.crew_readyness()[0]) if scan_target_crew else 1.0
+    )
+    return _simulate_single_hit(
+        target, amount, scan, hit_chance=hit_chance, damage_type=DAMAGE_RAMMING, precision=precision,
+        scan_target_crew=scan_target_crew, simulate_systems=simulate_systems, use_effective_values=use_effective_values,
+        rng=rng
+    )
+
+def simulate_self_destruct_batch(
+    attacker:Starship, target:Starship, amount:float, number_of_simulations:int, target_scan:Dict, *,
+    precision:int, simulate_systems:bool=False, simulate_crew:bool=False,
+    rng:Optional[np.random.Generator]=None
+) -> Tuple[float, float, float, float, float, float]:
+    """Simulates the warp core breach of the attacker against the target. Explosions always hit, so there is no roll to hit.
+
+    Returns:
+        Tuple[float, float, float, float, float, float]: averaged_shield, averaged_hull, averaged_shield_damage, averaged_hull_damage, averaged_hull <= 0, averaged_crew_readyness
+    """
+    scan = BatchedScan(target_scan, number_of_simulations)
+
+    scan_target_crew = not target.ship_class.is_automated and simulate_crew and scan.has_crew
+
+    result = calculate_damage_batch(
+        target, amount, scan, precision=precision, calculate_crew=scan_target_crew,
+        calculate_systems=simulate_systems, damage_type=DAMAGE_EXPLOSION, rng=rng
+    )
+    hits = np.ones(number_of_simulations, dtype=bool)
+
+    scan.apply_damage(result, hits, apply_to_crew=scan_target_crew, apply_to_systems=simulate_systems)
+
+    averaged_shield, averaged_hull, averaged_shield_damage, averaged_hull_damage, ship_kills, crew_kills, averaged_crew_readyness = _summarize(
+        scan, result.shields_dam, result.hull_dam, scan.hull <= 0, scan_target_crew
+    )
+    return averaged_shield, averaged_hull, averaged_shield_damage, averaged_hull_damage, averaged_hull <= 0, averaged_crew_readyness
+
+def _estimate_attack(
+    target:Starship, amount:float, target_scan:Dict, *,
+    hit_chance:float, times_to_fire:int, damage_type:DamageType, precision:int,
+    simulate_systems:bool, use_effective_values:bool
+):
+    scan = dict(target_scan)
+
+    scan.setdefault("shields", 0)
+
+    total_shield_dam = 0.0
+    total_hull_dam = 0.0
+
+    chance_to_survive = 1.0
+
+    for attack in range(times_to_fire):
+
+        new_shields, new_hull, shields_dam, hull_dam, kill_chance = target.estimate_damage(
+            amount, scan_dict=scan, precision=precision, calculate_systems=simulate_systems,
+            damage_type=damage_type, use_effective_values=use_effective_values
+        )
+        total_shield_dam += hit_chance * shields_dam
+        total_hull_dam += hit_chance * hull_dam
+
+        chance_to_survive *= 1.0 - hit_chance * kill_chance
+
+        scan["shields"] -= hit_chance * shields_dam
+        scan["hull"] -= hit_chance * hull_dam
+
+    return scan["shields"], scan["hull"], total_shield_dam, total_hull_dam, 1.0 - chance_to_survive
+
+def _estimated_crew_readyness(target:Starship, target_scan:Dict, simulate_crew:bool):
+
+    if target.ship_class.is_automated or not simulate_crew:
+        return 1.0
+    try:
+        return target.life_support.caluclate_crew_readyness(target_scan["able_crew"], target_scan["injured_crew"])
+    except (AttributeError, KeyError):
+        return 1.0
+
+def estimate_torpedo_hit(
+    attacker:Starship, target:Starship, damage:float, target_scan:Dict, *,
+    times_to_fire:int, precision:int,
+    simulate_systems:bool=False, simulate_crew:bool=False, use_effective_values:bool=False
+) -> Tuple[float, float, float, float, float, float, float]:
+    """Works out the expected result of a volley of torpedos without running any simulations. Crew casulties are not estimated, so the crew kill chance is always 0.
+
+    Returns:
+        Tuple[float, float, float, float, float, float, float]: averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, averaged_number_of_ship_kills, averaged_number_of_crew_kills, averaged_crew_readyness
+    """
+    target_crew_readyness = _estimated_crew_readyness(target, target_scan, simulate_crew)
+
+    hit_chance = attacker.hit_probability(
+        target, DAMAGE_TORPEDO,
+        estimated_enemy_impulse=_scan_impulse(target_scan, use_effective_values),
+        target_crew_readyness=target_crew_readyness
+    )
+    return _estimate_attack(
+        target, damage, target_scan, hit_chance=hit_chance, times_to_fire=times_to_fire, damage_type=DAMAGE_TORPEDO,
+        precision=precision, simulate_systems=simulate_systems, use_effective_values=use_effective_values
+    ) + (0.0, target_crew_readyness)
+
+def estimate_energy_hit(
+    attacker:Starship, target:Starship, amount:float, target_scan:Dict, *,
+    damage_type:DamageType, precision:int,
+    simulate_systems:bool=False, simulate_crew:bool=False, use_effective_values:bool=False
+) -> Tuple[float, float, float, float, float, float, float]:
+    """Works out the expected result of a beam or cannon attack without running any simulations. Crew casulties are not estimated, so the crew kill chance is always 0.
+
+    Returns:
+        Tuple[float, float, float, float, float, float, float]: averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, averaged_number_of_ship_kills, averaged_number_of_crew_kills, averaged_crew_readyness
+    """
+    assert damage_type in {DAMAGE_BEAM, DAMAGE_CANNON}
+
+    target_crew_readyness = _estimated_crew_readyness(target, target_scan, simulate_crew)
+
+    hit_chance = chance_to_hit(*attacker.calculate_to_hit_values(
+        target,
+        precision=precision,
+        systems_used_for_accuray=(
+            attacker.sensors.get_effective_value,
+            attacker.beam_array.get_effective_value
+        ),
+        damage_type=damage_type,
+        crew_readyness=_get_crew_readyness(attacker),
+        target_crew_readyness=target_crew_readyness
+    ))
+    return _estimate_attack(
+        target, amount, target_scan, hit_chance=hit_chance, times_to_fire=1, damage_type=damage_type,
+        precision=precision, simulate_systems=simulate_systems, use_effective_values=use_effective_values
+    ) + (0.0, target_crew_readyness)
+
+def estimate_ram_attack(
+    attacker:Starship, target:Starship, amount:float, target_scan:Dict, *,
+    precision:int, simulate_systems:bool=False, simulate_crew:bool=False, use_effective_values:bool=False
+) -> Tuple[float, float, float, float, float, float, float]:
+    """Works out the expected result of the attacker ramming the target without running any simulations. Crew casulties are not estimated, so the crew kill chance is always 0.
+
+    Returns:
+        Tuple[float, float, float, float, float, float, float]: averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, averaged_number_of_ship_kills, averaged_number_of_crew_kills, averaged_crew_readyness
+    """
+    target_crew_readyness = _estimated_crew_readyness(target, target_scan, simulate_crew)
+
+    hit_chance = attacker.hit_probability(
+        target, DAMAGE_RAMMING,
+        estimated_enemy_impulse=_scan_impulse(target_scan, use_effective_values),
+        target_crew_readyness=target_crew_readyness
+    )
+    return _estimate_attack(
+        target, amount, target_scan, hit_chance=hit_chance, times_to_fire=1, damage_type=DAMAGE_RAMMING,
+        precision=precision, simulate_systems=simulate_systems, use_effective_values=use_effective_values
+    ) + (0.0, target_crew_readyness)
+
+def estimate_self_destruct(
+    target:Starship, amount:float, target_scan:Dict, *,
+    precision:int, simulate_systems:bool=False, simulate_crew:bool=False
+) -> Tuple[float, float, float, float, float, float]:
+    """Works out the expected result of a warp core breach against the target without running any simulations.
+
+    Returns:
+        Tuple[float, float, float, float, float, float]: averaged_shield, averaged_hull, averaged_shield_damage, averaged_hull_damage, the chance that the target will be destroyed, averaged_crew_readyness
+    """
+    return _estimate_attack(
+        target, amount, target_scan, hit_chance=1.0, times_to_fire=1, damage_type=DAMAGE_EXPLOSION,
+        precision=precision, simulate_systems=simulate_systems, use_effective_values=True
+    ) + (_estimated_crew_readyness(target, target_scan, simulate_crew),)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
-from components.starship_system import StarshipSystem
+from components.starship_system import FleetColumn, StarshipSystem
 
 from data_globals import CloakStatus
 
@@ -8,13 +8,25 @@ if TYPE_CHECKING:
     from starship import Starship
 
 class Cloak(StarshipSystem):
-        
+    
+    _cloak_status = FleetColumn("cloak_status", to_array=lambda status: status.value, from_array=CloakStatus)
+    
     def __init__(self) -> None:
         super().__init__("Cloak:")
             
-        self.cloak_status = CloakStatus.INACTIVE
+        self._cloak_status = CloakStatus.INACTIVE
         self.cloak_cooldown = 0
     
+    @property
+    def cloak_status(self):
+        return self._cloak_status
+    
+    @cloak_status.setter
+    def cloak_status(self, value:CloakStatus):
+        self._cloak_status = value
+        self.starship.version += 1
+        self.starship.update_ship_status()
+    
     @property
     def get_cloak_power(self):
         return self.starship.ship_class.cloak_strength * self.get_effective_value
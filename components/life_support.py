@@ -1,8 +1,7 @@
 from __future__ import annotations
 from math import ceil, floor
-from random import uniform
 from typing import TYPE_CHECKING, Dict, List
-from components.starship_system import StarshipSystem
+from components.starship_system import FleetColumn, StarshipSystem, versioned_property
 from data_globals import PRECISION_SCANNING_VALUES
 from get_config import CONFIG_OBJECT
 import colors
@@ -14,24 +13,47 @@ if TYPE_CHECKING:
     from nation import Nation
 
 class LifeSupport(StarshipSystem):
-        
+    
+    _able_crew = FleetColumn("able_crew")
+    _injured_crew = FleetColumn("injured_crew")
+    
     def __init__(self, ship_class:ShipClass) -> None:
         super().__init__("Life Support:")
         
         self.turn_without_lifesupport = 0
 
-        self.able_crew = ship_class.max_crew
-        self.injured_crew = 0
+        self._able_crew = ship_class.max_crew
+        self._injured_crew = 0
         
         # format is Dict[nation of ship that send over boarding party, List[able boarders, injured boarders]]
         self.hostiles_on_board: Dict[Nation, List[int,int]] = {}
     
+    @property
+    def able_crew(self):
+        return self._able_crew
+    
+    @able_crew.setter
+    def able_crew(self, value:int):
+        self._able_crew = value
+        self.starship.version += 1
+        self.starship.update_ship_status()
+    
+    @property
+    def injured_crew(self):
+        return self._injured_crew
+    
+    @injured_crew.setter
+    def injured_crew(self, value:int):
+        self._injured_crew = value
+        self.starship.version += 1
+        self.starship.update_ship_status()
+    
     @property
     def is_derlict(self):
         
         return self.able_crew < 1 and self.injured_crew < 1
     
-    @property
+    @versioned_property
     def crew_readyness(self):
         
         return self.caluclate_crew_readyness(
@@ -426,9 +448,9 @@ f"During the fighting with {self.starship.nation.name_short} forces, our boardin
                 
                 critical_turns = self.turn_without_lifesupport - CONFIG_OBJECT.life_support_offline_turn_limit
                                 
-                _able_crew_deaths = critical_turns * uniform(0.1, 0.12)
+                _able_crew_deaths = critical_turns * self.starship.rng.uniform(0.1, 0.12)
             
-                _injured_crew_deaths = critical_turns * uniform(0.12, 0.15)
+                _injured_crew_deaths = critical_turns * self.starship.rng.uniform(0.12, 0.15)
                                                                             
                 able_crew_deaths = min(round(self.able_crew * _able_crew_deaths), self.able_crew)
                 
@@ -471,9 +493,9 @@ f"During the fighting with {self.starship.nation.name_short} forces, our boardin
                     
                     boarders_are_from_player = k == self.starship.game_data.scenerio.your_nation
                     
-                    _able_boarder_deaths = critical_turns * uniform(0.12, 0.16)
+                    _able_boarder_deaths = critical_turns * self.starship.rng.uniform(0.12, 0.16)
             
-                    _injured_boarder_deaths = critical_turns * uniform(0.14, 0.18)
+                    _injured_boarder_deaths = critical_turns * self.starship.rng.uniform(0.14, 0.18)
                     
                     able_boarders, injured_boarders = v[0], v[1]
                                             
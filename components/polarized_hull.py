@@ -2,17 +2,21 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from math import sqrt
 
-from components.starship_system import StarshipSystem
+from components.starship_system import FleetColumn, StarshipSystem
+from ship_class import ShipCapability
 
 if TYPE_CHECKING:
     from ship_class import ShipClass
 
 class PolarizedHull(StarshipSystem):
     """The polarized hull is a pre-shields system used to reduce damage.
-
+    
     new damage = max(square root(get_max_effective_polarized_hull) - damage, 0)
     """
     
+    _polarization_amount = FleetColumn("polarization_amount")
+    is_polarized = FleetColumn("is_polarized")
+    
     def __init__(self, shipclass:ShipClass) -> None:
         super().__init__("Polarized Hull:")
         
@@ -37,9 +41,8 @@ class PolarizedHull(StarshipSystem):
     
     @property
     def get_energy_cost_per_turn(self):
-        try:
-            is_cloaked = self.starship.cloak.cloak_is_turned_on
-        except AttributeError:
-            is_cloaked = False
-            
+        is_cloaked = (
+            self.starship.capabilities & ShipCapability.CLOAK and self.starship.cloak.cloak_is_turned_on
+        )
+        
         return self._polarization_amount * 0.05 if self.is_polarized and self.is_opperational and not is_cloaked else 0
\ No newline at end of file
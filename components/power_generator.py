@@ -1,13 +1,16 @@
 from __future__ import annotations
+from math import floor
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ship_class import ShipClass
 
-from components.starship_system import StarshipSystem
+from components.starship_system import FleetColumn, StarshipSystem
 
 class PowerGenerator(StarshipSystem):
-        
+    
+    _energy = FleetColumn("energy")
+    
     def __init__(self, shipclass:ShipClass) -> None:
         
         super().__init__(
@@ -25,7 +28,8 @@ class PowerGenerator(StarshipSystem):
         if self._energy < 0:
             self._energy = 0
         elif self._energy > self.get_max_energy:
-            self._energy = self.get_max_energy
+            # a damaged power generator can have a max energy that isn't a whole number, but the energy always is one
+            self._energy = floor(self.get_max_energy)
     
     @property
     def get_max_energy(self):
@@ -1,5 +1,4 @@
 from __future__ import annotations
-from random import uniform
 from typing import TYPE_CHECKING
 from data_globals import STATUS_CLOAKED, CloakStatus
 from get_config import CONFIG_OBJECT
@@ -7,14 +6,15 @@ from get_config import CONFIG_OBJECT
 if TYPE_CHECKING:
     from starship import Starship
 
-from components.starship_system import StarshipSystem
+from components.starship_system import StarshipSystem, versioned_property
+from ship_class import ShipCapability
 
 class Sensors(StarshipSystem):
     
     def __init__(self):
         super().__init__("Sensors:")
     
-    @property
+    @versioned_property
     def determin_precision(self):
         """Takes the effective value of the ships sensor system and returns an intiger value based on it. This
         intiger is passed into the scanAssistant function that is used for calculating the precision when 
@@ -57,11 +57,8 @@ class Sensors(StarshipSystem):
             return
         
         # can't detect while at warp!
-        try:
-            if self.starship.warp_drive.is_at_warp:
-                return
-        except AttributeError:
-            pass
+        if self.starship.capabilities & ShipCapability.WARP_DRIVE and self.starship.warp_drive.is_at_warp:
+            return
         
         allied_nations = self.starship.game_data.scenerio.get_set_of_allied_nations
         
@@ -87,9 +84,9 @@ class Sensors(StarshipSystem):
 
             for i in range(CONFIG_OBJECT.chances_to_detect_cloak):
 
-                if uniform(
+                if self.starship.rng.uniform(
                     0.0, detection_strength
-                ) < uniform(
+                ) < self.starship.rng.uniform(
                     0.0, cloak_strength
                 ):
                     detected = False
@@ -122,9 +119,9 @@ f'{f"{cr}, we have" if self is player else f"The {self.name} has"} detected {"us
 
         for i in range(CONFIG_OBJECT.chances_to_detect_cloak):
 
-            if uniform(
+            if self.starship.rng.uniform(
                 0.0, detection_strength
-            ) < uniform(
+            ) < self.starship.rng.uniform(
                 0.0, cloak_strength
             ):
                 detected = False
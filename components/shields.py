@@ -2,13 +2,17 @@ from __future__ import annotations
 from math import ceil
 from typing import TYPE_CHECKING
 
-from components.starship_system import StarshipSystem
+from components.starship_system import FleetColumn, StarshipSystem
+from ship_class import ShipCapability
 
 if TYPE_CHECKING:
     from ship_class import ShipClass
 
 class Shields(StarshipSystem):
-        
+    
+    _shields = FleetColumn("shields")
+    shields_up = FleetColumn("shields_up")
+    
     def __init__(self, shipclass:ShipClass) -> None:
         super().__init__("Shield Gen.:")
         
@@ -44,11 +48,10 @@ class Shields(StarshipSystem):
     
     @property
     def get_energy_cost_per_turn(self):
-        try:
-            is_cloaked = self.starship.cloak.cloak_is_turned_on
-        except AttributeError:
-            is_cloaked = False
-            
+        is_cloaked = (
+            self.starship.capabilities & ShipCapability.CLOAK and self.starship.cloak.cloak_is_turned_on
+        )
+        
         return self.shields * 0.01 if self.shields_up and self.is_opperational and not is_cloaked else 0
     
     @property
@@ -1,13 +1,113 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
 from decimal import DivisionByZero
+from functools import wraps
 from math import inf
 
 if TYPE_CHECKING:
     from starship import Starship
+    from fleet_state import FleetState
 
 import colors
 
+class FleetColumn:
+    """Stores an attribute in one of the columns of a FleetState while the object that it belongs to is attached to one, and in the objects __dict__ while it is not. This lets Starship and its systems act as views into the FleetState, so that its upkeep can be done for every ship at once.
+    
+    The object must have the attributes fleet_state, fleet_row and (if column is None) fleet_column.
+    
+    Args:
+        column (Optional[str], optional): The name of the column. If this is None, then the objects fleet_column attribute is used instead. Defaults to None.
+        to_array (Optional[Callable[[Any], Any]], optional): Converts the value before it is stored in the column. Defaults to None.
+        from_array (Optional[Callable[[Any], Any]], optional): Converts the value after it is read from the column. Defaults to None.
+    """
+    
+    def __init__(
+        self, column:Optional[str]=None, *, 
+        to_array:Optional[Callable[[Any], Any]]=None, from_array:Optional[Callable[[Any], Any]]=None
+    ) -> None:
+        self.column = column
+        self.to_array = to_array
+        self.from_array = from_array
+    
+    def __set_name__(self, owner:type, name:str):
+        self.name = name
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        
+        fleet_state:Optional[FleetState] = obj.fleet_state
+        
+        if fleet_state is None:
+            try:
+                return obj.__dict__[self.name]
+            except KeyError:
+                raise AttributeError(self.name)
+        
+        value = fleet_state.columns[self.column or obj.fleet_column][obj.fleet_row].item()
+        
+        return self.from_array(value) if self.from_array else value
+    
+    def __set__(self, obj, value):
+    
+        fleet_state:Optional[FleetState] = obj.fleet_state
+        
+        if fleet_state is None:
+            obj.__dict__[self.name] = value
+        else:
+            fleet_state.columns[self.column or obj.fleet_column][obj.fleet_row] = (
+                self.to_array(value) if self.to_array else value
+            )
+
+def versioned_property(func:Callable[[Any], Any]):
+    """Works like property, except that the value is worked out once and then kept until the version of the ship changes. The setters of anything that these values depend on (hull, system integrety, crew, cloak and warp) add one to the ships version, so most reads of a versioned_property are just a dictionary lookup.
+    
+    The object must have a version attribute.
+    
+    Args:
+        func (Callable[[Any], Any]): The function that works out the value.
+    
+    Returns:
+        property: The property.
+    """
+    name = func.__name__
+    
+    @wraps(func)
+    def getter(self):
+    
+        version = self.version
+        
+        memo:Dict[str, Tuple[int, Any]] = self.__dict__.setdefault("_memo", {})
+        
+        try:
+            memo_version, value = memo[name]
+            
+            if memo_version == version:
+                return value
+        except KeyError:
+            pass
+        
+        value = func(self)
+        
+        memo[name] = version, value
+        
+        return value
+    
+    return property(getter)
+
+def get_fleet_column_names(cls:type):
+    """Finds the names of all of the attributes of cls that are FleetColumns.
+    
+    Args:
+        cls (type): The class.
+    
+    Returns:
+        Tuple[str]: The names of the attributes.
+    """
+    return tuple(
+        name for klass in reversed(cls.__mro__) for name, attr in vars(klass).items() if isinstance(attr, FleetColumn)
+    )
+
 class StarshipSystem:
     """This handles a starship system, such as warp drives or shields.
     
@@ -17,7 +117,13 @@ class StarshipSystem:
     """
     
     starship:Starship
-
+    
+    fleet_state:Optional[FleetState] = None
+    fleet_row:int = 0
+    fleet_column:str = ""
+    
+    _integrety = FleetColumn()
+    
     def __init__(self, name:str):
         self._integrety = 1.0
         self.name = '{: >17}'.format(name)
@@ -34,12 +140,20 @@ class StarshipSystem:
             self._integrety = 0.0
         elif self._integrety > 1.0:
             self._integrety = 1.0
-
+        
+        self.starship.version += 1
+    
+    @property
+    def version(self):
+        """The version of the ship that this system belongs to. This is used by versioned_property.
+        """
+        return self.starship.version
+    
     @property
     def is_opperational(self):
         return self._integrety >= 0.15
-
-    @property
+    
+    @versioned_property
     def get_effective_value(self):
         """Starship systems can take quite a bit of beating before they begin to show signs of reduced performance. 
         Generaly, when the systems integrety dips below 80% is when you will see performance degrade. Should integrety 
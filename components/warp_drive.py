@@ -13,7 +13,17 @@ class WarpDrive(StarshipSystem):
         
         self.warp_destinations:Optional[Tuple[Coords]] = None
         self.warp_progress:float=0.0
-        self.current_warp_factor:int=0
+        self._current_warp_factor:int=0
+    
+    @property
+    def current_warp_factor(self):
+        return self._current_warp_factor
+    
+    @current_warp_factor.setter
+    def current_warp_factor(self, value:int):
+        self._current_warp_factor = value
+        self.starship.version += 1
+        self.starship.update_ship_status()
     
     def get_warp_current_warp_sector(self):
         
@@ -1,5 +1,5 @@
 from enum import Enum, auto
-from random import uniform
+from random import Random, uniform
 from typing import Dict, Final, Optional, Tuple, Union
 import colors
 from dataclasses import dataclass
@@ -21,9 +21,11 @@ class PlanetHabitation:
     max_development:float = 0.0
     has_disposition_towards_warp_capiable_civs:bool = False
 
-    def generate_development(self):
+    def generate_development(self, rng:Optional[Random]=None):
+    
+        _uniform = rng.uniform if rng else uniform
         
-        return float(uniform(self.min_development, self.max_development) if self.max_development > 0 else 0.0)
+        return float(_uniform(self.min_development, self.max_development) if self.max_development > 0 else 0.0)
             
 PLANET_PREWARP:Final = PlanetHabitation(
     color=colors.orange, 
@@ -222,6 +224,11 @@ STATUS_AT_WARP = ShipStatus(
     do_shields_work=True
 )
 
+# every status that a ship can be in. Indexes of ships by status go through them in this order
+ALL_SHIP_STATUSES:Final = (
+    STATUS_ACTIVE, STATUS_CLOAKED, STATUS_CLOAK_COMPRIMISED, STATUS_AT_WARP, STATUS_DERLICT, STATUS_HULK, STATUS_OBLITERATED
+)
+
 class CloakStatus(Enum):
     ACTIVE = auto()
     INACTIVE = auto()
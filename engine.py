@@ -1,17 +1,28 @@
 from __future__ import annotations
 
 from coords import Coords
-from typing import Dict, Tuple, TYPE_CHECKING
+from typing import Callable, Dict, Final, List, Optional, Set, Tuple, TYPE_CHECKING
 import lzma, pickle
-from data_globals import STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED, STATUS_DERLICT, STATUS_HULK
+from aggregate_combat import OffScreenBattle, can_fire_weapons
 from message_log import MessageLog
 from get_config import CONFIG_OBJECT
+from order import RepairOrder
+from global_functions import stardate
 
 if TYPE_CHECKING:
-    from game_data import GameData
+    from ai import BaseAi
+    from order import Order
+    from order_journal import OrderJournal
+    from scenario import Scenerio
 
+from game_data import GameData
+from ship_class import ShipCapability
 from starship import Starship
 
+DORMANT_STRATEGY_INTERVAL:Final = 5
+"""How many turns there are between the strategy steps of a dormant ship, see Engine.is_dormant.
+"""
+
 class Engine:
 
     game_data: GameData
@@ -41,50 +52,296 @@ class Engine:
 
         self.lookup_table:Dict[Coords,Tuple[Coords]] = {}
         
+        self.journal:Optional[OrderJournal] = None
+        """If this is set, every order that is carried out is recorded in it, see perform_order.
+        """
+        self.order_source:Optional[Callable[[Starship], Optional[Order]]] = None
+        """If this is set, the other ships get their orders from it instead of from their AI. This is used by Replay.
+        """
+
+    def __getstate__(self):
+        # the journal and the order source belong to whatever is recording or replaying the game, so they are not saved 
+        # along with it
+        state = self.__dict__.copy()
+        state["journal"] = None
+        state["order_source"] = None
+        return state
+
+    def perform_order(self, order:Order):
+        """Carries out the order, and then records it in the journal if there is one. If the order raises exceptions.Impossible, it is not recorded.
+        
+        Args:
+            order (Order): The order.
+        """
+        order.perform()
+        
+        if self.journal is not None:
+            self.journal.record(self.game_data.turn_number, order)
+
+    def decide_order(self, entity:Starship, dormant:bool=False):
+        """Works out the order of a ship other then the player. A dormant ship only runs its AI on its strategy turns, and repairs the rest of the time.
+        
+        Args:
+            entity (Starship): The ship.
+            dormant (bool, optional): Whether is_dormant returned True for the ship at the start of its turn. Defaults to False.
+        
+        Returns:
+            Optional[Order]: The order, or None if the ship will do nothing.
+        """
+        if self.order_source is not None:
+            return self.order_source(entity)
+        
+        if dormant and not self.is_strategy_turn(entity):
+            return RepairOrder(entity, 1)
+        
+        return entity.ai.decide()
+
+    def is_dormant(self, entity:Starship):
+        """Checks if a ship can skip most of its turn. If use_dormancy is set, a ship is dormant if it is not at warp, there are no hostile ships in its sub sector, and it is out of range of the player's scanners. A dormant ship doesn't look for cloaked ships, and only scans the sub sectors around it and runs its AI every DORMANT_STRATEGY_INTERVAL turns. This is checked at the start of every turn, so a ship wakes up as soon as a hostile ship arrives or the player comes into range.
+        
+        Args:
+            entity (Starship): The ship.
+        
+        Returns:
+            bool: True if the ship is dormant.
+        """
+        game_data = self.game_data
+        
+        if not game_data.use_dormancy:
+            return False
+        
+        if entity.capabilities & ShipCapability.WARP_DRIVE and entity.warp_drive.is_at_warp:
+            return False
+        
+        player = game_data.player
+        
+        x_distance = entity.sector_coords.x - player.sector_coords.x
+        y_distance = entity.sector_coords.y - player.sector_coords.y
+        
+        if x_distance * x_distance + y_distance * y_distance <= player.scanner.get_range ** 2:
+            return False
+        
+        return not entity.get_sub_sector.has_ships_hostile_to(entity.is_enemy)
+
+    def is_strategy_turn(self, entity:Starship):
+        # the ships are spread out over the turns, so that they don't all think on the same turn
+        return (self.game_data.turn_number + entity.ship_id) % DORMANT_STRATEGY_INTERVAL == 0
+
     def save_as(self, filename: str) -> None:
         """Save this Engine instance as a compressed file."""
         save_data = lzma.compress(pickle.dumps(self))
         with open(filename, "wb") as f:
             f.write(save_data)
 
+    def advance_turn(self):
+        """Runs everything that happens after the player has performed an order: the players upkeep, the passage of time, the turns of all other ships, and finally the players own systems.
+        """
+        self.player.handle_repair_and_energy_consumption()
+        self.player.clear_scan_cache()
+
+        game_data = self.game_data
+        game_data.date_time = game_data.date_time + CONFIG_OBJECT.time_per_turn
+        game_data.stardate = stardate(game_data.date_time)
+        game_data.turn_number += 1
+
+        self.handle_enemy_turns()
+        if game_data.player.capabilities & ShipCapability.CLOAK:
+            game_data.player.cloak.handle_cooldown_and_status_recovery()
+        
+        game_data.player.sensors.detect_all_enemy_cloaked_ships_in_system()
+        
+        if game_data.player.capabilities & ShipCapability.CREW:
+            game_data.player.life_support.on_turn()
+        game_data.run_update_for_ship(game_data.player)
+        game_data.info_description = game_data.describe_info()
+
+        game_data.clear_scan_caches()
+        game_data.clear_tactical_contexts()
+        
+        if self.journal is not None:
+            self.journal.flush()
+
     def handle_enemy_turns(self):
 
+        fleet_state = self.game_data.fleet_state
+        
+        # with a fleet state, the upkeep for all of the ships is done at once after every ship has taken its turn
+        fleet_rows:List[int] = []
+        
+        in_battle = self.handle_off_screen_battles(fleet_rows)
+        
         for entity in self.game_data.all_other_ships:
-            
-            if not entity.ship_status.is_active:
+        
+            if not entity.ship_status.is_active or entity in in_battle:
                 continue
-            try:
-                entity.cloak.handle_cooldown_and_status_recovery()
-            except AttributeError:
-                pass
-            try:
-                entity.sensors.detect_all_enemy_cloaked_ships_in_system()
-            except AttributeError:
-                pass            
-            try:
-                entity.life_support.on_turn()
-            except AttributeError:
-                pass
-            self.game_data.run_update_for_ship(entity)
-            entity.ai.perform()
-            entity.handle_repair_and_energy_consumption()
+            
+            dormant = self.is_dormant(entity)
+            
+            self.start_ship_turn(entity, dormant)
+            
+            order = self.decide_order(entity, dormant)
+            
+            if order is not None:
+                self.perform_order(order)
+            self.end_ship_turn(entity, fleet_rows)
+        
+        if fleet_state:
+            fleet_state.handle_repair_and_energy_consumption(fleet_rows)
+        
+        # the lists of ships near the player and the selected ship are kept up to date by GameData's event handlers
+        self.game_data.set_condition()
+
+    def find_off_screen_battles(self):
+        """If use_aggregate_combat is set, finds the sub sectors that the player isn't in where there are active, visible ships from both sides, and at least one of them can fire. Cloaked ships and ships at warp are left out, and take their turns as normal. Since this is checked every turn, the ships go back to fighting shot by shot as soon as the player arrives.
         
+        Returns:
+            List[List[Starship]]: The ships in each battle, in the order of all_other_ships.
+        """
         game_data = self.game_data
         
-        game_data.ships_in_same_sub_sector_as_player = game_data.grab_ships_in_same_sub_sector(
-            game_data.player, accptable_ship_statuses={
-                STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED, STATUS_DERLICT, STATUS_HULK
-            }
-        )
-        game_data.visible_ships_in_same_sub_sector_as_player = [
-            ship for ship in game_data.ships_in_same_sub_sector_as_player if ship.ship_status.is_visible
+        if not game_data.use_aggregate_combat:
+            return []
+        
+        player_sector = game_data.player.sector_coords.create_coords()
+        
+        ships_in_sub_sector:Dict[Coords, List[Starship]] = {}
+        
+        for entity in game_data.all_other_ships:
+        
+            ship_status = entity.ship_status
+            
+            if not (ship_status.is_active and ship_status.is_visible):
+                continue
+            
+            sector_coords = entity.sector_coords.create_coords()
+            
+            if sector_coords != player_sector:
+                ships_in_sub_sector.setdefault(sector_coords, []).append(entity)
+        
+        return [
+            ships for ships in ships_in_sub_sector.values() if 
+            any(entity.is_enemy for entity in ships) and not all(entity.is_enemy for entity in ships) and 
+            any(can_fire_weapons(entity) for entity in ships)
         ]
-        selected_ship_planet_or_star = game_data.selected_ship_planet_or_star
+
+    def handle_off_screen_battles(self, fleet_rows:List[int]):
+        """Has the ships in each battle from find_off_screen_battles fight it out with an OffScreenBattle, instead of working out their orders with their AI. The rest of their turn, such as life support and repairs, is handled as normal.
         
-        if isinstance(
-            selected_ship_planet_or_star, Starship
-        ) and not selected_ship_planet_or_star.ship_status.is_visible:
+        Args:
+            fleet_rows (List[int]): The fleet state rows of the ships that took their turns are added to this.
         
-            self.game_data.selected_ship_planet_or_star = None
+        Returns:
+            Set[Starship]: The ships that took their turns in a battle, so that they don't take another one.
+        """
+        in_battle:Set[Starship] = set()
         
-        self.game_data.set_condition()
+        for ships in self.find_off_screen_battles():
+        
+            for entity in ships:
+            
+                self.start_ship_turn(entity)
+            
+            # a ship can cloak or lose the last of its crew at the start of its turn
+            fighting = [entity for entity in ships if entity.ship_status.is_active and entity.ship_status.is_visible]
+            
+            OffScreenBattle(fighting, self.game_data.battle_rng).resolve()
+            
+            for entity in ships:
+            
+                if entity.ship_status.is_active:
+                    self.end_ship_turn(entity, fleet_rows)
+            
+            in_battle.update(ships)
+        
+        return in_battle
+
+    def start_ship_turn(self, entity:Starship, dormant:bool=False):
+        """Handles everything that happens to a ship before it takes its turn.
+        
+        Args:
+            entity (Starship): The ship.
+            dormant (bool, optional): Whether is_dormant returned True for the ship. Defaults to False.
+        """
+        if entity.capabilities & ShipCapability.CLOAK:
+            entity.cloak.handle_cooldown_and_status_recovery()
+        
+        # there are no hostile ships around a dormant ship, cloaked or not
+        if not dormant:
+            entity.sensors.detect_all_enemy_cloaked_ships_in_system()
+        
+        if entity.capabilities & ShipCapability.CREW:
+            entity.life_support.on_turn()
+        
+        if not dormant or self.is_strategy_turn(entity):
+            self.game_data.run_update_for_ship(entity)
+
+    def end_ship_turn(self, entity:Starship, fleet_rows:List[int]):
+        """Handles everything that happens to a ship after it has taken its turn.
+        
+        Args:
+            entity (Starship): The ship.
+            fleet_rows (List[int]): If there is a fleet state, the row of the ship is added to this instead of doing its upkeep now.
+        """
+        if self.game_data.fleet_state:
+            fleet_rows.append(entity.fleet_row)
+        else:
+            entity.handle_repair_and_energy_consumption()
+        entity.clear_scan_cache()
+        # the ship has been repaired, so its score is out of date
+        self.game_data.mark_ship_for_scoring(entity)
+
+def load_game(filename: str) -> Engine:
+    """Load an Engine instance from a file."""
+    with open(filename, "rb") as f:
+        engine = pickle.loads(lzma.decompress(f.read()))
+    assert isinstance(engine, Engine)
+    return engine
+
+def set_up_game(
+        *,
+        easy_aim:bool, easy_move:bool, easy_warp:bool, torpedo_warning:bool, crash_warning:bool, three_d_movment:bool,
+        ship_name:str, captain_name:str, scenario:Scenerio, difficulty:type[BaseAi], allied_ai:type[BaseAi],
+        use_fleet_state:bool=False,
+        use_dormancy:bool=False,
+        use_aggregate_combat:bool=False,
+        seed:Optional[int]=None
+    
+    ):
+    game_data = GameData(
+        subsecs_x = CONFIG_OBJECT.sector_width,
+        subsecs_y = CONFIG_OBJECT.sector_height,
+        subsec_size_x = CONFIG_OBJECT.subsector_width,
+        subsec_size_y = CONFIG_OBJECT.subsector_height,
+        easy_aim = easy_aim,
+        easy_move = easy_move,
+        three_d_movment = three_d_movment,
+        easy_warp = easy_warp,
+        torpedo_warning = torpedo_warning,
+        crash_warning = crash_warning,
+        current_datetime = scenario.create_date_time(),
+        starting_stardate = stardate(scenario.create_date_time()),
+        ending_stardate = stardate(scenario.enddate),
+        scenerio=scenario,
+        difficulty=difficulty,
+        alliled_ai=allied_ai,
+        use_fleet_state=use_fleet_state,
+        use_dormancy=use_dormancy,
+        use_aggregate_combat=use_aggregate_combat,
+        seed=seed
+    )
+    engine = Engine(
+        filename = "",
+        player = game_data.player,
+        easy_aim = easy_aim,
+        easy_navigation = easy_move,
+        easy_warp = easy_warp,
+        torpedo_warning = torpedo_warning,
+        crash_warning = crash_warning
+    )
+    engine.game_data = game_data
+
+    game_data.engine = engine
+
+    game_data.set_up_game(ship_name, captain_name)
+    game_data.info_description = game_data.describe_info()
+    return engine
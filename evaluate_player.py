@@ -3,7 +3,7 @@ from collections import OrderedDict
 from datetime import datetime
 from decimal import Decimal
 
-from typing import TYPE_CHECKING, Final, Iterable, List, Tuple
+from typing import TYPE_CHECKING, Dict, Final, Iterable, List, Optional, Tuple
 import colors
 from nation import ALL_NATIONS, Nation
 from starship import Starship
@@ -11,76 +11,130 @@ from starship import Starship
 if TYPE_CHECKING:
     from game_data import GameData
 
-def evaluate_ships(ships:Iterable[Starship]):
-    """This is a pretyy complex function. It looks at the score values of the iterable of starships that was passed in and evaluate them. Idealy, it would check to see what the mission objective is to know how to score them. For example, for the mission objective was to find derlict ships and capture them befre the enemy could destroy them, then it would devide the iterable into three lists. The first list is for captured ship. These would be scored based on the condition they were in. The second list would be for ship that are still delrict. Pherhaps these would be treated as failures on the players fart for failing to capture them, and be scored at zero, or perhaps they woiuld be scored at half their condition. Finally the ships that were destroyed would be scored at zero. 
+# the groups that evaluate_ships sorts ships into
+SCORE_CATEGORIES:Final = ("alive", "captured", "derlict", "destroyed")
 
+def get_score_category(ship:Starship) -> Tuple[Optional[str], float]:
+    """Works out which of the SCORE_CATEGORIES the ship is in, and how much it is worth there. Alive, captured and derlict ships are worth their current stragic_value, and destroyed ships are worth the most that their class can be worth.
+    
     Args:
-        ships (Iterable[Starship]): Ad itterable of Starship objects
-
+        ship (Starship): The ship in question
+    
     Returns:
-        [tuple[float]]: total_ships, number_of_alive_ships, number_of_captured_ships, number_of_derlict_ships, number_of_destroyed_ships, highest_possible_score, total_alive_ships_scores, total_captured_ships_scores, total_derlict_ship_scores, total_destroyed_ship_scores
+        Tuple[Optional[str], float]: The category (or None if the ship isn't in any of them) and the score.
     """
-    total_ships = len(ships)
+    status = ship.ship_status
     
-    _highest_possible_score = [ship.calculate_ship_stragic_value()[0] for ship in ships]
+    if status.is_active:
+        return ("captured" if ship.ship_is_captured else "alive"), ship.stragic_value
+    if status.is_recrewable:
+        return "derlict", ship.stragic_value
+    if status.is_destroyed:
+        return "destroyed", ship.ship_class.max_stragic_value
+    return None, 0.0
+
+class ScoreTally:
+    """Running totals of the numbers and scores that evaluate_ships works out for a group of ships. Instead of looking at every ship when the scores are needed, only the ships that mark_dirty was called for since the last time are scored again. GameData does this when a ship is damaged, repaired, captured or changes status.
+    """
     
-    highest_possible_score = sum(_highest_possible_score)
+    def __init__(self, ships:Iterable[Starship]=()) -> None:
     
-    _alive_ships = [ship for ship in ships if ship.ship_status.is_active]
+        self.categories:Dict[Starship, Optional[str]] = {}
+        self.scores:Dict[Starship, float] = {}
+        
+        self.number_of_ships = {category : 0 for category in SCORE_CATEGORIES}
+        self.total_scores = {category : 0.0 for category in SCORE_CATEGORIES}
+        
+        self.highest_possible_score = 0.0
+        
+        self.dirty:Dict[Starship, None] = {}
+        """The ships that need to be scored again.
+        """
+        for ship in ships:
+            self.add(ship)
     
-    alive_ships = [ship for ship in _alive_ships if not ship.ship_is_captured]
+    def __len__(self):
+        return len(self.categories)
     
-    number_of_alive_ships = len(alive_ships)
+    def __contains__(self, ship:Starship):
+        return ship in self.categories
     
-    captured_ships = [ship for ship in _alive_ships if ship.ship_is_captured]
+    def add(self, ship:Starship):
     
-    number_of_captured_ships = len(captured_ships)
+        if ship not in self.categories:
+        
+            self.categories[ship] = None
+            self.scores[ship] = 0.0
+            
+            self.highest_possible_score += ship.ship_class.max_stragic_value
+            
+            self.dirty[ship] = None
+    
+    def mark_dirty(self, ship:Starship):
+    
+        if ship in self.categories:
+            self.dirty[ship] = None
     
-    destroyed_ships = [ship for ship in ships if ship.ship_status.is_destroyed]
+    def refresh(self):
+        """Scores the ships that have been marked as dirty again, and updates the totals.
+        """
+        for ship in self.dirty:
+        
+            old_category = self.categories[ship]
+            
+            if old_category:
+            
+                self.number_of_ships[old_category] -= 1
+                self.total_scores[old_category] -= self.scores[ship]
+            
+            category, score = get_score_category(ship)
+            
+            if category:
+            
+                self.number_of_ships[category] += 1
+                self.total_scores[category] += score
+            
+            self.categories[ship] = category
+            self.scores[ship] = score
+        
+        self.dirty.clear()
     
-    number_of_destroyed_ships = len(destroyed_ships)
+    def evaluate(self):
+        """Brings the totals up to date and returns them in the same order as evaluate_ships.
+        
+        Returns:
+            [tuple[float]]: total_ships, number_of_alive_ships, number_of_captured_ships, number_of_derlict_ships, number_of_destroyed_ships, highest_possible_score, total_alive_ships_scores, total_captured_ships_scores, total_derlict_ship_scores, total_destroyed_ship_scores
+        """
+        self.refresh()
+        
+        number_of_ships = self.number_of_ships
+        total_scores = self.total_scores
+        
+        return (
+            len(self.categories),
+            number_of_ships["alive"],
+            number_of_ships["captured"],
+            number_of_ships["derlict"],
+            number_of_ships["destroyed"],
+            self.highest_possible_score,
+            total_scores["alive"],
+            total_scores["captured"],
+            total_scores["derlict"],
+            total_scores["destroyed"]
+        )
+
+def evaluate_ships(ships:Iterable[Starship]):
+    """This is a pretyy complex function. It looks at the score values of the iterable of starships that was passed in and evaluate them. Idealy, it would check to see what the mission objective is to know how to score them. For example, for the mission objective was to find derlict ships and capture them befre the enemy could destroy them, then it would devide the iterable into three lists. The first list is for captured ship. These would be scored based on the condition they were in. The second list would be for ship that are still delrict. Pherhaps these would be treated as failures on the players fart for failing to capture them, and be scored at zero, or perhaps they woiuld be scored at half their condition. Finally the ships that were destroyed would be scored at zero. 
     
-    derlict_ships = [ship for ship in ships if ship.ship_status.is_recrewable]
+    For the groups of ships that GameData keeps a ScoreTally for, use that instead, as it doesn't need to look at every ship.
     
-    number_of_derlict_ships = len(derlict_ships)
+    Args:
+        ships (Iterable[Starship]): Ad itterable of Starship objects
     
-    _alive_ships_scores = (
-        (ship.calculate_ship_stragic_value()) for ship in alive_ships
-    )
-    alive_ships_scores = tuple(
-        ship[1] for ship in _alive_ships_scores
-    )
-    _captured_ships_scores = (
-        (ship.calculate_ship_stragic_value()) for ship in captured_ships
-    )
-    captured_ships_scores = tuple(
-        ship[1] for ship in _captured_ships_scores
-    )
-    _derlict_ship_scores = (
-        (ship.calculate_ship_stragic_value(value_multiplier_for_derlict=1.0)) for ship in derlict_ships
-    )
-    derlict_ship_scores = tuple(
-        ship[1] for ship in _derlict_ship_scores
-    )
-    destroyed_ship_scores = tuple(
-        (ship.calculate_ship_stragic_value(value_multiplier_for_destroyed=0.0)[0]) for ship in destroyed_ships
-    )
-    total_alive_ships_scores = sum(alive_ships_scores)
-    total_captured_ships_scores = sum(captured_ships_scores)
-    total_derlict_ship_scores = sum(derlict_ship_scores)
-    total_destroyed_ship_scores = sum(destroyed_ship_scores)
-    return (
-        total_ships,
-        number_of_alive_ships,
-        number_of_captured_ships,
-        number_of_derlict_ships,
-        number_of_destroyed_ships,
-        highest_possible_score,
-        total_alive_ships_scores,
-        total_captured_ships_scores,
-        total_derlict_ship_scores,
-        total_destroyed_ship_scores
-    )
+    Returns:
+        [tuple[float]]: total_ships, number_of_alive_ships, number_of_captured_ships, number_of_derlict_ships, number_of_destroyed_ships, highest_possible_score, total_alive_ships_scores, total_captured_ships_scores, total_derlict_ship_scores, total_destroyed_ship_scores
+    """
+    return ScoreTally(ships).evaluate()
 
 def join_strings(strings:Iterable[str]):
     
@@ -183,11 +237,7 @@ class DestroyEvaluation(ScenerioEvaluation):
     @staticmethod
     def is_game_over(game_data: GameData):
         
-        return ScenerioEvaluation.is_game_over(game_data) or not [
-            ship for ship in game_data.target_enemy_ships if 
-            ship.ship_status.is_active or 
-            ship.ship_status.is_recrewable
-        ]
+        return ScenerioEvaluation.is_game_over(game_data) or not game_data.target_enemy_ships_remaining
     
     @staticmethod
     def describe(amount:float, destroy_ship_classes:Iterable[str], protect_ship_classes:Iterable[str], capture_ship_classes:Iterable[str]):
@@ -199,12 +249,7 @@ class DestroyEvaluation(ScenerioEvaluation):
         ending_text = []
         #total_ships = len(gameDataGlobal.total_starships) - 1
         
-        all_enemy_ships = [
-            ship for ship in game_data.all_enemy_ships if not ship.is_mission_critical
-        ]
-        all_mission_critical_enemy_ships = game_data.target_enemy_ships
-        
-        total_ships, number_of_alive_ships, number_of_captured_ships, number_of_derlict_ships, number_of_destroyed_ships, highest_possible_score, total_alive_ships_scores, total_captured_ships_scores, total_derlict_ships_scores, total_destroyed_ships_scores = evaluate_ships(all_mission_critical_enemy_ships)
+        total_ships, number_of_alive_ships, number_of_captured_ships, number_of_derlict_ships, number_of_destroyed_ships, highest_possible_score, total_alive_ships_scores, total_captured_ships_scores, total_derlict_ships_scores, total_destroyed_ships_scores = game_data.target_enemy_ships_score.evaluate()
         
         alive_score_percentage = total_alive_ships_scores / highest_possible_score
         
@@ -231,9 +276,9 @@ class DestroyEvaluation(ScenerioEvaluation):
         else:
             score_color = colors.orange if destruction_score >= minor_defeat_percent else colors.red
         
-        bonus_total_ships, bonus_number_of_alive_ships, bonus_number_of_captured_ships, bonus_number_of_derlict_ships, bonus_number_of_destroyed_ships, bonus_highest_possible_score, bonus_total_alive_ships_scores, bonus_total_captured_ships_scores, bonus_total_derlict_ships_scores, bonus_total_destroyed_ships_scores = evaluate_ships(all_enemy_ships)
+        bonus_total_ships, bonus_number_of_alive_ships, bonus_number_of_captured_ships, bonus_number_of_derlict_ships, bonus_number_of_destroyed_ships, bonus_highest_possible_score, bonus_total_alive_ships_scores, bonus_total_captured_ships_scores, bonus_total_derlict_ships_scores, bonus_total_destroyed_ships_scores = game_data.other_enemy_ships_score.evaluate()
         
-        friendy_total_ships, number_of_alive_friendly_ships, number_of_captured_friendly_ships, number_of_derlict_friendy_ships, number_of_destroyed_friendy_ships, highest_possible_friendy_score, total_alive_friendy_ships_scores, total_captured_friendy_ships_scores, total_derlict_friendy_ships_scores, total_destroyed_friendy_ships_scores = evaluate_ships(game_data.all_allied_ships)
+        friendy_total_ships, number_of_alive_friendly_ships, number_of_captured_friendly_ships, number_of_derlict_friendy_ships, number_of_destroyed_friendy_ships, highest_possible_friendy_score, total_alive_friendy_ships_scores, total_captured_friendy_ships_scores, total_derlict_friendy_ships_scores, total_destroyed_friendy_ships_scores = game_data.allied_ships_score.evaluate()
         
         evaluation_list:List[Tuple[str,str,Tuple[int,int,int]]] = [
             ("Total Target Enemy Ships:",  f"{total_ships:.2%}", colors.white),
@@ -534,20 +579,15 @@ class ProtectEvaluation(ScenerioEvaluation):
     @staticmethod
     def is_game_over(game_data: GameData):
         
-        return ScenerioEvaluation.is_game_over(game_data) or not [
-            ship for ship in game_data.target_allied_ships if ship.ship_status.is_active
-        ]
+        return ScenerioEvaluation.is_game_over(game_data) or not game_data.target_allied_ships_remaining
 
 class CaptureEvaluation(ScenerioEvaluation):
     
     @staticmethod
     def is_game_over(game_data: GameData):
-        return ScenerioEvaluation.is_game_over(game_data) or not [
-            ship for ship in game_data.target_enemy_ships if 
-            ship.ship_status.is_active or 
-            ship.ship_status.is_recrewable or
-            ship.ship_is_captured
-        ]
+        return ScenerioEvaluation.is_game_over(game_data) or not (
+            game_data.target_enemy_ships_remaining or game_data.target_enemy_ships_captured
+        )
     
     @staticmethod
     def generate_evaluation(game_data:GameData) -> Tuple[str, OrderedDict, Decimal]:
@@ -0,0 +1,366 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, Final, Iterable, Optional
+import numpy as np
+
+from components.starship_system import get_fleet_column_names
+from data_globals import REPAIR_DEDICATED, REPAIR_DOCKED, REPAIR_PER_TURN, CloakStatus
+from ship_class import ShipCapability
+from starship import REPAIRED_SYSTEMS, SHIP_SYSTEMS
+
+if TYPE_CHECKING:
+    from starship import Starship
+
+# every system that a ship can have, and the capability that a ship needs to have it. If the capability is None, then 
+# every ship has that system
+FLEET_SYSTEM_CAPABILITIES:Final = tuple(
+    (name, capability) for name, scan_key, capability in SHIP_SYSTEMS
+) + (("life_support", ShipCapability.CREW),)
+
+# each of these has an integrety column and a has_ column
+FLEET_SYSTEMS:Final = tuple(name for name, capability in FLEET_SYSTEM_CAPABILITIES)
+
+# the columns that Starship and its systems are views into, and the types of their arrays
+FLEET_COLUMNS:Final = (
+    ("hull", np.int64),
+    ("hull_damage", np.float64),
+    ("docked", np.bool_),
+    ("turn_repairing", np.int64),
+    ("version", np.int64),
+    ("energy", np.int64),
+    ("shields", np.int64),
+    ("shields_up", np.bool_),
+    ("polarization_amount", np.int64),
+    ("is_polarized", np.bool_),
+    ("able_crew", np.int64),
+    ("injured_crew", np.int64),
+    ("cloak_status", np.int64)
+) + tuple((f"integrety_{name}", np.float64) for name in FLEET_SYSTEMS)
+
+# the columns that are copied from the ships class, and never change
+SHIP_CLASS_COLUMNS:Final = (
+    ("max_hull", np.float64),
+    ("max_energy", np.float64),
+    ("max_crew", np.float64),
+    ("damage_control", np.float64),
+    ("power_generated_per_turn", np.float64),
+    ("is_automated", np.bool_)
+) + tuple((f"has_{name}", np.bool_) for name in FLEET_SYSTEMS)
+
+def get_effective_value(integrety:np.ndarray):
+    """The same as StarshipSystem.get_effective_value, but for an array of integrety values.
+    
+    Args:
+        integrety (np.ndarray): The integrety of each system.
+    
+    Returns:
+        np.ndarray: The effective value of each system.
+    """
+    return np.where(integrety >= 0.15, np.minimum(1.0, integrety * 1.25), 0.0)
+
+def get_repair_values(name:str, docked:np.ndarray, is_repairing:np.ndarray):
+    """Picks one of the values of REPAIR_DOCKED, REPAIR_DEDICATED or REPAIR_PER_TURN for each ship, the same way that Starship.handle_repair_and_energy_consumption does.
+    
+    Args:
+        name (str): The name of the value, such as "hull_repair".
+        docked (np.ndarray): Whether each ship is docked.
+        is_repairing (np.ndarray): Whether each ship spent the turn repairing.
+    
+    Returns:
+        np.ndarray: The value for each ship.
+    """
+    return np.where(
+        docked, getattr(REPAIR_DOCKED, name),
+        np.where(is_repairing, getattr(REPAIR_DEDICATED, name), getattr(REPAIR_PER_TURN, name))
+    )
+
+class FleetState:
+    """Holds the hull, energy, shields, crew and system integrety of every ship as NumPy columns, with one row per ship. Once a ship is added with add_ship, the ship and its systems read and write those values straight from the columns, so that the per turn upkeep can be done for all of the ships at once by handle_repair_and_energy_consumption.
+    
+    Args:
+        capacity (int, optional): How many rows to start with. More rows are added if they are needed. Defaults to 64.
+        rng (Optional[np.random.Generator], optional): The random number generator that is used for the repairs and healing. If this is None, an unseeded one is created. Defaults to None.
+    """
+    
+    def __init__(self, capacity:int=64, rng:Optional[np.random.Generator]=None) -> None:
+    
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.capacity = max(capacity, 1)
+        self.number_of_rows = 0
+        
+        self.columns:Dict[str, np.ndarray] = {
+            name : np.zeros(self.capacity, dtype=dtype) for name, dtype in FLEET_COLUMNS + SHIP_CLASS_COLUMNS
+        }
+        self.ships:Dict[int, Starship] = {}
+        """The ship in each row.
+        """
+    
+    def grow(self, capacity:int):
+        """Makes the columns big enough to hold at least capacity rows. Since the ships and their systems look the columns up every time, they don't need to be told about this.
+        
+        Args:
+            capacity (int): The number of rows that are needed.
+        """
+        if capacity <= self.capacity:
+            return
+        
+        new_capacity = max(capacity, self.capacity * 2)
+        
+        for name, column in self.columns.items():
+        
+            new_column = np.zeros(new_capacity, dtype=column.dtype)
+            new_column[:self.capacity] = column
+            self.columns[name] = new_column
+        
+        self.capacity = new_capacity
+    
+    def add_ship(self, ship:Starship):
+        """Gives the ship a row, copies its current values into it, and turns the ship and its systems into views of that row.
+        
+        Args:
+            ship (Starship): The ship in question. It must not already be in a FleetState.
+        
+        Returns:
+            int: The row.
+        """
+        assert ship.fleet_state is None
+        
+        row = self.number_of_rows
+        
+        self.grow(row + 1)
+        
+        self.number_of_rows += 1
+        
+        self.ships[row] = ship
+        
+        ship_class = ship.ship_class
+        
+        for name, value in (
+            ("max_hull", ship_class.max_hull),
+            ("max_energy", ship_class.max_energy),
+            ("max_crew", ship_class.max_crew),
+            ("damage_control", ship_class.damage_control),
+            ("power_generated_per_turn", ship_class.power_generated_per_turn),
+            ("is_automated", ship_class.is_automated),
+            ("cloak_status", CloakStatus.INACTIVE.value)
+        ):
+            self.columns[name][row] = value
+        
+        self.attach(ship, row, "")
+        
+        capabilities = ship.capabilities
+        
+        for name, capability in FLEET_SYSTEM_CAPABILITIES:
+        
+            if capability is not None and not capabilities & capability:
+                continue
+            
+            self.columns[f"has_{name}"][row] = True
+            
+            self.attach(getattr(ship, name), row, f"integrety_{name}")
+        
+        return row
+    
+    def attach(self, obj, row:int, fleet_column:str):
+        """Moves the values of all of the FleetColumn attributes of obj into row, and makes obj read them from there.
+        
+        Args:
+            obj (Union[Starship, StarshipSystem]): The ship or system.
+            row (int): The row.
+            fleet_column (str): The column that FleetColumns without a column of their own use, such as the integrety column of a system.
+        """
+        names = get_fleet_column_names(type(obj))
+        
+        values = [getattr(obj, name) for name in names]
+        
+        obj.fleet_state = self
+        obj.fleet_row = row
+        obj.fleet_column = fleet_column
+        
+        for name, value in zip(names, values):
+        
+            setattr(obj, name, value)
+            
+            obj.__dict__.pop(name, None)
+    
+    def handle_repair_and_energy_consumption(self, rows:Iterable[int]):
+        """Does the same thing as Starship.handle_repair_and_energy_consumption for all of the ships in rows at once, following the same REPAIR_DOCKED, REPAIR_DEDICATED and REPAIR_PER_TURN rules.
+        
+        Args:
+            rows (Iterable[int]): The rows of the ships, usualy the ones that took a turn.
+        """
+        rows = np.fromiter(rows, dtype=np.intp)
+        
+        n = len(rows)
+        
+        if n == 0:
+            return
+        
+        columns = self.columns
+        
+        rng = self.rng
+        
+        def read(name:str):
+            return columns[name][rows]
+        
+        docked = read("docked")
+        turn_repairing = read("turn_repairing")
+        
+        is_repairing = turn_repairing != 0
+        
+        time_bonus = 1.0 + (turn_repairing / 25.0)
+        energy_regeneration_bonus = 1.0 + (turn_repairing / 5.0)
+        
+        power_generator_value = get_effective_value(read("integrety_power_generator"))
+        
+        max_energy = read("max_energy") * power_generator_value
+        
+        # shields and polarized hulls don't use energy while the cloak is on
+        is_cloaked = read("has_cloak") & (read("cloak_status") != CloakStatus.INACTIVE.value)
+        
+        energy_cost = (
+            np.where(
+                read("is_polarized") & (read("integrety_polarized_hull") >= 0.15) & ~is_cloaked,
+                read("polarization_amount") * 0.05, 0.0
+            ) +
+            np.where(is_cloaked & (read("integrety_cloak") >= 0.15), max_energy * 0.005, 0.0) +
+            np.where(
+                read("shields_up") & (read("integrety_shield_generator") >= 0.15) & ~is_cloaked,
+                read("shields") * 0.01, 0.0
+            )
+        )
+        is_automated = read("is_automated")
+        able_crew = read("able_crew")
+        injured_crew = read("injured_crew")
+        
+        total_crew = able_crew + injured_crew * 0.25
+        
+        crew_readyness = np.where(
+            is_automated, 1.0,
+            np.where(total_crew == 0, 0.0, total_crew / np.maximum(read("max_crew"), 1.0) * 0.5 + 0.5)
+        )
+        repair_amount = read("damage_control") * crew_readyness * time_bonus
+        
+        hull_repair_factor = repair_amount * get_repair_values("hull_repair", docked, is_repairing)
+        
+        system_repair_factor = repair_amount * get_repair_values("system_repair", docked, is_repairing)
+        
+        energy_rengerated_this_turn = (
+            get_repair_values("energy_regeration", docked, is_repairing) * power_generator_value *
+            energy_regeneration_bonus * read("power_generated_per_turn")
+        ) - energy_cost
+        
+        # the same as the PowerGenerator.energy setter, which caps the energy at the largest whole number that isn't 
+        # more then the max energy
+        columns["energy"][rows] = np.minimum(
+            np.maximum(np.round(read("energy") + energy_rengerated_this_turn), 0), np.floor(max_energy)
+        ).astype(np.int64)
+        # the same as LifeSupport.heal_crew(0.2, randint(2, 5))
+        percentage_healed = 0.2 * get_effective_value(read("integrety_life_support"))
+        
+        healed_crew = np.where(
+            is_automated, 0,
+            np.minimum(injured_crew, np.ceil(injured_crew * percentage_healed) + rng.integers(2, 6, n))
+        ).astype(np.int64)
+        
+        columns["able_crew"][rows] = able_crew + healed_crew
+        columns["injured_crew"][rows] = injured_crew - healed_crew
+        
+        max_hull = read("max_hull")
+        
+        hull_repair_amount = hull_repair_factor * rng.uniform(0.5, 1.25, n) * max_hull
+        
+        perm_hull_repair = np.ceil(
+            hull_repair_amount * get_repair_values("repair_permanent_hull_damage", docked, is_repairing)
+        )
+        hull_damage = np.maximum(read("hull_damage") - perm_hull_repair, 0.0)
+        
+        old_hull = read("hull")
+        
+        columns["hull_damage"][rows] = hull_damage
+        columns["hull"][rows] = np.minimum(np.round(old_hull + hull_repair_amount), max_hull - hull_damage)
+        
+        # the ships have changed without going through their setters
+        columns["version"][rows] += 1
+        
+        # healing crew never brings a derlict back, so only a ship that was a wreck can have changed its status
+        for row in rows[(old_hull <= 0) & (read("hull") != old_hull)]:
+        
+            self.ships[int(row)].update_ship_status()
+        
+        for name in REPAIRED_SYSTEMS:
+        
+            integrety = read(f"integrety_{name}")
+            
+            columns[f"integrety_{name}"][rows] = np.where(
+                read(f"has_{name}"),
+                np.clip(integrety + system_repair_factor * (0.5 + rng.random(n) * 0.5), 0.0, 1.0),
+                integrety
+            )
+    
+    def compare_upkeep(self, ship:Starship):
+        """Checks that handle_repair_and_energy_consumption does the same thing to the ship as Starship.handle_repair_and_energy_consumption. Both are run from the same starting values with a FixedRng, so that they get the same rolls even though they roll in a diffrent order, and then the ship is put back the way it was.
+        
+        Args:
+            ship (Starship): The ship in question. It must be in this FleetState.
+        
+        Returns:
+            Dict[str, Tuple[float, float]]: The columns that came out diffrent, with the value from the Starship and the value from the FleetState. If this is empty, they both did the same thing.
+        """
+        row = ship.fleet_row
+        
+        columns = self.columns
+        
+        # the version is bumped once by each setter that the Starship uses, so it is not compared
+        names = tuple(name for name, dtype in FLEET_COLUMNS if name != "version")
+        
+        before = {name : columns[name][row] for name in names}
+        
+        def read():
+            return {name : columns[name][row] for name in names}
+        
+        def restore():
+            for name, value in before.items():
+                columns[name][row] = value
+            columns["version"][row] += 1
+        
+        ship_rng = ship.rng
+        fleet_rng = self.rng
+        
+        try:
+            ship.rng = FixedRng()
+            ship.handle_repair_and_energy_consumption()
+            
+            from_ship = read()
+            
+            restore()
+            
+            self.rng = FixedRng()
+            self.handle_repair_and_energy_consumption((row,))
+            
+            from_fleet = read()
+        finally:
+            ship.rng = ship_rng
+            self.rng = fleet_rng
+            
+            restore()
+            ship.update_ship_status()
+        
+        return {
+            name : (float(from_ship[name]), float(from_fleet[name])) for name in names if 
+            not np.isclose(from_ship[name], from_fleet[name])
+        }
+
+class FixedRng:
+    """Stands in for an np.random.Generator in FleetState.compare_upkeep. Every roll comes out in the middle of its range, so the result doesn't depend on the order of the rolls.
+    """
+    
+    def integers(self, low:int, high:int, size:Optional[int]=None):
+        value = (low + high - 1) // 2
+        return value if size is None else np.full(size, value, dtype=np.int64)
+    
+    def uniform(self, low:float=0.0, high:float=1.0, size:Optional[int]=None):
+        value = (low + high) * 0.5
+        return value if size is None else np.full(size, value)
+    
+    def random(self, size:Optional[int]=None):
+        return 0.5 if size is None else np.full(size, 0.5)
@@ -1,22 +1,31 @@
 from __future__ import annotations
 from datetime import datetime
 from decimal import Decimal
-from ai import BaseAi
+from ai import NEARBYE_SHIP_STATUSES, BaseAi
 from coords import Coords
+from evaluate_player import ScoreTally
+from fleet_state import FleetState
+from game_events import EventBus, ShipChangedNation, ShipDamaged, ShipDestroyed, ShipPassedThrough, ShipStatusChanged, ShipWarped, TorpedoFired
 from data_globals import CONDITION_BLUE, CONDITION_GREEN, CONDITION_RED, CONDITION_YELLOW, DAMAGE_TORPEDO, PLANET_FRIENDLY, PLANET_HOSTILE, PLANET_NEUTRAL, STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED, STATUS_DERLICT, STATUS_HULK, PlanetHabitation, ShipStatus
-from random import choice, choices, shuffle
-from typing import Any, Dict, FrozenSet, List, Optional, TYPE_CHECKING, Tuple, Type, Union, Set, OrderedDict
+from random import Random, randrange
+import numpy as np
+from typing import Any, Dict, Final, FrozenSet, List, Optional, TYPE_CHECKING, Tuple, Type, Union, Set, OrderedDict
 
 from get_config import CONFIG_OBJECT
 from global_functions import stardate
 from nation import Nation
 from scenario import Scenerio
 from starship import Starship
-from ship_class import ALL_SHIP_CLASSES
-from space_objects import Star, SubSector, Planet, SubSectorInfo
+from ship_class import ALL_SHIP_CLASSES, ShipCapability
+from space_objects import OCCUPANCY_PLANET, OCCUPANCY_STAR, SectorKnowledge, ShipsByStatus, Star, SubSector, Planet, SubSectorInfo
 import colors
 from torpedo import Torpedo
 
+# the streams that create_ship_rng can create for each ship
+SHIP_RNG_OUTCOMES:Final = 0
+SHIP_RNG_DECISIONS:Final = 1
+SHIP_RNG_BATTLES:Final = 2
+
 if TYPE_CHECKING:
     from engine import Engine
 
@@ -35,8 +44,23 @@ class GameData:
         torpedo_warning:bool, crash_warning:bool, three_d_movment:bool,
         scenerio:Scenerio,
         difficulty:Type[BaseAi],
-        alliled_ai:Type[BaseAi]
+        alliled_ai:Type[BaseAi],
+        use_fleet_state:bool=False,
+        use_dormancy:bool=False,
+        use_aggregate_combat:bool=False,
+        seed:Optional[int]=None
     ):
+        self.event_bus = EventBus()
+        """Ships, sub sectors and planets publish what happens to them here, and GameData and the sub sectors subscribe to it to keep their indexes and counts up to date.
+        """
+        self.event_bus.subscribe(ShipStatusChanged, self.on_ship_status_changed)
+        self.event_bus.subscribe(ShipChangedNation, self.on_ship_changed_nation)
+        self.event_bus.subscribe(ShipWarped, self.on_ship_warped)
+        self.event_bus.subscribe(ShipPassedThrough, self.on_ship_passed_through)
+        self.event_bus.subscribe(ShipDestroyed, self.on_ship_destroyed)
+        self.event_bus.subscribe(ShipDamaged, self.on_ship_damaged)
+        self.event_bus.subscribe(TorpedoFired, self.on_torpedo_fired)
+        
         self.subsecs_x = subsecs_x
         self.subsecs_y = subsecs_y
         self.subsecs_range_x = range(subsecs_x)
@@ -64,8 +88,13 @@ class GameData:
         self.player_subsector_info:List[List[SubSectorInfo]] = []
         self.enemy_subsector_info:List[List[SubSectorInfo]] = []
         
+        self.player_sector_knowledge:Optional[SectorKnowledge] = None
+        self.enemy_sector_knowledge:Optional[SectorKnowledge] = None
+        
         self.scenerio = scenerio
                 
+        self.turn_number = 0
+        
         self.date_time:Optional[datetime] = current_datetime
         self.starting_stardate = starting_stardate
         self.stardate = stardate(current_datetime)
@@ -84,13 +113,55 @@ class GameData:
         
         # Ships that must be destroyed
         self.target_enemy_ships:List[Starship] = []
+        self.target_enemy_ships_by_status = ShipsByStatus()
         
         self.all_allied_ships:List[Starship] = []
         
         # Ships that the player must prevent from being destroyed
         self.target_allied_ships:List[Starship] = []
+        self.target_allied_ships_by_status = ShipsByStatus()
+        
+        # Ships that are hostile to the player, including captured ships. This is used by set_condition
+        self.enemy_ships_by_status = ShipsByStatus()
+        
+        # live counts of the target ships, so that is_game_over doesn't have to look at each of them. These are kept by 
+        # add_target_ship and the event handlers
+        self.target_enemy_ships_remaining = 0
+        """The number of target enemy ships that are active or can be recrewed.
+        """
+        self.captured_target_enemy_ships:Set[Starship] = set()
+        self.target_allied_ships_remaining = 0
+        """The number of target allied ships that are active.
+        """
+        
+        # running scores for the evaluation screen, see add_ship_to_score and mark_ship_for_scoring
+        self.target_enemy_ships_score = ScoreTally()
+        self.other_enemy_ships_score = ScoreTally()
+        self.allied_ships_score = ScoreTally()
+        
+        self.game_over = False
+        """Set when the player or one of the target ships changes status and the scenario's is_game_over says that the game has ended.
+        """
         
         self.total_starships:List[Starship] = []
+        
+        self.use_fleet_state = use_fleet_state
+        self.fleet_state:Optional[FleetState] = None
+        """If use_fleet_state is True, this holds the hull, energy, shields, crew and system integrety of every ship, so that the upkeep at the end of each turn can be done for all of the ships at once.
+        """
+        self.use_dormancy = use_dormancy
+        """If True, ships that are far from the player and from any hostile ships skip most of their turns, see Engine.is_dormant.
+        """
+        self.use_aggregate_combat = use_aggregate_combat
+        """If True, fights between AI ships in sub sectors that the player isn't in are resolved all at once, see Engine.find_off_screen_battles.
+        """
+        self.seed = seed if seed is not None else randrange(2**32)
+        """The master seed of the game. The random number generators of the ships and sub sectors, and the one that is used to set up the game, are all created from this, so the same seed always gives the same game.
+        """
+        # ship_id 0 is never given to a ship, so the off screen battles can have one of its streams
+        self.battle_rng = self.create_ship_rng(0, SHIP_RNG_BATTLES)
+        """The random number generator that is used by OffScreenBattle.
+        """
         self.cause_of_damage = ''
 
         self.condition = CONDITION_GREEN
@@ -131,22 +202,21 @@ class GameData:
         return self.scenerio.self_destruct_code
     
     def set_condition(self):
-
+    
         player = self.player
         
-        all_other_ships = [
-            ship for ship in self.all_other_ships if ship.ship_status.is_active and 
-            ship.nation in self.scenerio.get_set_of_enemy_nations
-        ]
-        if not all_other_ships:
+        if not self.enemy_ships_by_status.any_ships(lambda status: status.is_active):
             self.condition = CONDITION_GREEN
         else:
             if player.docked:
                 self.condition = CONDITION_BLUE
             else:
-                other_ships = [ship for ship in all_other_ships if ship.sector_coords == player.sector_coords]
-
-                self.condition = CONDITION_RED if len(other_ships) > 0 else CONDITION_YELLOW
+                buckets = player.get_sub_sector.ships_by_status.buckets
+                
+                enemy_ship_is_here = any(
+                    ship.is_enemy for status, ships in buckets.items() if status.is_active for ship in ships
+                )
+                self.condition = CONDITION_RED if enemy_ship_is_here else CONDITION_YELLOW
         
         self.player_scan = player.scan_for_print(1)
         
@@ -163,11 +233,20 @@ class GameData:
 
     def set_up_game(self, ship_name:str, captain_name:str):
         self.captain_name = captain_name
+        
+        rng = self.create_rng("set up")
 
         self.grid = [[SubSector(self, x, y) for x in self.subsecs_range_x] for y in self.subsecs_range_y]
         
-        self.player_subsector_info = [[SubSectorInfo(x, y) for x in self.subsecs_range_x] for y in self.subsecs_range_y]
-        self.enemy_subsector_info = [[SubSectorInfo(x, y) for x in self.subsecs_range_x] for y in self.subsecs_range_y]
+        self.player_sector_knowledge = SectorKnowledge(self.subsecs_x, self.subsecs_y)
+        self.enemy_sector_knowledge = SectorKnowledge(self.subsecs_x, self.subsecs_y)
+        
+        self.player_subsector_info = [
+            [SubSectorInfo(x, y, self.player_sector_knowledge) for x in self.subsecs_range_x] for y in self.subsecs_range_y
+        ]
+        self.enemy_subsector_info = [
+            [SubSectorInfo(x, y, self.enemy_sector_knowledge) for x in self.subsecs_range_x] for y in self.subsecs_range_y
+        ]
         
         # create stars and planets
         for x in self.subsec_size_range_x:
@@ -182,7 +261,7 @@ class GameData:
         
         for a in self.scenerio.enemy_encounters:
             
-            l = list(a.generate_ships())
+            l = list(a.generate_ships(rng))
             
             all_enemy_encounters.extend(
                 l
@@ -193,14 +272,14 @@ class GameData:
         
         for a in self.scenerio.allied_encounters:
             
-            l = list(a.generate_ships())
+            l = list(a.generate_ships(rng))
             
             all_allied_encounters.extend(
                 l
             )
         total_allied = len(all_allied_encounters)
         
-        selected_coords = choices(
+        selected_coords = rng.choices(
             system_coords, k=total_enemy + total_allied + 1
         )
         # we use k = total + 1 because the last coord in selected_coords will be used as the players starting point
@@ -210,13 +289,13 @@ class GameData:
         selected_allied_coords = selected_coords[total_enemy:total_enemy+total_allied]
         
         try:
-            player_starting_coord = choice(selected_allied_coords)
+            player_starting_coord = rng.choice(selected_allied_coords)
         except IndexError:
             
             coords_without_enemies = [
                 co for co in system_coords if co not in selected_enemy_coords
             ]
-            player_starting_coord = choice(coords_without_enemies)
+            player_starting_coord = rng.choice(coords_without_enemies)
         
         def generate_ships(
             selected_encounters:List[Dict[str,int]],
@@ -241,7 +320,8 @@ class GameData:
                     ship_class = ALL_SHIP_CLASSES[k]
 
                     starship = Starship(
-                        ship_class, ai_difficulty, local_co.x, local_co.y, star_system.coords.x, star_system.coords.y
+                        ship_class, ai_difficulty, local_co.x, local_co.y, star_system.coords.x, star_system.coords.y,
+                        name=ship_class.create_name(rng)
                     )
                     starship.game_data = self
                     
@@ -254,9 +334,6 @@ class GameData:
                 self.difficulty
             )
         )
-        self.target_enemy_ships = [
-            ship for ship in self.all_enemy_ships if ship.is_mission_critical
-        ]
         self.all_allied_ships = list(
             generate_ships(
                 all_allied_encounters,
@@ -264,9 +341,15 @@ class GameData:
                 self.allied_ai
             )
         )
-        self.target_allied_ships = [
-            ship for ship in self.all_allied_ships if ship.is_mission_critical
-        ]
+        for ship in self.all_enemy_ships + self.all_allied_ships:
+        
+            if ship.is_mission_critical:
+            
+                self.add_target_ship(ship)
+            
+            self.add_ship_to_score(ship)
+        
+        self.enemy_ships_by_status = ShipsByStatus(self.all_enemy_ships)
         randXsec = player_starting_coord.x
         randYsec = player_starting_coord.y
 
@@ -274,26 +357,40 @@ class GameData:
 
         player_ship_class = self.scenerio.your_ship
 
-        self.player = Starship(player_ship_class, BaseAi, locPos.x, locPos.y, randXsec, randYsec, name=ship_name)
+        self.player = Starship(
+            player_ship_class, BaseAi, locPos.x, locPos.y, randXsec, randYsec,
+            name=ship_name if ship_name else player_ship_class.create_name(rng)
+        )
         self.player.game_data = self
         self.engine.player = self.player
         
         all_other_ships = self.all_enemy_ships + self.all_allied_ships
         
-        shuffle(all_other_ships)
+        rng.shuffle(all_other_ships)
         
         self.all_other_ships = all_other_ships
 
         self.total_starships = [self.player] + self.all_other_ships
-
-        self.ships_in_same_sub_sector_as_player = self.grab_ships_in_same_sub_sector(
-            self.player, accptable_ship_statuses={
-                STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED, STATUS_DERLICT, STATUS_HULK
-            }
-        )
-        self.visible_ships_in_same_sub_sector_as_player = [
-            ship for ship in self.ships_in_same_sub_sector_as_player if ship.ship_status.is_visible
-        ]
+        
+        if self.use_fleet_state:
+        
+            # ship_id 0 is never given to a ship, so the fleet state can have that stream
+            self.fleet_state = FleetState(len(self.total_starships), self.create_ship_rng(0, SHIP_RNG_OUTCOMES))
+        
+        for ship_id, ship in enumerate(self.total_starships, 1):
+        
+            ship.ship_id = ship_id
+            self.seed_ship_rngs(ship)
+            
+            if self.fleet_state:
+                self.fleet_state.add_ship(ship)
+            
+            sub_sector = ship.get_sub_sector
+            
+            # this publishes a ShipWarped event, which fills in ships_in_same_sub_sector_as_player
+            sub_sector.add_ship_to_sec(ship)
+            sub_sector.place_ship(ship)
+        
         self.set_condition()
                 
         for ship in self.total_starships:
@@ -304,6 +401,38 @@ class GameData:
             f"Welcome aboard, {self.player.ship_class.nation.captain_rank_name} {self.captain_name}."
         )
 
+    def create_rng(self, *key:Union[str, int]):
+        """Creates a random number generator for one part of the game, such as a sub sector. The same key always gives the same stream for the same seed.
+        
+        Args:
+            key (Union[str, int]): What the generator is for, such as ("sub sector", x, y).
+        
+        Returns:
+            Random: The random number generator.
+        """
+        return Random(":".join(str(k) for k in (self.seed,) + key))
+    
+    def create_ship_rng(self, ship_id:int, stream:int):
+        """Creates a random number generator for a ship. Each ship gets its own streams, so what one ship rolls doesn't change what the others roll.
+        
+        Args:
+            ship_id (int): The ship_id of the ship.
+            stream (int): One of SHIP_RNG_OUTCOMES, SHIP_RNG_DECISIONS or SHIP_RNG_BATTLES.
+        
+        Returns:
+            np.random.Generator: The random number generator.
+        """
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(ship_id, stream)))
+    
+    def seed_ship_rngs(self, ship:Starship):
+        """Gives the ship an rng and a decision_rng that are seeded from the seed of the game and its ship_id.
+        
+        Args:
+            ship (Starship): The ship. Its ship_id must have been set.
+        """
+        ship.rng = self.create_ship_rng(ship.ship_id, SHIP_RNG_OUTCOMES)
+        ship.decision_rng = self.create_ship_rng(ship.ship_id, SHIP_RNG_DECISIONS)
+
     def describe_warp_factor(self):
         try:
             wf = self.player.warp_drive.current_warp_factor
@@ -356,25 +485,203 @@ class GameData:
 
     #-----Gameplay related------
     
+    def get_ship_by_id(self, ship_id:int) -> Starship:
+        
+        return self.total_starships[ship_id - 1]
+
+    def clear_scan_caches(self):
+        """Throws away the cached scans of every ship. This is called at the end of every turn.
+        """
+        for ship in self.total_starships:
+            ship.clear_scan_cache()
+
+    def clear_tactical_contexts(self):
+        """Throws away the tactical context and line of fire of every sub sector. This is called at the end of every turn.
+        """
+        for row in self.grid:
+            for sub_sector in row:
+                sub_sector.tactical_context = None
+                sub_sector.line_of_fire = None
+
+    def update_ships_in_same_sub_sector_as_player(self):
+        """Rebuilds ships_in_same_sub_sector_as_player and visible_ships_in_same_sub_sector_as_player. This is only called when a ship in the players sub sector changes status, a ship enters or leaves it, or the player passes through a sub sector at warp, so it only looks at the ships there.
+        """
+        self.ships_in_same_sub_sector_as_player = self.grab_ships_in_same_sub_sector(
+            self.player, accptable_ship_statuses=NEARBYE_SHIP_STATUSES
+        )
+        self.visible_ships_in_same_sub_sector_as_player = [
+            ship for ship in self.ships_in_same_sub_sector_as_player if ship.ship_status.is_visible
+        ]
+    
+    def is_near_player(self, ship:Starship, sector_coords:Coords):
+    
+        return self.player is not None and (ship is self.player or sector_coords == self.player.sector_coords)
+    
+    def add_target_ship(self, ship:Starship):
+        """Adds a mission critical ship to target_enemy_ships or target_allied_ships, depending on which side it is on, and counts it towards the objectives.
+        
+        Args:
+            ship (Starship): The ship in question
+        """
+        status = ship.ship_status
+        
+        if ship.is_enemy:
+        
+            self.target_enemy_ships.append(ship)
+            self.target_enemy_ships_by_status.add(ship)
+            
+            self.target_enemy_ships_remaining += status.is_active or status.is_recrewable
+            
+            if ship.ship_is_captured:
+                self.captured_target_enemy_ships.add(ship)
+        else:
+            self.target_allied_ships.append(ship)
+            self.target_allied_ships_by_status.add(ship)
+            
+            self.target_allied_ships_remaining += status.is_active
+    
+    def add_ship_to_score(self, ship:Starship):
+        """Adds the ship to target_enemy_ships_score, other_enemy_ships_score or allied_ships_score, depending on which side it is on and if it is mission critical.
+        
+        Args:
+            ship (Starship): The ship in question
+        """
+        if ship.is_enemy:
+        
+            (self.target_enemy_ships_score if ship.is_mission_critical else self.other_enemy_ships_score).add(ship)
+        else:
+            self.allied_ships_score.add(ship)
+    
+    def mark_ship_for_scoring(self, ship:Starship):
+        """Has the ship scored again the next time one of the score tallies is read. This only costs a dictionary lookup, so it can be called every time something happens to the ship.
+        
+        Args:
+            ship (Starship): The ship in question
+        """
+        self.target_enemy_ships_score.mark_dirty(ship)
+        self.other_enemy_ships_score.mark_dirty(ship)
+        self.allied_ships_score.mark_dirty(ship)
+    
+    @property
+    def target_enemy_ships_captured(self):
+        return len(self.captured_target_enemy_ships)
+    
+    def on_ship_status_changed(self, event:ShipStatusChanged):
+        """Moves the ship to its new status in the ship indexes, and checks if the game has ended if the ship is the player or one of the target ships.
+        
+        Args:
+            event (ShipStatusChanged): The event.
+        """
+        ship = event.ship
+        old_status = event.old_status
+        new_status = event.new_status
+        
+        self.mark_ship_for_scoring(ship)
+        
+        if ship in self.target_enemy_ships_by_status:
+        
+            self.target_enemy_ships_remaining += (new_status.is_active or new_status.is_recrewable) - (
+                old_status.is_active or old_status.is_recrewable
+            )
+        if ship in self.target_allied_ships_by_status:
+        
+            self.target_allied_ships_remaining += new_status.is_active - old_status.is_active
+        
+        self.target_enemy_ships_by_status.move(ship, new_status)
+        self.target_allied_ships_by_status.move(ship, new_status)
+        self.enemy_ships_by_status.move(ship, new_status)
+        
+        if self.is_near_player(ship, event.sector_coords):
+        
+            self.update_ships_in_same_sub_sector_as_player()
+        
+        if ship is self.selected_ship_planet_or_star and not new_status.is_visible:
+        
+            self.selected_ship_planet_or_star = None
+        
+        if ship is self.player or ship in self.target_enemy_ships_by_status or ship in self.target_allied_ships_by_status:
+        
+            self.game_over = self.scenerio.scenario_type.is_game_over(self)
+    
+    def on_ship_changed_nation(self, event:ShipChangedNation):
+    
+        ship = event.ship
+        
+        self.mark_ship_for_scoring(ship)
+        
+        if ship.is_enemy:
+            self.enemy_ships_by_status.add(ship)
+        else:
+            self.enemy_ships_by_status.discard(ship)
+        
+        if self.is_near_player(ship, event.sector_coords):
+        
+            self.update_ships_in_same_sub_sector_as_player()
+        
+        if ship in self.target_enemy_ships_by_status:
+        
+            if ship.ship_is_captured:
+                self.captured_target_enemy_ships.add(ship)
+            else:
+                self.captured_target_enemy_ships.discard(ship)
+        
+        # capturing a target ship can end the game
+        if ship in self.target_enemy_ships_by_status or ship in self.target_allied_ships_by_status:
+        
+            self.game_over = self.scenerio.scenario_type.is_game_over(self)
+    
+    def on_ship_warped(self, event:ShipWarped):
+    
+        if self.is_near_player(event.ship, event.sector_coords):
+        
+            self.update_ships_in_same_sub_sector_as_player()
+    
+    def on_ship_passed_through(self, event:ShipPassedThrough):
+    
+        # other ships that are passing through aren't added to the sub sector, so they don't change the lists
+        if event.ship is self.player:
+        
+            self.update_ships_in_same_sub_sector_as_player()
+    
+    def on_ship_damaged(self, event:ShipDamaged):
+    
+        self.mark_ship_for_scoring(event.ship)
+    
+    def on_ship_destroyed(self, event:ShipDestroyed):
+    
+        self.mark_ship_for_scoring(event.ship)
+        
+        if event.ship is self.selected_ship_planet_or_star:
+        
+            self.selected_ship_planet_or_star = None
+    
+    def on_torpedo_fired(self, event:TorpedoFired):
+    
+        if event.ship.is_controllable:
+        
+            self.player_record["torpedos_fired"] += event.number
+    
     def grab_ships_in_same_sub_sector(self, ship:Starship, *, include_self_in_ships_to_grab:bool=False, accptable_ship_statuses:Optional[Set[ShipStatus]]=None):
+    
+        sub_sector = self.grid[ship.sector_coords.y][ship.sector_coords.x]
+        
+        ships_in_sub_sector = sub_sector.ships
         
         if accptable_ship_statuses:
+        
+            # filtering sub_sector.ships keeps the ships in the order that they entered the sub sector. Reading them out 
+            # of ships_by_status would group them by status, which would change the order that the AIs look at their 
+            # targets in
             return (
-                [
-                    s for s in self.total_starships 
-                    if s.sector_coords == ship.sector_coords and s.ship_status in accptable_ship_statuses
-                ] 
+                [s for s in ships_in_sub_sector if s.ship_status in accptable_ship_statuses] 
                 if include_self_in_ships_to_grab else 
-                [
-                    s for s in self.total_starships 
-                    if s.sector_coords == ship.sector_coords and s.ship_status in accptable_ship_statuses and 
-                    s is not ship
-                ]
+                [s for s in ships_in_sub_sector if s.ship_status in accptable_ship_statuses and s is not ship]
             )
+        
         return (
-            [s for s in self.total_starships if s.sector_coords == ship.sector_coords] 
+            ships_in_sub_sector.copy() 
             if include_self_in_ships_to_grab else 
-            [s for s in self.total_starships if s.sector_coords == ship.sector_coords and s is not ship]
+            [s for s in ships_in_sub_sector if s is not ship]
         )
 
     def _check_ship(self, ship:Starship, visibility_status:Optional[bool]=None, activity_status:Optional[bool]=None):
@@ -392,76 +699,26 @@ class GameData:
         return True
     
     def run_update_for_ship(self, ship:Starship):
+        """Updates what the ship's side knows about the sub sectors that are within range of the ship's scanners.
+
+        Args:
+            ship (Starship): The ship that is scanning.
+        """
+        knowledge = self.enemy_sector_knowledge if ship.is_enemy else self.player_sector_knowledge
         
-        ship_is_enemy = ship.is_enemy
-        
-        subsector_infos = self.enemy_subsector_info if ship_is_enemy else self.player_subsector_info
-        
-        scan_distance = 5
-                
-        for y in range(ship.sector_coords.y - scan_distance, ship.sector_coords.y + scan_distance):
-            
-            for x in range(
-                ship.sector_coords.x - scan_distance, ship.sector_coords.x + scan_distance
-            ):
-                try:
-                    subsec_info = subsector_infos[y][x]
-                    
-                    if subsec_info.needs_updating and (
-                        ship.sector_coords == subsec_info.coords or 
-                        ship.sector_coords.distance(coords=subsec_info.coords) <= scan_distance
-                    ):
-                        if subsec_info.planet_count_needs_updating:
-                            
-                            subsector = self.grid[y][x]
-                            
-                            subsec_info.barren_planets = subsector.barren_planets
-                            
-                            subsec_info.total_stars = subsector.total_stars
-                            
-                            planets:List[PlanetHabitation] = [
-                                (
-                                    planet.enemy_display_status if ship_is_enemy else planet.player_display_status
-                                ) for planet in subsector.planets_dict.values() if 
-                                planet.planet_habbitation.has_disposition_towards_warp_capiable_civs
-                            ]
-                            subsec_info.friendly_planets = len(
-                                [planet for planet in planets if planet == PLANET_FRIENDLY]
-                            )
-                            subsec_info.neutral_planets = len(
-                                [planet for planet in planets if planet == PLANET_NEUTRAL]
-                            )
-                            subsec_info.unfriendly_planets = len(
-                                [planet for planet in planets if planet == PLANET_HOSTILE]
-                            )
-                            subsec_info.planet_count_needs_updating = False
-                        
-                        if subsec_info.ship_count_needs_updating:
-                            
-                            ships_in_subsector = [
-                                ship for ship in self.total_starships if 
-                                ship.sector_coords.x == x and ship.sector_coords.y == y and 
-                                ship.ship_status in {STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_DERLICT}
-                            ]
-                            subsec_info.hostile_ships = len([
-                                ship for ship in ships_in_subsector if
-                                ship.ship_status != STATUS_DERLICT and
-                                ship.is_enemy != ship_is_enemy
-                            ])
-                            subsec_info.derelicts = len([
-                                ship for ship in ships_in_subsector if
-                                ship.ship_status == STATUS_DERLICT
-                            ])
-                            subsec_info.ship_count_needs_updating = False
-                except IndexError:
-                    pass
-        
+        knowledge.scan(
+            ship.sector_coords.x, ship.sector_coords.y, ship.scanner.get_range, self.turn_number
+        )
+    
     def handle_torpedo(
         self, *, shipThatFired:Starship, torpsFired:int, heading:int, coords:Tuple[Coords], 
         torpedo_type:Torpedo, ships_in_area:Dict[Coords, Starship]
     ):
         torpedo = torpedo_type
-
+        
+        self.event_bus.publish(
+            TorpedoFired(shipThatFired.sector_coords.create_coords(), shipThatFired, torpedo, torpsFired)
+        )
         #posX, posY = shipThatFired.local_coords.x, shipThatFired.local_coords.y
         
         descriptive_number = "a" if torpsFired == 1 else f"{torpsFired}"
@@ -474,83 +731,83 @@ class GameData:
         
         shipsInArea = ships_in_area
 
+        ray, occupancy = g.get_ray_occupancy(coords)
+        
+        obstacles = np.flatnonzero(occupancy)
+
         for t in range(torpsFired):
 
             hitSomething=False
             missed_the_target=False
 
-            x = 0
-            y = 0
+            x, y = (int(ray[-1, 0]), int(ray[-1, 1])) if len(ray) else (0, 0)
 
-            for co in coords:
-                #x_, y_ = co.x, co.y
+            for i in obstacles:
                 
-                if not (0<= co.x < CONFIG_OBJECT.subsector_width) or not (0<= co.y < CONFIG_OBJECT.subsector_height):
-                    break
-
-                x,y = co.x, co.y
-                try:
-                    star = g.stars_dict[co]
+                co = Coords(x=int(ray[i, 0]), y=int(ray[i, 1]))
+                
+                if occupancy[i] == OCCUPANCY_STAR:
+                    
                     self.engine.message_log.add_message(f"The torpedo impacts against a star at {co.x}, {co.y}.")
                     hitSomething=True
-                except KeyError:
-
+                    
+                elif occupancy[i] == OCCUPANCY_PLANET:
+                    
+                    planet = g.planets_dict[co]
+                    planet.hit_by_torpedo(shipThatFired, self, torpedo)
+                    hitSomething=True
+                else:
                     try:
-                        planet = g.planets_dict[co]
-                        planet.hit_by_torpedo(shipThatFired.is_controllable, self, torpedo)
-                        hitSomething=True
+                        ship = shipsInArea[co]
                     except KeyError:
-                        try:
-                            ship = shipsInArea[co]
-                            try:
-                                crew_readyness = shipThatFired.life_support.crew_readyness
-                            except AttributeError:
-                                crew_readyness = 1
-                            try:
-                                target_crew_readyness = ship.life_support.crew_readyness
-                            except AttributeError:
-                                target_crew_readyness = 1
-                            
-                            estimated_enemy_impulse = ship.impulse_engine.get_effective_value
-                            
-                            hitSomething = shipThatFired.roll_to_hit(
-                                ship, 
-                                damage_type=DAMAGE_TORPEDO,
-                                estimated_enemy_impulse=estimated_enemy_impulse,
-                                systems_used_for_accuray=(
-                                    shipThatFired.sensors.get_effective_value,
-                                    shipThatFired.torpedo_launcher.get_effective_value
-                                ),
-                                crew_readyness=crew_readyness,
-                                target_crew_readyness=target_crew_readyness
-                            )                            
-                            if hitSomething:
-                                
-                                ship_name = "We were" if ship.is_controllable else f"{ship.name} was"
-                                
-                                shipThatFired_name = "us" if shipThatFired.is_controllable else shipThatFired.name
-                                
-                                self.engine.message_log.add_message(
-                                    f'{ship_name} hit by a {torpedo.name} torpedo from {shipThatFired.name}. '
-                                )
-                                ship.take_damage(
-                                    torpedo.damage, 
-                                    f'Destroyed by a {torpedo.name} torpedo hit from the {shipThatFired_name}', 
-                                    damage_type=DAMAGE_TORPEDO
-                                )
-                            else:
-                                ship_name = "us" if ship.is_controllable else ship.name
-                                
-                                shipThatFired_name = "us" if shipThatFired.is_controllable else shipThatFired.name
-                                
-                                self.engine.message_log.add_message(
-                                    f'A {torpedo.name} torpedo from {shipThatFired_name} missed {ship_name}. '
-                                )
-                                missed_the_target = True
-                                
-                        except KeyError:
-                            pass
+                        continue
+                    crew_readyness = (
+                        shipThatFired.life_support.crew_readyness
+                        if shipThatFired.capabilities & ShipCapability.CREW else 1
+                    )
+                    target_crew_readyness = (
+                        ship.life_support.crew_readyness if ship.capabilities & ShipCapability.CREW else 1
+                    )
+                    
+                    estimated_enemy_impulse = ship.impulse_engine.get_effective_value
+                    
+                    hitSomething = shipThatFired.roll_to_hit(
+                        ship, 
+                        damage_type=DAMAGE_TORPEDO,
+                        estimated_enemy_impulse=estimated_enemy_impulse,
+                        systems_used_for_accuray=(
+                            shipThatFired.sensors.get_effective_value,
+                            shipThatFired.torpedo_launcher.get_effective_value
+                        ),
+                        crew_readyness=crew_readyness,
+                        target_crew_readyness=target_crew_readyness
+                    )                            
+                    if hitSomething:
+                        
+                        ship_name = "We were" if ship.is_controllable else f"{ship.name} was"
+                        
+                        shipThatFired_name = "us" if shipThatFired.is_controllable else shipThatFired.name
+                        
+                        self.engine.message_log.add_message(
+                            f'{ship_name} hit by a {torpedo.name} torpedo from {shipThatFired.name}. '
+                        )
+                        ship.take_damage(
+                            torpedo.damage, 
+                            f'Destroyed by a {torpedo.name} torpedo hit from the {shipThatFired_name}', 
+                            damage_type=DAMAGE_TORPEDO
+                        )
+                    else:
+                        ship_name = "us" if ship.is_controllable else ship.name
+                        
+                        shipThatFired_name = "us" if shipThatFired.is_controllable else shipThatFired.name
+                        
+                        self.engine.message_log.add_message(
+                            f'A {torpedo.name} torpedo from {shipThatFired_name} missed {ship_name}. '
+                        )
+                        missed_the_target = True
+                        
                 if hitSomething:
+                    x, y = co.x, co.y
                     break
                     
             if not hitSomething:
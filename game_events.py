@@ -0,0 +1,115 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, List, Optional, Tuple, Type
+
+from coords import Coords
+
+if TYPE_CHECKING:
+    from data_globals import ShipStatus
+    from space_objects import Planet
+    from starship import Starship
+    from torpedo import Torpedo
+
+@dataclass(frozen=True, eq=False)
+class GameEvent:
+    """The base class of all events that go through an EventBus.
+    
+    Args:
+        sector_coords (Coords): The sub sector that the event happened in. Handlers that were subscribed with these coords as their key will get the event, as well as handlers that were subscribed without a key.
+    """
+    sector_coords:Coords
+
+@dataclass(frozen=True, eq=False)
+class ShipMoved(GameEvent):
+    """A ship has moved from one spot to another inside a sub sector."""
+    ship:Starship
+    old_coords:Coords
+    new_coords:Coords
+
+@dataclass(frozen=True, eq=False)
+class ShipWarped(GameEvent):
+    """A ship has arrived in or left a sub sector. This also happens when the ships are placed at the start of the game."""
+    ship:Starship
+    arrived:bool
+
+@dataclass(frozen=True, eq=False)
+class ShipPassedThrough(GameEvent):
+    """A ship at warp has entered a sub sector on its way to somewhere else. The ship isn't added to the sub sector, but its sector_coords have changed. This is published by WarpTravelOrder on every step of the warp except the last one, where a ShipWarped event is published instead."""
+    ship:Starship
+
+@dataclass(frozen=True, eq=False)
+class ShipDamaged(GameEvent):
+    """A ship has taken damage. This is published by Starship.take_damage after the damage has been applied."""
+    ship:Starship
+    amount:int
+
+@dataclass(frozen=True, eq=False)
+class ShipDestroyed(GameEvent):
+    """A ship has been destroyed."""
+    ship:Starship
+    cause:str
+
+@dataclass(frozen=True, eq=False)
+class ShipStatusChanged(GameEvent):
+    """The ship_status of a ship has changed. This is published by Starship.update_ship_status."""
+    ship:Starship
+    old_status:ShipStatus
+    new_status:ShipStatus
+
+@dataclass(frozen=True, eq=False)
+class ShipChangedNation(GameEvent):
+    """A ship has been captured, or has been handed back to the nation it was built for."""
+    ship:Starship
+
+@dataclass(frozen=True, eq=False)
+class PlanetDispositionChanged(GameEvent):
+    """A planet has been bombed out, or has changed how it feels about one of the sides."""
+    planet:Planet
+
+@dataclass(frozen=True, eq=False)
+class TorpedoFired(GameEvent):
+    """A ship has fired one or more torpedos."""
+    ship:Starship
+    torpedo:Torpedo
+    number:int
+
+class EventBus:
+    """Passes events on to the handlers that have subscribed to them. This lets GameData and the sub sectors keep their indexes and counts up to date as things happen, instead of rebuilding them every turn.
+    
+    Handlers are saved along with the game, so they should be methods and not lambdas.
+    """
+    
+    def __init__(self) -> None:
+    
+        self.handlers:Dict[Tuple[Type[GameEvent], Optional[Hashable]], List[Callable[[GameEvent], None]]] = {}
+    
+    def subscribe(self, event_type:Type[GameEvent], handler:Callable[[GameEvent], None], key:Optional[Hashable]=None):
+        """Has handler called whenever an event of event_type is published.
+        
+        Args:
+            event_type (Type[GameEvent]): The type of event. Events of subclasses of this type are not passed on.
+            handler (Callable[[GameEvent], None]): The function that is called with the event.
+            key (Optional[Hashable], optional): If this is the coords of a sub sector, the handler only gets events that happened there. Defaults to None.
+        """
+        self.handlers.setdefault((event_type, key), []).append(handler)
+    
+    def unsubscribe(self, event_type:Type[GameEvent], handler:Callable[[GameEvent], None], key:Optional[Hashable]=None):
+    
+        try:
+            self.handlers[(event_type, key)].remove(handler)
+        except (KeyError, ValueError):
+            pass
+    
+    def publish(self, event:GameEvent):
+        """Calls the handlers that subscribed to the type of the event with its sector_coords as their key, and then the ones that subscribed without a key, so that a sub sector has always dealt with an event before GameData sees it.
+        
+        Args:
+            event (GameEvent): The event.
+        """
+        event_type = type(event)
+        
+        for key in (event.sector_coords, None):
+        
+            for handler in self.handlers.get((event_type, key), ()):
+            
+                handler(event)
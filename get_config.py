@@ -1,7 +1,7 @@
 
 from functools import lru_cache
 from math import ceil
-from typing import Dict, Final
+from typing import Dict, Final, Optional
 from collections.abc import Mapping
 from datetime import timedelta
 from dataclasses import dataclass
@@ -65,6 +65,10 @@ class ConfigObject:
     max_move_distance:int
     max_distance:int
     
+    journal_file:Optional[str]=None
+    """If this is set, every new game records its orders to this file, see order_journal.OrderJournal.
+    """
+    
     @classmethod
     def create_config(self) -> "ConfigObject":
         
@@ -154,6 +158,12 @@ class ConfigObject:
             error_message="The file 'config.ini' did not contain an entry for 'sector_energy_cost'",
             error_type_to_raise=OSError
         )
+        # this one is optional, and can be commented out with a '#'
+        journal_file_pattern = re.compile(r"^journal_file:([\w.,/\\-]+)\n", re.MULTILINE)
+        
+        journal_file:Optional[str] = get_first_group_in_pattern(
+            text, journal_file_pattern, return_aux_if_no_match=True
+        )
         d:Dict[str,string_or_int] = {}
         
         with open(config_file, "r") as f:
@@ -253,15 +263,26 @@ class ConfigObject:
             graphics=graphics,
             max_warp_distance=max_warp_distance,
             max_move_distance=max_move_distance,
-            max_distance=max_distance
+            max_distance=max_distance,
+            journal_file=journal_file
         )
         
 CONFIG_OBJECT:Final= ConfigObject.create_config()
 
-@lru_cache
-def get_lookup_table(
+def create_ray(
     *, direction_x:float, direction_y:float, normalise_direction:bool=True, no_dups:bool=True
-):    
+):
+    """Creates a tuple of Coords that starts next to the origin and heads out in the direction given, up to CONFIG_OBJECT.max_distance spaces.
+
+    Args:
+        direction_x (float): The x part of the direction.
+        direction_y (float): The y part of the direction.
+        normalise_direction (bool, optional): If this is True, the direction will be normalized first. Defaults to True.
+        no_dups (bool, optional): If this is True, Coords that are the same as the one before them will be left out. Defaults to True.
+
+    Returns:
+        Tuple[Coords]: The Coords along the path, relative to the origin.
+    """
     new_coords_x, new_coords_y = Coords(
         x=direction_x, y=direction_y
     ).normalize() if normalise_direction else (direction_x, direction_y)
@@ -282,3 +303,44 @@ def get_lookup_table(
             old_y += new_coords_y
     
     return tuple(create_tuple())
+
+def create_ray_table():
+    """Precomputes the path to every spot that is within CONFIG_OBJECT.max_distance spaces on the x and y axes.
+
+    Returns:
+        Dict[Tuple[int,int],Tuple[Coords]]: A dictionary where the keys are the x and y distances to the target, and the values are the paths to them.
+    """
+    max_distance = CONFIG_OBJECT.max_distance
+    
+    distance_range = range(-max_distance, max_distance + 1)
+    
+    return {
+        (x, y) : create_ray(direction_x=x, direction_y=y) for x in distance_range for y in distance_range if x or y
+    }
+
+RAY_TABLE:Final = create_ray_table()
+
+@lru_cache(maxsize=256)
+def get_lookup_table(
+    *, direction_x:float, direction_y:float, normalise_direction:bool=True, no_dups:bool=True
+):
+    """Used for paths that are aimed with a heading instead of at a spot. If the path is aimed at a spot, use get_ray_to instead.
+    """
+    return create_ray(
+        direction_x=direction_x, direction_y=direction_y, normalise_direction=normalise_direction, no_dups=no_dups
+    )
+
+def get_ray_to(*, delta_x:int, delta_y:int):
+    """Gets the path from the origin towards a spot that is delta_x and delta_y spaces away. This is the same as calling get_lookup_table with the normalized direction to the spot, but the path is looked up from RAY_TABLE.
+
+    Args:
+        delta_x (int): The distance to the target on the x axis.
+        delta_y (int): The distance to the target on the y axis.
+
+    Returns:
+        Tuple[Coords]: The Coords along the path, relative to the origin.
+    """
+    try:
+        return RAY_TABLE[(delta_x, delta_y)]
+    except KeyError:
+        return create_ray(direction_x=delta_x, direction_y=delta_y)
@@ -281,6 +281,39 @@ def calculate_polarization(damage:float, polarization:int):
     
     return max((damage - polarization) + dp, dp)
 
+def average_polarization(damage_low:float, damage_high:float, polarization:int):
+    """Returns the average result of calculate_polarization if the damage is evenly spread between damage_low and damage_high. This is worked out directly instead of by sampling.
+
+    Args:
+        damage_low (float): The lowest amount of damage.
+        damage_high (float): The highest amount of damage.
+        polarization (int): The amount of hull polarization.
+
+    Returns:
+        float: The average damage after polarization.
+    """
+    if damage_high <= damage_low:
+        return calculate_polarization(damage_low, polarization)
+
+    spread = damage_high - damage_low
+
+    if polarization == 0:
+        # calculate_polarization(damage, 0) is max(damage, 0)
+        low = max(damage_low, 0)
+
+        return ((low + damage_high) * 0.5) * (damage_high - low) / spread if low < damage_high else 0.0
+
+    # calculate_polarization can be rewritten as exp(damage / polarization) + max(damage - polarization, 0)
+    average_exp = polarization * (exp(damage_high / polarization) - exp(damage_low / polarization)) / spread
+
+    low = max(damage_low, polarization)
+
+    average_excess = (
+        ((low - polarization) + (damage_high - polarization)) * 0.5 * (damage_high - low) / spread
+    ) if low < damage_high else 0.0
+
+    return average_exp + average_excess
+
 def ajust_system_integrity(value:float):
     
     return 0.0 if value < 0.15 else min(1.0, value * 1.25)
@@ -0,0 +1,303 @@
+from __future__ import annotations
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Callable, Dict, Final, Optional, Type, TYPE_CHECKING
+
+from ai import AllyAI, BaseAi, EasyEnemy, HardEnemy, MediumEnemy
+from engine import Engine, set_up_game
+from data_globals import STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED
+from order import RepairOrder, WarpOrder
+from order_journal import Replay, set_up_recorded_game
+from scenario import ALL_SCENERIOS
+import exceptions
+
+if TYPE_CHECKING:
+    from order import Order
+
+# the statuses of the ships that the player can target
+FIGHTABLE_SHIP_STATUSES:Final = frozenset({STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED})
+
+DIFFICULTIES:Dict[str,Type[BaseAi]] = {
+    "easy" : EasyEnemy,
+    "medium" : MediumEnemy,
+    "hard" : HardEnemy
+}
+
+class HeadlessResult:
+
+    def __init__(self, engine:Engine, turns:int, seconds:float, game_over:bool) -> None:
+
+        self.engine = engine
+        self.turns = turns
+        self.seconds = seconds
+        self.game_over = game_over
+
+    @property
+    def turns_per_second(self):
+        try:
+            return self.turns / self.seconds
+        except ZeroDivisionError:
+            return 0.0
+
+    def __str__(self) -> str:
+
+        ending = "game over" if self.game_over else "turn limit reached"
+
+        return f"{self.turns} turns in {self.seconds:.3f} seconds ({self.turns_per_second:.2f} turns per second), {ending}"
+
+def ai_player_controller(ai_cls:Type[BaseAi]=AllyAI) -> Callable[[Engine], Optional[Order]]:
+    """Creates a controller that lets an AI class pick the players orders.
+
+    Args:
+        ai_cls (Type[BaseAi], optional): The AI class that will give the orders. Defaults to AllyAI.
+
+    Returns:
+        Callable[[Engine], Optional[Order]]: A function that takes the engine and returns the order the player will carry out.
+    """
+    player_ai:Optional[BaseAi] = None
+
+    def controller(engine:Engine):
+        nonlocal player_ai
+
+        if player_ai is None or player_ai.entity is not engine.player:
+            player_ai = ai_cls(entity=engine.player)
+
+        return player_ai.decide()
+
+    return controller
+
+def warp_to_nearest_enemies(engine:Engine) -> Optional[WarpOrder]:
+    """If there are no enemy ships in the players sub sector, returns an order to warp to the nearest sub sector that has some. The enemy ships must be ones that the player could fight, so cloaked ships and ships at warp are left out.
+
+    Args:
+        engine (Engine): The engine.
+
+    Returns:
+        Optional[WarpOrder]: The order, or None if the player is already fighting, is at warp, can't warp there, or there are no enemy ships left.
+    """
+    player = engine.player
+
+    if player.warp_drive.is_at_warp or not player.warp_drive.is_opperational:
+        return None
+
+    enemy_sector_coords = [
+        ship.sector_coords for ship in engine.game_data.all_enemy_ships
+        if ship.ship_status in FIGHTABLE_SHIP_STATUSES
+    ]
+    if not enemy_sector_coords or player.sector_coords in enemy_sector_coords:
+        return None
+
+    nearest = min(enemy_sector_coords, key=lambda coords: player.sector_coords.distance(coords=coords))
+
+    order = WarpOrder.from_coords(
+        entity=player, x=nearest.x, y=nearest.y, speed=1, 
+        start_x=player.sector_coords.x, start_y=player.sector_coords.y
+    )
+    return order if order.can_be_carried_out() else None
+
+def hunting_player_controller(ai_cls:Type[BaseAi]=AllyAI) -> Callable[[Engine], Optional[Order]]:
+    """Creates a controller that warps the player to the nearest enemy ships with warp_to_nearest_enemies, and lets an AI class pick the players orders once it is there. An AI on its own will often sit in an empty sub sector recharging, so the turns that it plays aren't much of a test.
+
+    Args:
+        ai_cls (Type[BaseAi], optional): The AI class that will give the orders. Defaults to AllyAI.
+
+    Returns:
+        Callable[[Engine], Optional[Order]]: A function that takes the engine and returns the order the player will carry out.
+    """
+    ai_controller = ai_player_controller(ai_cls)
+
+    def controller(engine:Engine):
+
+        warp_order = warp_to_nearest_enemies(engine)
+
+        return warp_order if warp_order is not None else ai_controller(engine)
+
+    return controller
+
+def run_headless(
+    engine:Engine,
+    *,
+    max_turns:int,
+    player_controller:Optional[Callable[[Engine], Optional[Order]]]=None
+):
+    """Advances the game without rendering anything until either the scenario is over or max_turns have passed.
+
+    Args:
+        engine (Engine): The engine, usualy created by set_up_game.
+        max_turns (int): The maximum number of turns to run.
+        player_controller (Optional[Callable[[Engine], Optional[Order]]], optional): A function that takes the engine and either returns an order for the player to carry out, or carries out the order itself and returns None. If this is None, then the player will be controlled by hunting_player_controller. Defaults to None.
+
+    Returns:
+        HeadlessResult: The number of turns, the time it took and whether the game ended.
+    """
+    if player_controller is None:
+        player_controller = hunting_player_controller()
+
+    game_data = engine.game_data
+
+    engine.message_log.print_messages = False
+
+    is_game_over = game_data.scenerio.scenario_type.is_game_over
+
+    turns = 0
+    game_over = is_game_over(game_data)
+
+    start_time = perf_counter()
+
+    while turns < max_turns and not game_over:
+        try:
+            order = player_controller(engine)
+
+            if order is not None:
+                engine.perform_order(order)
+        except exceptions.Impossible:
+            # just like with the player, an impossible order means the ship does nothing for this turn
+            engine.perform_order(RepairOrder(engine.player, 1))
+
+        engine.advance_turn()
+        turns += 1
+        game_over = is_game_over(game_data)
+
+    seconds = perf_counter() - start_time
+
+    return HeadlessResult(engine, turns, seconds, game_over)
+
+def check_fleet_state(engine:Engine):
+    """Runs FleetState.compare_upkeep on every ship that hasn't been destroyed, and prints the ones where the upkeep of the fleet state doesn't match Starship.handle_repair_and_energy_consumption.
+
+    Args:
+        engine (Engine): The engine. The game must have been set up with use_fleet_state.
+
+    Returns:
+        int: The number of ships that didn't match.
+    """
+    fleet_state = engine.game_data.fleet_state
+
+    mismatches = 0
+
+    for ship in engine.game_data.total_starships:
+
+        if ship.ship_status.is_destroyed:
+            continue
+
+        differences = fleet_state.compare_upkeep(ship)
+
+        if differences:
+            mismatches += 1
+
+            print(f"{ship.name}: " + ", ".join(
+                f"{name} {from_ship} != {from_fleet}" for name, (from_ship, from_fleet) in differences.items()
+            ))
+    return mismatches
+
+def main():
+
+    parser = ArgumentParser(description="Runs games of Super DS9 without any graphics.")
+
+    parser.add_argument("--scenario", default="DOM_STRIKE", choices=tuple(ALL_SCENERIOS.keys()))
+    parser.add_argument("--difficulty", default="medium", choices=tuple(DIFFICULTIES.keys()))
+    parser.add_argument("--turns", type=int, default=1000, help="The maximum number of turns per game")
+    parser.add_argument("--games", type=int, default=1, help="The number of games to run")
+    parser.add_argument(
+        "--fleet-state", action="store_true", 
+        help="Keep the ships in a FleetState, so that their upkeep is done for all of them at once"
+    )
+    parser.add_argument(
+        "--check-fleet-state", action="store_true", 
+        help="With --fleet-state, check at the end of each game that the fleet state does the same upkeep as the ships do"
+    )
+    parser.add_argument(
+        "--dormancy", action="store_true", 
+        help="Let ships that are far from the player and from any hostile ships skip most of their turns"
+    )
+    parser.add_argument(
+        "--aggregate-combat", action="store_true", 
+        help="Resolve fights between AI ships that the player can't see all at once, instead of shot by shot"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, 
+        help="The seed for the random number generators of the ships. Each game after the first adds one to it"
+    )
+    parser.add_argument(
+        "--journal", default=None, 
+        help="Record the orders of each game to this file. If there is more then one game, the number of the game is added to the end"
+    )
+    parser.add_argument(
+        "--replay", default=None, 
+        help="Play back a journal that was recorded with --journal instead of running new games"
+    )
+    parser.add_argument(
+        "--seek", type=int, default=None, 
+        help="With --replay, stop at the start of this turn. Snapshots that were saved next to the journal by earlier replays are used to skip ahead"
+    )
+
+    args = parser.parse_args()
+
+    if args.replay:
+
+        start_time = perf_counter()
+
+        replay = Replay(args.replay)
+
+        if args.seek is None:
+            replay.run()
+        else:
+            replay.seek(args.seek)
+
+        seconds = perf_counter() - start_time
+
+        print(f"Replayed {replay.turn_number} of {replay.last_turn} turns in {seconds:.3f} seconds")
+        return
+
+    scenario = ALL_SCENERIOS[args.scenario]
+
+    total_turns = 0
+    total_seconds = 0.0
+
+    for game in range(args.games):
+
+        settings = dict(
+            easy_aim=False,
+            easy_move=False,
+            easy_warp=False,
+            torpedo_warning=False,
+            crash_warning=False,
+            three_d_movment=False,
+            ship_name=scenario.default_ship_name,
+            captain_name=scenario.default_captain_name,
+            scenario=scenario,
+            difficulty=DIFFICULTIES[args.difficulty],
+            allied_ai=AllyAI,
+            use_fleet_state=args.fleet_state,
+            use_dormancy=args.dormancy,
+            use_aggregate_combat=args.aggregate_combat,
+            seed=None if args.seed is None else args.seed + game
+        )
+        if args.journal:
+            engine = set_up_recorded_game(
+                args.journal if args.games == 1 else f"{args.journal}.{game + 1}", **settings
+            )
+        else:
+            engine = set_up_game(**settings)
+
+        result = run_headless(engine, max_turns=args.turns)
+
+        total_turns += result.turns
+        total_seconds += result.seconds
+
+        print(f"Game {game + 1}: {result}")
+
+        if args.check_fleet_state and engine.game_data.fleet_state:
+
+            mismatches = check_fleet_state(engine)
+
+            print(f"Fleet state upkeep: {mismatches} of {len(engine.game_data.total_starships)} ships didn't match")
+
+    if args.games > 1:
+        try:
+            print(f"Total: {total_turns} turns in {total_seconds:.3f} seconds ({total_turns / total_seconds:.2f} turns per second)")
+        except ZeroDivisionError:
+            pass
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ from __future__ import annotations
 from random import choice
 from textwrap import wrap
 from coords import Coords
-from data_globals import STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED, STATUS_DERLICT, STATUS_HULK, STATUS_OBLITERATED, WARP_FACTOR, CloakStatus
+from data_globals import DAMAGE_BEAM, DAMAGE_CANNON, DAMAGE_TORPEDO, STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED, STATUS_DERLICT, STATUS_HULK, STATUS_OBLITERATED, WARP_FACTOR, CloakStatus, DamageType
 from engine import CONFIG_OBJECT
 from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Tuple, Union
 from order import CloakOrder, SelfDestructOrder, TransportOrder, WarpTravelOrder, BLOCKS_ACTION, \
@@ -80,38 +80,13 @@ class EventHandler(BaseEventHandler):
         if action is None:
             return False
         try:
-            action.perform()
-            
+            self.engine.perform_order(action)
+        
         except exceptions.Impossible as exc:
             self.engine.message_log.add_message(exc.args[0], colors.impossible)
             return False  # Skip enemy turn on exceptions.
         
-        self.engine.player.handle_repair_and_energy_consumption()
-
-        game_data = self.engine.game_data
-        game_data.ships_in_same_sub_sector_as_player = game_data.grab_ships_in_same_sub_sector(
-            game_data.player, accptable_ship_statuses={
-                STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED, STATUS_DERLICT, STATUS_HULK
-            }
-        )
-        game_data.date_time = game_data.date_time + CONFIG_OBJECT.time_per_turn
-        game_data.stardate = stardate(game_data.date_time)
-
-        self.engine.handle_enemy_turns()
-        try:
-            game_data.player.cloak.handle_cooldown_and_status_recovery()
-        except AttributeError:
-            pass
-        try:
-            game_data.player.sensors.detect_all_enemy_cloaked_ships_in_system()
-        except AttributeError:
-            pass
-        try:
-            game_data.player.life_support.on_turn()
-        except AttributeError:
-            pass
-        game_data.run_update_for_ship(game_data.player)
-        game_data.info_description = game_data.describe_info()
+        self.engine.advance_turn()
         return True
 
     def handle_events(self, event: tcod.event.Event) -> BaseEventHandler:
@@ -120,7 +95,9 @@ class EventHandler(BaseEventHandler):
         if isinstance(action_or_state, BaseEventHandler):
             return action_or_state
         if self.handle_action(action_or_state):
-            if self.engine.game_data.scenerio.scenario_type.is_game_over(self.engine.game_data):
+            game_data = self.engine.game_data
+            # game_over is set by GameData when the player or one of the target ships changes status
+            if game_data.game_over or game_data.is_time_up:
                 # The player was killed sometime during or after the action.
                 return GameOverEventHandler(self.engine)
         if not self.engine.player.ship_status.is_active:
@@ -240,6 +217,22 @@ def auto_target_button():
             bg=colors.black
         )
 
+def hit_chance_title(engine:Engine, title:str, damage_type:DamageType):
+    """Adds the chance of hitting the selected ship to the title.
+    """
+    target = engine.game_data.selected_ship_planet_or_star
+
+    if not isinstance(target, Starship) or target is engine.player or not target.ship_status.is_active:
+        return title
+    try:
+        chance = engine.player.hit_probability(
+            target, damage_type, precision=engine.player.sensors.determin_precision
+        )
+    except AttributeError:
+        return title
+
+    return f"{title} ({chance:.0%} to hit)"
+
 class CancelConfirmHandler(MainGameEventHandler):
     
     def __init__(self, engine: Engine, can_render_confirm_button:bool=True) -> None:
@@ -2004,7 +1997,7 @@ class BeamArrayHandler(MinMaxInitator):
         render_command_box(
             console=console,
             gameData=self.engine.game_data,
-            title="Input energy to use:"
+            title=hit_chance_title(self.engine, "Input energy to use:", DAMAGE_BEAM)
         )
         super().on_render(console)
         
@@ -2193,7 +2186,7 @@ class CannonHandler(MinMaxInitator):
         render_command_box(
             console=console,
             gameData=self.engine.game_data,
-            title="Input energy to use:"
+            title=hit_chance_title(self.engine, "Input energy to use:", DAMAGE_CANNON)
         )
         super().on_render(console)
         
@@ -2348,7 +2341,7 @@ class TorpedoHandler(HeadingBasedHandler):
         render_command_box(
             console=console,
             gameData=self.engine.game_data,
-            title="Input torpedo heading"
+            title=hit_chance_title(self.engine, "Input torpedo heading", DAMAGE_TORPEDO)
         )
         super().on_render(console)
         
@@ -2502,7 +2495,7 @@ class TorpedoHandlerEasy(CoordBasedHandler):
         render_command_box(
             console=console,
             gameData=self.engine.game_data,
-            title="Input torpedo coordants"
+            title=hit_chance_title(self.engine, "Input torpedo coordants", DAMAGE_TORPEDO)
         )
         super().on_render(console)
         
@@ -3472,31 +3465,29 @@ f"The selected ship spawn spot {l_x}, {l_y} in sector {s_x}, {s_y} is blocked by
                 
                 if ship_is_mission_critical:
                     
-                    game_data.target_allied_ships.append(new_ship)
+                    game_data.add_target_ship(new_ship)
             else:
                 game_data.all_enemy_ships.append(new_ship)
+                game_data.enemy_ships_by_status.add(new_ship)
                 
                 if ship_is_mission_critical:
                     
-                    game_data.target_enemy_ships.append(new_ship)
+                    game_data.add_target_ship(new_ship)
                     
             game_data.all_other_ships.append(new_ship)
             game_data.total_starships.append(new_ship)
+            game_data.add_ship_to_score(new_ship)
+            new_ship.ship_id = len(game_data.total_starships)
+            game_data.seed_ship_rngs(new_ship)
+            if game_data.fleet_state:
+                game_data.fleet_state.add_ship(new_ship)
+            sub_sector.add_ship_to_sec(new_ship)
+            sub_sector.place_ship(new_ship)
             
             game_data.run_update_for_ship(game_data.player)
             
             #game_data.update_mega_sector_display()
             
-            if s_x == game_data.player.sector_coords.x and s_y == game_data.player.sector_coords.y:
-                
-                game_data.ships_in_same_sub_sector_as_player = game_data.grab_ships_in_same_sub_sector(
-                    game_data.player, accptable_ship_statuses={
-                        STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED, STATUS_DERLICT, STATUS_HULK
-                    }
-                )
-                game_data.visible_ships_in_same_sub_sector_as_player = [
-                    ship for ship in game_data.ships_in_same_sub_sector_as_player if ship.ship_status.is_visible
-                ]
             self.engine.message_log.add_message(
                 f"The new ship {name} has been created in system {s_x}, {s_y}, at position {l_x}, {l_y}.", colors.green
             )
@@ -3788,6 +3779,8 @@ class ShipEditing(MainGameEventHandler):
             self.ship.cloak.cloak_cooldown = self.cloak_cooldown.add_up()
         except AttributeError:
             pass
+        self.ship.clear_scan_cache()
+        
         if self.ship is self.engine.player:
             
             self.engine.game_data.player_scan = self.ship.scan_for_print(1)
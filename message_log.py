@@ -1,8 +1,11 @@
-from typing import Iterable, List, Reversible, Tuple
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable, List, Reversible, Tuple
 import textwrap
-import tcod
 import colors
 
+if TYPE_CHECKING:
+    import tcod
+
 class Message:
     def __init__(self, text: str, fg: Tuple[int, int, int]):
         self.plain_text = text
@@ -5,12 +5,14 @@ from math import atan2, ceil, floor
 from random import choice
 
 from frozendict import frozendict
+import numpy as np
 
-from get_config import CONFIG_OBJECT, get_lookup_table
+from get_config import CONFIG_OBJECT, get_lookup_table, get_ray_to
 from coords import Coords, IntOrFloat
 from global_functions import TO_RADIANS, heading_to_coords, heading_to_direction
 from data_globals import DAMAGE_BEAM, DAMAGE_CANNON, DAMAGE_RAMMING, PLANET_BARREN, PLANET_BOMBED_OUT, PLANET_HOSTILE, PLANET_PREWARP, STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED, STATUS_DERLICT, STATUS_HULK, WARP_FACTOR, CloakStatus
-from space_objects import Planet, SubSector
+from game_events import ShipPassedThrough
+from space_objects import OCCUPANCY_EMPTY, OCCUPANCY_PLANET, OCCUPANCY_STAR, Planet, SubSector
 import colors
 from torpedo import Torpedo
 
@@ -183,8 +185,8 @@ class WarpOrder(Order):
         x_aim = self.x - self.start_x
         y_aim = self.y - self.start_y
         co_tuple = tuple(
-            Coords(x=self.start_x+co.x, y=self.start_y+co.y) for co in get_lookup_table(
-                direction_x=x_aim, direction_y=y_aim, normalise_direction=True
+            Coords(x=self.start_x+co.x, y=self.start_y+co.y) for co in get_ray_to(
+                delta_x=x_aim, delta_y=y_aim
             )
         )
         end = Coords(x=self.x, y=self.y)
@@ -251,6 +253,8 @@ class WarpTravelOrder(Order):
         self.entity.sector_coords.y = co.y
         
         if co != self.entity.warp_drive.warp_destinations[-1]:
+        
+            self.game_data.event_bus.publish(ShipPassedThrough(co, self.entity))
             return
         
         self.entity.warp_drive.current_warp_factor = 0
@@ -260,24 +264,11 @@ class WarpTravelOrder(Order):
         subsector = self.entity.get_sub_sector
         
         subsector.add_ship_to_sec(self.entity)
-
-        safe_spots = subsector.safe_spots.copy()
-
-        ships = self.entity.game_data.grab_ships_in_same_sub_sector(
-            self.entity, accptable_ship_statuses={
-                STATUS_ACTIVE, STATUS_DERLICT, STATUS_HULK, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED,
-            }
-        )
-        for ship in ships:
-            try:
-                safe_spots.remove(ship.local_coords.create_coords())
-            except ValueError:
-                pass
-
-        spot = choice(safe_spots)
         
-        self.entity.local_coords.x = spot.x
-        self.entity.local_coords.y = spot.y
+        # safe_spots doesn't include the spots that other ships are in
+        spot = subsector.find_random_safe_spot()
+        
+        subsector.move_ship(self.entity, spot.x, spot.y)
         
         player_sector_coords = self.game_data.player.sector_coords
         
@@ -307,20 +298,23 @@ class MoveOrder(Order):
         self.x, self.y = x,y
         self.x_aim, self.y_aim = x_aim, y_aim
         
+        delta_x, delta_y = x - self.entity.local_coords.x, y - self.entity.local_coords.y
+        
+        # if the ship is aiming at the spot it is moving to, then the path can be looked up from the ray table
+        path = get_ray_to(
+            delta_x=delta_x, delta_y=delta_y
+        ) if Coords.normalize_other(x=delta_x, y=delta_y) == (x_aim, y_aim) else get_lookup_table(
+            direction_x=x_aim, direction_y=y_aim, normalise_direction=False
+        )
         self.coord_list = tuple(
             Coords(
                 co.x + self.entity.local_coords.x, co.y + self.entity.local_coords.y
-            ) for co in get_lookup_table(
-                direction_x=x_aim, direction_y=y_aim, normalise_direction=False
-            )
+            ) for co in path
         )[:ceil(distance)]
 
-        self.ships = {
-            ship.local_coords.create_coords() : ship for ship in 
-            self.entity.game_data.grab_ships_in_same_sub_sector(
-                self.entity, accptable_ship_statuses={STATUS_ACTIVE, STATUS_DERLICT, STATUS_HULK}
-            ) if ship.local_coords in self.coord_list
-        }
+        self.ships = self.entity.get_sub_sector.grab_ships_on_path(
+            self.coord_list, accptable_ship_statuses={STATUS_ACTIVE, STATUS_DERLICT, STATUS_HULK}
+        )
     
     def __hash__(self):
         return hash((self.entity, self.heading, self.distance, self.cost, self.x, self.y, self.x_aim, self.y_aim))
@@ -403,42 +397,38 @@ class MoveOrder(Order):
                     except KeyError:
                         pass
         else:
-            for co in self.coord_list:
-                try:
-                    planet = sub_sector.planets_dict[co]
+            ray, occupancy = sub_sector.get_ray_occupancy(self.coord_list)
+            
+            for i in np.flatnonzero(occupancy):
+                
+                if occupancy[i] < OCCUPANCY_EMPTY:
+                    # a star or a planet is in the way
                     break
+                try:
+                    ship = self.ships[Coords(x=int(ray[i, 0]), y=int(ray[i, 1]))]
                 except KeyError:
-                    try:
-                        star = sub_sector.stars_dict[co]
-                        break
-                    except KeyError:
-                        try:
-                            ship = self.ships[co]
-                            try:
-                                crew_readyness = self.entity.life_support.crew_readyness
-                            except AttributeError:
-                                crew_readyness = 1
-                            try:
-                                target_crew_readyness = ship.life_support.crew_readyness
-                            except AttributeError:
-                                target_crew_readyness = 1
-                            hit = self.entity.roll_to_hit(
-                                ship, 
-                                systems_used_for_accuray=(
-                                    self.entity.impulse_engine.get_effective_value,
-                                    self.entity.sensors.get_effective_value
-                                ),
-                                damage_type=DAMAGE_RAMMING,
-                                crew_readyness=crew_readyness,
-                                target_crew_readyness=target_crew_readyness
-                            )
-                            self.entity.ram(ship, True)
-
-                        except KeyError:
-                            pass
+                    continue
+                try:
+                    crew_readyness = self.entity.life_support.crew_readyness
+                except AttributeError:
+                    crew_readyness = 1
+                try:
+                    target_crew_readyness = ship.life_support.crew_readyness
+                except AttributeError:
+                    target_crew_readyness = 1
+                hit = self.entity.roll_to_hit(
+                    ship, 
+                    systems_used_for_accuray=(
+                        self.entity.impulse_engine.get_effective_value,
+                        self.entity.sensors.get_effective_value
+                    ),
+                    damage_type=DAMAGE_RAMMING,
+                    crew_readyness=crew_readyness,
+                    target_crew_readyness=target_crew_readyness
+                )
+                self.entity.ram(ship, True)
                     
-        self.entity.local_coords.x = self.x
-        self.entity.local_coords.y = self.y
+        sub_sector.move_ship(self.entity, self.x, self.y)
         
         self.entity.turn_repairing = 0
 
@@ -952,7 +942,14 @@ class TorpedoOrder(Order):
         self.torpedo = torpedo
         self.cost = cost
         
-        torp_coords = get_lookup_table(
+        delta_x, delta_y = x - entity.local_coords.x, y - entity.local_coords.y
+        
+        aimed_at_spot = Coords.normalize_other(x=delta_x, y=delta_y) == (x_aim, y_aim)
+        
+        # if the torpedo is aimed at a spot, then the path can be looked up from the ray table
+        torp_coords = get_ray_to(
+            delta_x=delta_x, delta_y=delta_y
+        ) if aimed_at_spot else get_lookup_table(
             direction_x=x_aim, direction_y=y_aim, normalise_direction=False
         )
         self.coord_list = tuple(
@@ -962,11 +959,16 @@ class TorpedoOrder(Order):
             co.x+entity.local_coords.x < CONFIG_OBJECT.subsector_width and 
             co.y+entity.local_coords.y < CONFIG_OBJECT.subsector_height
         )
-        self.ships = {
-            ship.local_coords.create_coords() : ship for ship in self.entity.game_data.grab_ships_in_same_sub_sector(
-                self.entity, accptable_ship_statuses={STATUS_ACTIVE, STATUS_DERLICT, STATUS_HULK}
-            ) if ship.local_coords in self.coord_list and ship.ship_status.is_active
-        }
+        sub_sector = self.entity.get_sub_sector
+        
+        # if the torpedo is aimed at a ship, then the path was already worked out by the sub sector's line of fire
+        self.ray, self.occupancy = sub_sector.get_line_of_fire().get_path(
+            entity, x, y
+        ) if aimed_at_spot else sub_sector.get_ray_occupancy(self.coord_list)
+        
+        self.ships = sub_sector.grab_ships_on_ray(
+            self.ray, self.occupancy, accptable_ship_statuses={STATUS_ACTIVE}
+        )
     
     def __hash__(self):
         return hash((self.entity, self.heading, self.amount, self.x, self.y, self.x_aim, self.y_aim, self.coord_list, self.cost))
@@ -1033,7 +1035,6 @@ class TorpedoOrder(Order):
         self.entity.turn_repairing = 0
         
         if self.entity.is_controllable:
-            self.game_data.player_record["torpedos_fired"] += self.amount
             self.game_data.player_record["energy_used"] += self.cost
 
     def raise_warning(self):
@@ -1047,14 +1048,14 @@ class TorpedoOrder(Order):
         if self.cost > self.entity.power_generator.energy:
             return OrderWarning.NOT_ENOUGHT_ENERGY
 
-        sub_sector:SubSector = self.game_data.grid[self.entity.sector_coords.y][self.entity.sector_coords.x]
-
         hit_enemy_ship = False
         hit_friendly_ship = False
+        
+        ray, occupancy = self.ray, self.occupancy
                 
-        for co in self.coord_list:
-            try:
-                planet = sub_sector.planets_dict[co]
+        for i in np.flatnonzero(occupancy):
+            
+            if occupancy[i] == OCCUPANCY_PLANET:
                 if not hit_enemy_ship:
                     return (
                         OrderWarning.TORPEDO_WILL_HIT_PLANET_OR_FRIENDLY_SHIP 
@@ -1065,29 +1066,23 @@ class TorpedoOrder(Order):
                         OrderWarning.TORPEDO_COULD_HIT_PLANET if hit_friendly_ship else 
                         OrderWarning.TORPEDO_COULD_HIT_PLANET_OR_FRIENDLY_SHIP
                     )
-            except KeyError:
-                try:
-                    star = sub_sector.stars_dict[co]
+            if occupancy[i] == OCCUPANCY_STAR:
                     
-                    return OrderWarning.SAFE if hit_enemy_ship else OrderWarning.TORPEDO_WILL_MISS
-
-                except KeyError:
-                    try:
-                        ship = self.ships[co]
-                        if ship:
-                                
-                            ship_side = (
-                                self.game_data.scenerio.get_set_of_enemy_nations 
-                                if ship.is_enemy else 
-                                self.game_data.scenerio.get_set_of_allied_nations
-                            )
-                            if ship.ship_class.nation in ship_side:
-                                
-                                hit_friendly_ship = True
-                            else:
-                                hit_enemy_ship = True
-                    except KeyError:
-                        pass
+                return OrderWarning.SAFE if hit_enemy_ship else OrderWarning.TORPEDO_WILL_MISS
+            try:
+                ship = self.ships[Coords(x=int(ray[i, 0]), y=int(ray[i, 1]))]
+            except KeyError:
+                continue
+            ship_side = (
+                self.game_data.scenerio.get_set_of_enemy_nations 
+                if ship.is_enemy else 
+                self.game_data.scenerio.get_set_of_allied_nations
+            )
+            if ship.ship_class.nation in ship_side:
+                
+                hit_friendly_ship = True
+            else:
+                hit_enemy_ship = True
         return (
             OrderWarning.TORPEDO_COULD_FRIENDLY_SHIP if hit_friendly_ship else OrderWarning.SAFE
         ) if hit_enemy_ship else (
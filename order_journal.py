@@ -0,0 +1,353 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import hashlib, io, lzma, os, pickle
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Tuple
+
+from coords import Coords
+from engine import Engine, set_up_game
+from scenario import ALL_SCENERIOS
+from space_objects import Planet, Star
+from starship import Starship
+
+if TYPE_CHECKING:
+    from game_data import GameData
+    from order import Order
+
+@dataclass(frozen=True)
+class JournalHeader:
+    """The first thing in a journal. It holds everything that set_up_game needs to create the same game again.
+    
+    Args:
+        seed (int): The seed of the game.
+        scenario (str): The key of the scenario in ALL_SCENERIOS.
+        settings (Mapping[str, Any]): The rest of the arguments that were passed to set_up_game.
+    """
+    seed:int
+    scenario:str
+    settings:Mapping[str, Any]
+
+class OrderPickler(pickle.Pickler):
+    """Pickles an order with the ships, planets and stars that it refers to replaced by their ship_id or their coords, so that only the order itself is saved. OrderUnpickler turns them back into the matching objects of the game that is being replayed.
+    """
+    
+    def persistent_id(self, obj):
+    
+        if isinstance(obj, Starship):
+            return ("ship", obj.ship_id)
+        
+        if isinstance(obj, (Planet, Star)):
+            return (
+                "planet" if isinstance(obj, Planet) else "star",
+                obj.sector_coords.x, obj.sector_coords.y, obj.local_coords.x, obj.local_coords.y
+            )
+        return None
+
+class OrderUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, game_data:GameData) -> None:
+        super().__init__(file)
+        self.game_data = game_data
+    
+    def persistent_load(self, pid):
+    
+        kind = pid[0]
+        
+        if kind == "ship":
+            # ship_ids are given out in the order that the ships were added to total_starships, starting at 1
+            return self.game_data.total_starships[pid[1] - 1]
+        
+        sector_x, sector_y, x, y = pid[1:]
+        
+        sub_sector = self.game_data.grid[sector_y][sector_x]
+        
+        return (
+            sub_sector.planets_dict if kind == "planet" else sub_sector.stars_dict
+        )[Coords(x=x, y=y)]
+
+def dump_order(order:Order):
+
+    f = io.BytesIO()
+    OrderPickler(f, pickle.HIGHEST_PROTOCOL).dump(order)
+    return f.getvalue()
+
+def load_order(data:bytes, game_data:GameData) -> Order:
+
+    return OrderUnpickler(io.BytesIO(data), game_data).load()
+
+class OrderJournal:
+    """An append only record of every order that was carried out in a game. The file starts with a JournalHeader, followed by one (turn_number, ship_id, order) entry for each order, where the order was pickled with dump_order.
+    
+    Entries are kept in memory until flush is called, which Engine.advance_turn does at the end of every turn.
+    
+    Args:
+        filename (str): The file that the journal is written to. If it already exists, it is replaced.
+        header (JournalHeader): The header.
+    """
+    
+    def __init__(self, filename:str, header:JournalHeader) -> None:
+    
+        self.filename = filename
+        self.pending:List[Tuple[int, int, bytes]] = []
+        
+        with open(filename, "wb") as f:
+            pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+    
+    def record(self, turn_number:int, order:Order):
+    
+        self.pending.append((turn_number, order.entity.ship_id, dump_order(order)))
+    
+    def flush(self):
+    
+        if not self.pending:
+            return
+        
+        with open(self.filename, "ab") as f:
+        
+            for entry in self.pending:
+            
+                pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+        
+        self.pending.clear()
+
+def read_journal(filename:str):
+    """Reads a journal that was written by OrderJournal.
+    
+    Args:
+        filename (str): The file.
+    
+    Returns:
+        Tuple[JournalHeader, List[Tuple[int, int, bytes]]]: The header, and the entries in the order that they were recorded.
+    """
+    entries:List[Tuple[int, int, bytes]] = []
+    
+    with open(filename, "rb") as f:
+    
+        header = pickle.load(f)
+        
+        assert isinstance(header, JournalHeader)
+        
+        while True:
+            try:
+                entries.append(pickle.load(f))
+            except EOFError:
+                break
+    
+    return header, entries
+
+def get_turn_digests(header:JournalHeader, entries:List[Tuple[int, int, bytes]]):
+    """Works out a digest of the header and of the orders from before the start of each turn. Since everything else comes from the seed, the game at the start of a turn only depends on these, so a saved snapshot can be checked against them before it is used.
+    
+    Args:
+        header (JournalHeader): The header of the journal.
+        entries (List[Tuple[int, int, bytes]]): The entries, in the order that they were recorded.
+    
+    Returns:
+        Dict[int, str]: The digest for each turn, from turn 0 to one turn after the last entry.
+    """
+    digest = hashlib.sha1(pickle.dumps(header, pickle.HIGHEST_PROTOCOL))
+    
+    digests:Dict[int, str] = {}
+    
+    turn = 0
+    
+    for turn_number, ship_id, data in entries:
+    
+        # the entries are recorded in turn order, so this is the first entry of turn_number
+        while turn <= turn_number:
+            digests[turn] = digest.hexdigest()
+            turn += 1
+        
+        digest.update(f"{turn_number}:{ship_id}:".encode())
+        digest.update(data)
+    
+    digests[turn] = digest.hexdigest()
+    
+    return digests
+
+def set_up_recorded_game(filename:str, **kwargs):
+    """Calls set_up_game with kwargs, and records the game to a journal.
+    
+    Args:
+        filename (str): The file that the journal is written to.
+    
+    Returns:
+        Engine: The engine.
+    """
+    engine = set_up_game(**kwargs)
+    
+    settings = {k:v for k,v in kwargs.items() if k not in {"scenario", "seed"}}
+    
+    scenario = kwargs["scenario"]
+    
+    # the scenario is saved by its key, so that the replay uses the same nations and ship classes as everything else
+    scenario_key = next(k for k,v in ALL_SCENERIOS.items() if v is scenario)
+    
+    engine.journal = OrderJournal(
+        filename, JournalHeader(seed=engine.game_data.seed, scenario=scenario_key, settings=settings)
+    )
+    return engine
+
+class Replay:
+    """Plays a game back from its journal, without rendering anything. The game is set up again from the scenario and seed in the header, and then the recorded orders are carried out instead of asking the player or the AI. Since all of the randomness comes from the seed, and the AI's own rolls come from decision_rng, the game plays out the same way it did the first time.
+    
+    A snapshot of the game is taken every snapshot_interval turns, so that seek can start from the closest one instead of from the start of the game. The snapshots are saved next to the journal, in filename + ".snapshots", so a later replay of the same journal can use them too. Each one is saved with the digest of the orders that came before it (see get_turn_digests), and if the journal has been recorded again since then, it is thrown away.
+    
+    Args:
+        filename (str): The journal.
+        snapshot_interval (int, optional): How many turns there are between snapshots. Defaults to 50.
+        save_snapshots (bool, optional): If False, the snapshots are only kept in memory. Defaults to True.
+    """
+    
+    def __init__(self, filename:str, *, snapshot_interval:int=50, save_snapshots:bool=True) -> None:
+    
+        self.header, entries = read_journal(filename)
+        
+        self.orders:Dict[Tuple[int, int], bytes] = {
+            (turn_number, ship_id) : data for turn_number, ship_id, data in entries
+        }
+        """The order that each ship carried out on each turn, keyed by the turn number and the ship_id.
+        """
+        self.last_turn = max((turn_number for turn_number, ship_id, data in entries), default=0)
+        
+        self.snapshot_interval = max(snapshot_interval, 1)
+        self.snapshots:Dict[int, bytes] = {}
+        
+        self.digests = get_turn_digests(self.header, entries)
+        
+        self.snapshot_file = f"{filename}.snapshots" if save_snapshots else None
+        
+        if self.snapshot_file:
+            self.load_snapshots()
+        
+        engine = set_up_game(
+            scenario=ALL_SCENERIOS[self.header.scenario], seed=self.header.seed, **self.header.settings
+        )
+        self.attach(engine)
+        
+        if 0 not in self.snapshots:
+            self.take_snapshot()
+    
+    @property
+    def turn_number(self):
+        return self.engine.game_data.turn_number
+    
+    def attach(self, engine:Engine):
+    
+        engine.message_log.print_messages = False
+        engine.order_source = self.next_order
+        
+        self.engine = engine
+    
+    def take_snapshot(self):
+    
+        turn_number = self.turn_number
+        
+        snapshot = lzma.compress(pickle.dumps(self.engine))
+        
+        self.snapshots[turn_number] = snapshot
+        
+        if self.snapshot_file:
+        
+            with open(self.snapshot_file, "ab") as f:
+            
+                pickle.dump((turn_number, self.digests[turn_number], snapshot), f, pickle.HIGHEST_PROTOCOL)
+    
+    def load_snapshots(self):
+        """Loads the snapshots that were saved by an earlier replay of this journal. Snapshots that don't match the journal any more are left out, and the file is written again without them.
+        """
+        try:
+            f = open(self.snapshot_file, "rb")
+        except FileNotFoundError:
+            return
+        
+        saved:List[Tuple[int, str, bytes]] = []
+        
+        with f:
+            while True:
+                try:
+                    saved.append(pickle.load(f))
+                except EOFError:
+                    break
+        
+        for turn_number, digest, snapshot in saved:
+        
+            if self.digests.get(turn_number) == digest:
+                self.snapshots[turn_number] = snapshot
+        
+        if len(self.snapshots) == len(saved):
+            return
+        
+        if not self.snapshots:
+            os.remove(self.snapshot_file)
+            return
+        
+        with open(self.snapshot_file, "wb") as f:
+        
+            for turn_number, snapshot in self.snapshots.items():
+            
+                pickle.dump((turn_number, self.digests[turn_number], snapshot), f, pickle.HIGHEST_PROTOCOL)
+    
+    def next_order(self, entity:Starship) -> Optional[Order]:
+        """Gets the order that the ship carried out on the current turn.
+        
+        Args:
+            entity (Starship): The ship.
+        
+        Returns:
+            Optional[Order]: The order, or None if the ship didn't carry one out.
+        """
+        try:
+            data = self.orders[(self.turn_number, entity.ship_id)]
+        except KeyError:
+            return None
+        
+        return load_order(data, self.engine.game_data)
+    
+    def step(self):
+        """Plays one turn: the players order, and then everything that Engine.advance_turn does.
+        """
+        engine = self.engine
+        
+        order = self.next_order(engine.player)
+        
+        if order is not None:
+            order.perform()
+        
+        engine.advance_turn()
+        
+        if self.turn_number % self.snapshot_interval == 0 and self.turn_number not in self.snapshots:
+            self.take_snapshot()
+    
+    def run(self, max_turn:Optional[int]=None):
+        """Plays turns until max_turn has been reached, the journal runs out, or the game is over.
+        
+        Args:
+            max_turn (Optional[int], optional): The turn to stop at. If this is None, the whole journal is played. Defaults to None.
+        """
+        max_turn = self.last_turn if max_turn is None else min(max_turn, self.last_turn)
+        
+        game_data = self.engine.game_data
+        
+        while self.turn_number < max_turn and not (game_data.game_over or game_data.is_time_up):
+        
+            self.step()
+            
+            game_data = self.engine.game_data
+    
+    def seek(self, turn_number:int):
+        """Moves the game to the start of turn_number. If the game is already between the closest snapshot that is not after that turn and turn_number, it is played forward from where it is. Otherwise that snapshot is loaded, and the game is played forward from there.
+        
+        Args:
+            turn_number (int): The turn.
+        """
+        snapshot_turn = max(turn for turn in self.snapshots if turn <= turn_number)
+        
+        if not (snapshot_turn <= self.turn_number <= turn_number):
+        
+            engine = pickle.loads(lzma.decompress(self.snapshots[snapshot_turn]))
+            
+            assert isinstance(engine, Engine)
+            
+            self.attach(engine)
+        
+        self.run(turn_number)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Any, Dict, Optional, TYPE_CHECKING, Tuple, Union
 import tcod
+import numpy as np
 
 from coords import Coords
 from space_objects import Planet, Star, SubSector
@@ -153,45 +154,61 @@ def print_mega_sector(console:Console, gamedata:GameData):
 
     console.draw_frame(x=player_coords.x * 5, y=player_coords.y * 4, width=6, height=5)
 
-    for i, sector_y in enumerate(gamedata.player_subsector_info):
-        for j, sector_x in enumerate(sector_y):
-            i2 = i * 4 + 1
-            j2 = j * 5 + 1
-
+    knowledge = gamedata.player_sector_knowledge
+    
+    known = knowledge.known
+    
+    total_stars = known["total_stars"]
+    hostile_planets = known["barren_planets"] + known["unfriendly_planets"]
+    friendly_planets = known["friendly_planets"] + known["neutral_planets"]
+    hostile_ships = known["hostile_ships"]
+    allied_ships = known["allied_ships"]
+    objectives = known["objectives"]
+    last_seen = knowledge.last_seen
+
+    for i, j in np.ndindex(last_seen.shape):
+        i2 = i * 4 + 1
+        j2 = j * 5 + 1
+        
+        if last_seen[i, j] < 0:
+            # this sub sector has never been scanned
             console.print(
                 x=x+j2, y=y+i2,
-                string=f"*{sector_x.total_stars}", fg=colors.yellow
+                string="*?", fg=colors.yellow
             )
-            if sector_x.barren_planets + sector_x.unfriendly_planets > 0:
-                console.print(
-                    x=x+j2, y=y+i2+1,
-                    string=f"+{sector_x.barren_planets + sector_x.unfriendly_planets}", fg=colors.planet_barren
-                )
-            if sector_x.friendly_planets+sector_x.neutral_planets > 0:
-                console.print(
-                    x=x+j2, y=y+i2+2,
-                    string=f"+{sector_x.friendly_planets+sector_x.neutral_planets}", fg=colors.planet_allied
-                )
-            hostile_ships = sector_x.hostile_ships
-            
-            if hostile_ships > 0:
-                console.print(
-                    x=x+j2+2, y=y+i2,
-                    string=f"E{hostile_ships}", fg=colors.red if hostile_ships > 0 else colors.cyan
-                )
-            allied_ships = sector_x.allied_ships - (1 if gamedata.grid[i][j].player_present else 0)
+        else:
+            console.print(
+                x=x+j2, y=y+i2,
+                string=f"*{total_stars[i, j]}", fg=colors.yellow
+            )
+        if hostile_planets[i, j] > 0:
+            console.print(
+                x=x+j2, y=y+i2+1,
+                string=f"+{hostile_planets[i, j]}", fg=colors.planet_barren
+            )
+        if friendly_planets[i, j] > 0:
+            console.print(
+                x=x+j2, y=y+i2+2,
+                string=f"+{friendly_planets[i, j]}", fg=colors.planet_allied
+            )
+        if hostile_ships[i, j] > 0:
+            console.print(
+                x=x+j2+2, y=y+i2,
+                string=f"E{hostile_ships[i, j]}", fg=colors.red
+            )
+        allied_ships_in_sector = allied_ships[i, j] - (1 if gamedata.grid[i][j].player_present else 0)
 
-            if allied_ships > 0:
-                console.print(
-                    x=x+j2+2, y=y+i2+1,
-                    string=f"F{allied_ships}", fg=colors.green if allied_ships > 0 else colors.cyan
-                )
-            if sector_x.objectives:
-                
-                console.print(
-                    x=x+j2+2, y=y+i2+2,
-                    string=f"M{sector_x.objectives}", fg=colors.cyan
-                )
+        if allied_ships_in_sector > 0:
+            console.print(
+                x=x+j2+2, y=y+i2+1,
+                string=f"F{allied_ships_in_sector}", fg=colors.green
+            )
+        if objectives[i, j]:
+            
+            console.print(
+                x=x+j2+2, y=y+i2+2,
+                string=f"M{objectives[i, j]}", fg=colors.cyan
+            )
             
 def get_system_color(percentage:float, reverse:bool):
 
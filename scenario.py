@@ -6,7 +6,7 @@ from itertools import accumulate
 from math import floor
 import re
 from typing import Dict, Final, FrozenSet, Optional, Pattern, Tuple, TYPE_CHECKING
-from random import randint
+from random import Random, randint
 from datetime import datetime
 from frozendict import frozendict
 from global_functions import get_first_group_in_pattern, get_multiple_groups_in_pattern
@@ -101,17 +101,21 @@ class Encounter:
         
         return n, r
     
-    def generate_ships(self):
+    def generate_ships(self, rng:Optional[Random]=None):
         """Yeilds dictionaries consisting of a string keys and int values.
-
+        
+        Args:
+            rng (Optional[Random], optional): The random number generator to use. If this is None, the random module is used. Defaults to None.
+        
         Yields:
             Dict[str,int]: A dictionary consisting of string keys and int values. The string is the key of the ship class, and the int is the number of ships that will be generated.
         """
+        _randint = rng.randint if rng else randint
         
-        number_of_encounters = randint(self.min_encounters, self.max_encounters)
+        number_of_encounters = _randint(self.min_encounters, self.max_encounters)
         
         for n in range(number_of_encounters):
-            r = {k:randint(v[0], v[1]) for k,v in self.ships.items()}
+            r = {k:_randint(v[0], v[1]) for k,v in self.ships.items()}
             yield r
 
 def create_sceneraio():
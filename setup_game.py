@@ -3,7 +3,8 @@ from decimal import Decimal
 from random import choice, randint
 import re
 from ai import BaseAi, EasyEnemy, HardEnemy, MediumEnemy, AllyAI
-from engine import Engine
+from engine import Engine, load_game, set_up_game
+from order_journal import set_up_recorded_game
 from get_config import CONFIG_OBJECT
 from game_data import GameData
 from typing import Final, Optional
@@ -24,6 +25,17 @@ multispace_pattern = re.compile(r"([ ]{2,})")
 
 singleline_pattern = re.compile(r"[^\n ] \n[^\n ]")
 
+def set_up_new_game(**kwargs):
+    """Calls set_up_game with kwargs. If config.ini has a journal_file, the game is recorded to it with set_up_recorded_game, so that it can be played back later with 'python headless.py --replay'.
+    
+    Returns:
+        Engine: The engine.
+    """
+    if CONFIG_OBJECT.journal_file:
+        return set_up_recorded_game(CONFIG_OBJECT.journal_file, **kwargs)
+    
+    return set_up_game(**kwargs)
+
 def set_up_help_text():
 
     with open("README.md") as readme:
@@ -54,54 +66,6 @@ def set_up_help_text():
 
 HELP_TEXT = tuple(set_up_help_text())
 
-def load_game(filename: str) -> Engine:
-    """Load an Engine instance from a file."""
-    with open(filename, "rb") as f:
-        engine = pickle.loads(lzma.decompress(f.read()))
-    assert isinstance(engine, Engine)
-    return engine
-
-def set_up_game(
-        *,
-        easy_aim:bool, easy_move:bool, easy_warp:bool, torpedo_warning:bool, crash_warning:bool, three_d_movment:bool,
-        ship_name:str, captain_name:str, scenario:Scenerio, difficulty:type[BaseAi], allied_ai:type[BaseAi]
-
-    ):
-    game_data = GameData(
-        subsecs_x = CONFIG_OBJECT.sector_width,
-        subsecs_y = CONFIG_OBJECT.sector_height,
-        subsec_size_x = CONFIG_OBJECT.subsector_width,
-        subsec_size_y = CONFIG_OBJECT.subsector_height,
-        easy_aim = easy_aim,
-        easy_move = easy_move,
-        three_d_movment = three_d_movment,
-        easy_warp = easy_warp,
-        torpedo_warning = torpedo_warning,
-        crash_warning = crash_warning,
-        current_datetime = scenario.create_date_time(),
-        starting_stardate = stardate(scenario.create_date_time()),
-        ending_stardate = stardate(scenario.enddate),
-        scenerio=scenario,
-        difficulty=difficulty,
-        alliled_ai=allied_ai
-    )
-    engine = Engine(
-        filename = "",
-        player = game_data.player,
-        easy_aim = easy_aim,
-        easy_navigation = easy_move,
-        easy_warp = easy_warp,
-        torpedo_warning = torpedo_warning,
-        crash_warning = crash_warning
-    )
-    engine.game_data = game_data
-
-    game_data.engine = engine
-
-    game_data.set_up_game(ship_name, captain_name)
-    game_data.info_description = game_data.describe_info()
-    return engine
-
 class StartupScreen(input_handelers.BaseEventHandler):
     """Handle the main menu rendering and input."""
 
@@ -706,7 +670,7 @@ class NewGame(input_handelers.BaseEventHandler):
                 difficulty = self.difficulty.index_key
                 
                 return input_handelers.CommandEventHandler(
-                    set_up_game(
+                    set_up_new_game(
                         easy_aim=self.aim_button.is_active,
                         easy_move=self.move_button.is_active,
                         easy_warp=self.warp_button.is_active,
@@ -783,7 +747,7 @@ class NewGame(input_handelers.BaseEventHandler):
             difficulty = self.difficulty.index_key
 
             return input_handelers.CommandEventHandler(
-                set_up_game(
+                set_up_new_game(
                     easy_aim=self.aim_button.is_active,
                     easy_move=self.move_button.is_active,
                     easy_warp=self.warp_button.is_active,
@@ -1,7 +1,8 @@
 from dataclasses import dataclass
+from enum import IntFlag
 from functools import lru_cache
 from posixpath import split
-from random import choice
+from random import Random, choice
 import re
 from string import digits
 from typing import Dict, Final, Optional, Tuple, List
@@ -24,6 +25,22 @@ VALID_SHIP_TYPES:Final = {
     "WARBIRD"
 }
 
+class ShipCapability(IntFlag):
+    """The optional systems that a ship class can have. Every ship has sensors, a scanner and a warp core, so they are not included.
+    """
+    NONE = 0
+    SHIELDS = 1
+    POLARIZED_HULL = 2
+    TORPEDOS = 4
+    CREW = 8
+    """The ship has life support and transporters.
+    """
+    CLOAK = 16
+    BEAM_ARRAY = 32
+    CANNONS = 64
+    IMPULSE = 128
+    WARP_DRIVE = 256
+
 @lru_cache
 def get_system_names(
     *,
@@ -277,9 +294,19 @@ to one.'''
             k:v for k,v in self.torp_dict
         }
 
-    def create_name(self):
+    def create_name(self, rng:Optional[Random]=None):
+        """Picks a name for a new ship of this class.
+        
+        Args:
+            rng (Optional[Random], optional): The random number generator to use. If this is None, the random module is used. Defaults to None.
+        
+        Returns:
+            str: The name of the ship.
+        """
+        _choice = rng.choice if rng else choice
+        
         has_proper_name = self.has_proper_name
-        return choice(self.nation.ship_names) if has_proper_name else "".join([choice(digits) for a in range(8)])
+        return _choice(self.nation.ship_names) if has_proper_name else "".join([_choice(digits) for a in range(8)])
 
     @property
     @lru_cache
@@ -343,6 +370,32 @@ to one.'''
     def is_automated(self):
         return self.max_crew <= 0
 
+    @property
+    @lru_cache
+    def capabilities(self):
+        """Works out which optional systems ships of this class have.
+
+        Returns:
+            ShipCapability: The flags for each of the systems.
+        """
+        capabilities = ShipCapability.NONE
+        
+        for has_system, capability in (
+            (self.max_shields > 0, ShipCapability.SHIELDS),
+            (self.polarized_hull > 0, ShipCapability.POLARIZED_HULL),
+            (self.ship_type_can_fire_torps, ShipCapability.TORPEDOS),
+            (self.max_crew > 0, ShipCapability.CREW),
+            (self.cloak_strength > 0.0, ShipCapability.CLOAK),
+            (self.max_beam_energy > 0, ShipCapability.BEAM_ARRAY),
+            (self.max_cannon_energy > 0, ShipCapability.CANNONS),
+            (self.evasion > 0.0, ShipCapability.IMPULSE),
+            (self.max_warp > 0, ShipCapability.WARP_DRIVE)
+        ):
+            if has_system:
+                capabilities |= capability
+        
+        return capabilities
+
     @property
     @lru_cache
     def ship_type_can_cloak(self):
@@ -367,8 +420,8 @@ to one.'''
             Tuple[int,float]: A tuple ontaining values for the max hull, max shields, max energy, max crew members, max weapon energy, and torpedo effectiveness
         """
         
-        torpedo_value = (self.max_torpedos * self.torp_tubes * 
-            ALL_TORPEDO_TYPES[self.get_most_powerful_torpedo_type].damage
+        torpedo_value = (
+            self.max_torpedos * self.torp_tubes * self.get_most_powerful_torpedo_type.damage
         ) if self.ship_type_can_fire_torps else 0
         
         try:
@@ -393,6 +446,18 @@ to one.'''
         hull, shields, polarized_hull, energy, power_generated_per_turn, max_warp, crew, weapon_energy, cannon_energy, torpedos, detection_strength, cloaking, evasion, targeting, scanner_range = self.get_stragic_values
         
         return hull + shields + energy + crew + weapon_energy + cannon_energy + torpedos + detection_strength
+    
+    @property
+    @lru_cache
+    def max_stragic_value(self):
+        """The highest score that a ship of this class can be worth. This is the first value returned by Starship.calculate_ship_stragic_value.
+        """
+        hull, shields, polarized_hull, energy, power_generated_per_turn, max_warp, crew, beam_energy, cannon_energy, torpedo_value, detection_strength, cloaking, evasion, targeting, scanner_range = self.get_stragic_values
+        
+        return sum(
+            (hull, shields, energy, crew, beam_energy, cannon_energy, torpedo_value, 1), 
+            start= 0.0
+        )
 
 def create_ship_classes():
     
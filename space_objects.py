@@ -1,9 +1,14 @@
 from __future__ import annotations
-from typing import Dict, Iterable, List, Optional,  Tuple, TYPE_CHECKING
-from random import choice, choices, randint, uniform, random
+from typing import Callable, Dict, Final, Iterable, List, Optional, Sequence, Set, Tuple, TYPE_CHECKING
+from random import Random
 from itertools import accumulate
+from functools import lru_cache
+from math import isqrt
+import numpy as np
 from coords import Coords
-from data_globals import PLANET_NEUTRAL, PLANET_BARREN, PLANET_BOMBED_OUT, PLANET_FRIENDLY, PLANET_PREWARP, PLANET_RELATIONS, PLANET_TYPES, PLANET_WARP_CAPABLE, STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED, STATUS_DERLICT, STATUS_HULK, STATUS_OBLITERATED, PlanetHabitation, PlanetRelation, PLANET_RELATION_DICT
+from get_config import get_ray_to
+from game_events import PlanetDispositionChanged, ShipChangedNation, ShipDestroyed, ShipMoved, ShipStatusChanged, ShipWarped
+from data_globals import PLANET_HOSTILE, PLANET_NEUTRAL, PLANET_BARREN, PLANET_BOMBED_OUT, PLANET_FRIENDLY, PLANET_PREWARP, PLANET_RELATIONS, PLANET_TYPES, PLANET_WARP_CAPABLE, ALL_SHIP_STATUSES, STATUS_ACTIVE, STATUS_CLOAK_COMPRIMISED, STATUS_CLOAKED, STATUS_DERLICT, STATUS_HULK, STATUS_OBLITERATED, PlanetHabitation, PlanetRelation, PLANET_RELATION_DICT, ShipStatus
 import colors
 from nation import Nation
 from torpedo import ALL_TORPEDO_TYPES, Torpedo
@@ -12,10 +17,25 @@ if TYPE_CHECKING:
     from game_data import GameData
     from message_log import MessageLog
     from starship import Starship
+    from data_globals import ShipStatus
+    from ai import TacticalContext
 
 star_number_weights = tuple(accumulate((5, 12, 20, 9, 6, 3)))
 star_number_weights_len = len(star_number_weights)
 
+# the counts that are kept for each sub sector in SectorKnowledge
+SUBSECTOR_INFO_COUNTS:Final = (
+    "total_stars", "friendly_planets", "neutral_planets", "unfriendly_planets", "barren_planets",
+    "hostile_ships", "allied_ships", "derelicts", "objectives"
+)
+# the counts that are always kept up to date, instead of waiting until a ship scans the sub sector
+LIVE_SUBSECTOR_INFO_COUNTS:Final = frozenset({"allied_ships", "objectives"})
+
+# values used in SubSector.occupancy. Any value above OCCUPANCY_EMPTY is the ship_id of a starship
+OCCUPANCY_EMPTY:Final = 0
+OCCUPANCY_STAR:Final = -1
+OCCUPANCY_PLANET:Final = -2
+
 class CanDockWith:
     
     def can_dock_with(self, starship:Starship, require_adjacent:bool=True):
@@ -148,7 +168,7 @@ class Star(InterstellerObject):
 
     def __init__(self, local_coords:Coords, sector_coords:Coords, system:SubSector):
         super().__init__(local_coords, sector_coords, system)
-        self.name = choices(
+        self.name = system.rng.choices(
             STAR_TYPES,
             cum_weights=STAR_WEIGHTS
         )[0]
@@ -156,62 +176,357 @@ class Star(InterstellerObject):
         self.color = STAR_COLORS[self.name]
         
         self.bg = colors.white if self.color is colors.black else colors.black
-        '''
-        if self.color in {colors.star_blue, colors.star_blue_white}:
-            self.name = choice(("Blue giant", "Blue supergiant", "Blue hypergiant", "Blue subdwarf"))
-        elif self.color is colors.star_white:
-            self.name = "White dwarf"
-        elif self.color in {colors.star_yellow, colors.star_yellow_white}:
-            self.name = choice(("Yellow dwarf", "Yellow giant", "Yellow supergiant", "Yellow hypergiant"))
-        elif self.color is colors.star_orange:
-            self.name = "Orange dwarf"
-        elif self.color is colors.star_red:
-            self.name = choice(("Red dwarf", "Red giant", "Red supergiant", "Red hypergiant"))
-        elif self.color is colors.star_brown:
-            self.name = choice(("Brown dwarf", "Brown subdwarf"))
-        else:
-            self.name = "Black hole"
-        '''
 
     def hit_by_torpedo(self, is_player:bool, game_data:GameData, message_log:MessageLog, torpedo:Torpedo):
         pass
 
+@lru_cache(maxsize=64)
+def get_scan_mask(radius_squared:int):
+    """Creates a circular mask of the sub sectors that a ship can scan. Since the distances between sub sectors squared are always whole numbers, the mask only depends on the whole part of the scan range squared.
+    
+    Args:
+        radius_squared (int): The whole part of the scan range squared.
+    
+    Returns:
+        Tuple[int, np.ndarray]: The distance from the center of the mask to its edges, and a square array of bools that is True for every sub sector that is in range.
+    """
+    radius = isqrt(radius_squared)
+    
+    offsets = np.arange(-radius, radius + 1)
+    
+    mask = (offsets[:, np.newaxis] ** 2 + offsets[np.newaxis, :] ** 2) <= radius_squared
+    
+    mask.setflags(write=False)
+    
+    return radius, mask
+
+class SectorKnowledge:
+    """What one side knows about every sub sector. Each count in SUBSECTOR_INFO_COUNTS has two arrays (indexed [y, x]): one that is always kept up to date, and one of what the side last saw. The counts in LIVE_SUBSECTOR_INFO_COUNTS are about the sides own ships, so both of their arrays are the same.
+    """
+    
+    def __init__(self, width:int, height:int) -> None:
+    
+        self.actual:Dict[str, np.ndarray] = {
+            name : np.zeros((height, width), dtype=np.int32) for name in SUBSECTOR_INFO_COUNTS
+        }
+        self.known:Dict[str, np.ndarray] = {
+            name : (
+                self.actual[name] if name in LIVE_SUBSECTOR_INFO_COUNTS else np.zeros((height, width), dtype=np.int32)
+            ) for name in SUBSECTOR_INFO_COUNTS
+        }
+        self.last_seen = np.full((height, width), -1, dtype=np.int32)
+        """The turn that each sub sector was last scanned on, or -1 if it has never been scanned.
+        """
+    
+    def push_change(self, name:str, x:int, y:int, amount:int):
+        """Records a change to one of the counts. Unless the count is in LIVE_SUBSECTOR_INFO_COUNTS, it will not show up in known until the sub sector is scanned.
+        
+        Args:
+            name (str): The name of the count, such as "hostile_ships".
+            x (int): The x position of the sub sector.
+            y (int): The y position of the sub sector.
+            amount (int): How much the count has gone up or down by.
+        """
+        self.actual[name][y, x] += amount
+    
+    def scan(self, x:int, y:int, scan_range:float, turn_number:int):
+        """Updates what is known about every sub sector that is within scan_range of x, y.
+        
+        Args:
+            x (int): The x position of the sub sector the scanning ship is in.
+            y (int): The y position of the sub sector the scanning ship is in.
+            scan_range (float): How many sub sectors away the ship can scan.
+            turn_number (int): The current turn.
+        """
+        radius, mask = get_scan_mask(int(max(scan_range, 0.0) ** 2))
+        
+        height, width = self.last_seen.shape
+        
+        # the part of the mask that is inside the sector
+        left, right = max(x - radius, 0), min(x + radius + 1, width)
+        top, bottom = max(y - radius, 0), min(y + radius + 1, height)
+        
+        mask = mask[top - (y - radius):bottom - (y - radius), left - (x - radius):right - (x - radius)]
+        
+        window = (slice(top, bottom), slice(left, right))
+        
+        for name in SUBSECTOR_INFO_COUNTS:
+        
+            if name not in LIVE_SUBSECTOR_INFO_COUNTS:
+            
+                np.copyto(self.known[name][window], self.actual[name][window], where=mask)
+        
+        self.last_seen[window][mask] = turn_number
+    
+    def get_known(self, name:str, x:int, y:int):
+    
+        return int(self.known[name][y, x])
+
 class SubSectorInfo:
+    """What one side knows about a sub sector. This reads the counts from that sides SectorKnowledge. friendly_planets, neutral_planets and unfriendly_planets refer to planets that are allied to, neutral to or hostile to that side, and not nescaraly to the player. The same goes for hostile_ships and allied_ships.
+    """
     
-    def __init__(self, x:int, y:int) -> None:
+    def __init__(self, x:int, y:int, knowledge:SectorKnowledge) -> None:
         self.coords = Coords(x=x,y=y)
-        self.total_stars = 0
+        self.knowledge = knowledge
+    
+    def __getattr__(self, name:str):
+    
+        if name not in SUBSECTOR_INFO_COUNTS:
+            raise AttributeError(name)
         
-        self.planets_dict:Dict[Coords, Planet] = {}
-        """This value refers to planets that are allied to the ship in question, and not nescaraly to the player
+        return self.knowledge.get_known(name, self.coords.x, self.coords.y)
+    
+    @property
+    def last_seen(self):
+        return int(self.knowledge.last_seen[self.coords.y, self.coords.x])
+
+class LineOfFire:
+    """The paths of torpedos fired from each ship in a sub sector at the positions of the other ships in it. Every path is looked up in the occupancy grid in one go when this is created, and this is reused until a ship enters, leaves or moves. Ship statuses are not stored here, since they can change without a ship moving, so check them when the ships are looked up.
+    """
+    
+    def __init__(self, sub_sector:SubSector) -> None:
+        self.sub_sector = sub_sector
+        
+        self.paths:Dict[Tuple[int,int,int], Tuple[np.ndarray, np.ndarray]] = {}
+        """The keys are the ship_id of the ship that fired and the x and y position that it is aiming at. The values are the spots along the path that are inside the sub sector, and what is in each spot.
         """
-        self.friendly_planets = 0
-        """This value refers to planets that are neutral to the ship in question, and not nescaraly to the player
+        self.ships_hit:Dict[Tuple[int,int,int], np.ndarray] = {}
+        """The ship_ids of the ships along each path, in order, up to the first star or planet.
         """
-        self.neutral_planets = 0
-        """This value refers to planets that are hostile to the ship in question, and not nescaraly to the player
+        ship_positions = [
+            (ship.ship_id, ship.local_coords.x, ship.local_coords.y) for ship in sub_sector.ships
+        ]
+        target_positions = set((x, y) for _, x, y in ship_positions)
+        
+        keys:List[Tuple[int,int,int]] = []
+        rays:List[np.ndarray] = []
+        
+        for ship_id, x, y in ship_positions:
+            for target_x, target_y in target_positions:
+                
+                if target_x == x and target_y == y:
+                    continue
+                
+                keys.append((ship_id, target_x, target_y))
+                rays.append(
+                    np.array(get_ray_to(delta_x=target_x - x, delta_y=target_y - y), dtype=np.int32) + (x, y)
+                )
+        if not keys:
+            return
+        
+        lengths = np.array([len(ray) for ray in rays])
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        
+        all_rays = np.concatenate(rays)
+        
+        height, width = sub_sector.occupancy.shape
+        
+        # a path that leaves the sub sector can't come back into it, so the spots that are out of bounds are always at the end of a path
+        in_bounds = (
+            (all_rays[:, 0] >= 0) & (all_rays[:, 0] < width) & (all_rays[:, 1] >= 0) & (all_rays[:, 1] < height)
+        )
+        values = np.full(len(all_rays), OCCUPANCY_EMPTY, dtype=np.int32)
+        
+        values[in_bounds] = sub_sector.occupancy[all_rays[in_bounds, 1], all_rays[in_bounds, 0]]
+        
+        path_of_spot = np.repeat(np.arange(len(keys)), lengths)
+        step = np.arange(len(all_rays)) - starts[path_of_spot]
+        
+        # the torpedo will stop at the first star or planet
+        first_blocked = np.minimum.reduceat(
+            np.where(values < OCCUPANCY_EMPTY, step, len(all_rays)), starts
+        )
+        is_ship_hit = (values > OCCUPANCY_EMPTY) & (step < first_blocked[path_of_spot])
+        
+        for key, start, length in zip(keys, starts, lengths):
+            
+            path = slice(start, start + length)
+            
+            path_in_bounds = in_bounds[path]
+            
+            self.paths[key] = all_rays[path][path_in_bounds], values[path][path_in_bounds]
+            
+            self.ships_hit[key] = values[path][is_ship_hit[path]]
+    
+    def get_path(self, ship:Starship, x:int, y:int):
+        """Gets the path of a torpedo fired by ship at the spot x, y. If there was no ship there when this was created, then the path is looked up on the spot.
+
+        Args:
+            ship (Starship): The ship that is firing.
+            x (int): The x position that is being aimed at.
+            y (int): The y position that is being aimed at.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: An array with a shape of (n, 2) of the x and y positions along the path, and an array of the occupancy values at those positions.
         """
-        self.unfriendly_planets = 0
-        self.barren_planets = 0
+        try:
+            return self.paths[(ship.ship_id, x, y)]
+        except KeyError:
+            local_coords = ship.local_coords
+            
+            return self.sub_sector.get_ray_occupancy(
+                np.array(
+                    get_ray_to(delta_x=x - local_coords.x, delta_y=y - local_coords.y), dtype=np.int32
+                ) + (local_coords.x, local_coords.y)
+            )
     
-        self.objectives = 0
-        
-        """This value refers to ships that are hostile to the ship in question, and not nescaraly to the player
+    def get_ships_hit(self, ship:Starship, x:int, y:int):
+        """Gets the ship_ids of the ships that a torpedo fired by ship at the spot x, y would pass through, up to the first star or planet.
+
+        Args:
+            ship (Starship): The ship that is firing.
+            x (int): The x position that is being aimed at.
+            y (int): The y position that is being aimed at.
+
+        Returns:
+            np.ndarray: The ship_ids, in order.
         """
-        self.hostile_ships = 0
+        try:
+            return self.ships_hit[(ship.ship_id, x, y)]
+        except KeyError:
+            _, values = self.get_path(ship, x, y)
+            
+            blocked = np.flatnonzero(values < OCCUPANCY_EMPTY)
         
-        """This value refers to ships that are allied to the ship in question, and not nescaraly to the player
+            if blocked.size:
+                values = values[:blocked[0]]
+            
+            return values[values > OCCUPANCY_EMPTY]
+
+class FreeCells:
+    """The empty spots in a sub sector. Spots are kept in a list, with a dictionary of where each spot is in the list, so that a spot can be added, removed or picked at random in constant time. When a spot is removed, the last spot in the list is moved into its place.
+    
+    Args:
+        spots (Iterable[Coords]): The spots that start out empty.
+        rng (Random): The random number generator that random spots are picked with, usualy the one of the sub sector.
+    """
+    
+    def __init__(self, spots:Iterable[Coords], rng:Random) -> None:
+    
+        self.rng = rng
+        self.spots:List[Coords] = list(spots)
+        self.index:Dict[Coords, int] = {spot : i for i, spot in enumerate(self.spots)}
+    
+    def __len__(self):
+        return len(self.spots)
+    
+    def __contains__(self, spot:Coords):
+        return spot in self.index
+    
+    def __iter__(self):
+        return iter(self.spots)
+    
+    def add(self, spot:Coords):
+    
+        if spot not in self.index:
+        
+            self.index[spot] = len(self.spots)
+            self.spots.append(spot)
+    
+    def discard(self, spot:Coords):
+    
+        try:
+            i = self.index.pop(spot)
+        except KeyError:
+            return
+        
+        last_spot = self.spots.pop()
+        
+        if i < len(self.spots):
+        
+            self.spots[i] = last_spot
+            self.index[last_spot] = i
+    
+    def take_random_spot(self):
+        """Picks a random spot and removes it.
+        
+        Returns:
+            Coords: The spot.
         """
-        self.allied_ships = 0
+        spot = self.rng.choice(self.spots)
+        
+        self.discard(spot)
+        
+        return spot
+    
+    def take_random_spots(self, how_many:int):
+        """Picks up to how_many different random spots and removes them.
+        
+        Args:
+            how_many (int): The number of spots to pick. If there are not enough spots left, then all of them are picked.
         
-        self.derelicts = 0
+        Returns:
+            List[Coords]: The spots.
+        """
+        return [self.take_random_spot() for _ in range(min(how_many, len(self.spots)))]
+
+class ShipsByStatus:
+    """A group of ships that are sorted by their ship_status, so that questions such as "are any of these ships still active?" can be answered by looking at the statuses instead of at every ship. Ships are moved from one status to another by move, which is called when Starship.update_ship_status emits a transition.
+    """
+    
+    def __init__(self, ships:Iterable[Starship]=()) -> None:
+    
+        self.buckets:Dict[ShipStatus, Dict[Starship, None]] = {status : {} for status in ALL_SHIP_STATUSES}
+        """The ships in each status. Dictionaries are used instead of sets so that the ships stay in the order they were added.
+        """
+        self.statuses:Dict[Starship, ShipStatus] = {}
+        """The status that each ship is filed under.
+        """
+        for ship in ships:
+            self.add(ship)
+    
+    def __len__(self):
+        return len(self.statuses)
+    
+    def __contains__(self, ship:Starship):
+        return ship in self.statuses
+    
+    def add(self, ship:Starship):
+    
+        if ship not in self.statuses:
         
-        self.planet_count_needs_updating = True
-        self.ship_count_needs_updating = True
+            status = ship.ship_status
             
-    @property
-    def needs_updating(self):
-        return self.planet_count_needs_updating or self.ship_count_needs_updating
+            self.statuses[ship] = status
+            self.buckets[status][ship] = None
+    
+    def discard(self, ship:Starship):
+    
+        try:
+            status = self.statuses.pop(ship)
+        except KeyError:
+            return
+        
+        del self.buckets[status][ship]
+    
+    def move(self, ship:Starship, new_status:ShipStatus):
+        """Files the ship under new_status. This does nothing if the ship was not added.
+        
+        Args:
+            ship (Starship): The ship in question
+            new_status (ShipStatus): The status that the ship has changed to.
+        """
+        try:
+            old_status = self.statuses[ship]
+        except KeyError:
+            return
+        
+        del self.buckets[old_status][ship]
+        
+        self.buckets[new_status][ship] = None
+        self.statuses[ship] = new_status
+    
+    def any_ships(self, condition:Callable[[ShipStatus], bool]):
+        """Checks if there are any ships in a status that condition returns True for. This only looks at the statuses, not the ships.
+        
+        Args:
+            condition (Callable[[ShipStatus], bool]): Such as lambda status: status.is_active
+        
+        Returns:
+            bool: True if there is at least one such ship.
+        """
+        return any(ships for status, ships in self.buckets.items() if ships and condition(status))
 
 class SubSector:
     """A SubSector is a region of space that contains stars and planets. 
@@ -223,12 +538,6 @@ class SubSector:
         [type]: [description]
     """
 
-    @staticmethod
-    def __grab_random_and_remove(rand_list:List[Tuple[int,int]]):
-        r = choice(rand_list)
-        rand_list.remove(r)
-        return r
-
     @staticmethod
     def __gen_safe_spot_list(x_range:range, y_range:range):
 
@@ -237,9 +546,14 @@ class SubSector:
                 yield Coords(x=x,y=y)
 
     def __init__(self, gd:GameData, x:int, y:int):
-
+    
+        self.rng = gd.create_rng("sub sector", x, y)
+        """Used for everything random that happens to the sub sector itself, such as placing stars and planets, picking empty spots, and the damage that torpedos do to planets.
+        """
         #self.astroObjects = [Sector.__buildSlice(gd.subsec_size_x) for s in gd.subsec_size_range_y]
-        self.safe_spots = list(SubSector.__gen_safe_spot_list(gd.subsec_size_range_x, gd.subsec_size_range_y))
+        self.safe_spots = FreeCells(SubSector.__gen_safe_spot_list(gd.subsec_size_range_x, gd.subsec_size_range_y), self.rng)
+        """The spots that have no star, planet or ship in them.
+        """
         self.coords = Coords(x=x,y=y)
         #self.x = x
         #self.y = y
@@ -267,6 +581,42 @@ class SubSector:
         self.planets_hostile_to_enemy = 0
     
         self.player_present = False
+        
+        self.ships:List[Starship] = []
+        """All ships that are in this sub sector and are not passing through it at warp, including derlicts and wrecks. Ships are added by add_ship_to_sec and removed by remove_ship_from_sec.
+        """
+        
+        self.ships_by_status = ShipsByStatus()
+        """The same ships as ships, sorted by their status. This is kept up to date by on_ship_status_changed.
+        """
+        
+        self.occupancy = np.full((gd.subsec_size_y, gd.subsec_size_x), OCCUPANCY_EMPTY, dtype=np.int32)
+        """A grid (indexed [y, x]) of what is in each spot: OCCUPANCY_EMPTY, OCCUPANCY_STAR, OCCUPANCY_PLANET or the ship_id of a ship. Ships are kept on the grid even after they are destroyed, so always check the status of a ship that is found.
+        """
+        
+        self.tactical_context:Optional[TacticalContext] = None
+        """Shared information for the AIs of the ships in this sub sector. This is built by ai.get_tactical_context and is thrown away whenever a ship enters, leaves or moves, and at the end of every turn.
+        """
+        
+        self.line_of_fire:Optional[LineOfFire] = None
+        """The torpedo paths between every pair of ships in this sub sector. This is built by get_line_of_fire and is thrown away whenever a ship enters, leaves or moves, and at the end of every turn.
+        """
+        
+        event_bus = gd.event_bus
+        
+        # only events that happen in this sub sector are passed on
+        event_bus.subscribe(ShipStatusChanged, self.on_ship_status_changed, self.coords)
+        event_bus.subscribe(ShipChangedNation, self.on_ship_changed_nation, self.coords)
+        event_bus.subscribe(ShipMoved, self.on_ship_moved, self.coords)
+        event_bus.subscribe(ShipDestroyed, self.on_ship_destroyed, self.coords)
+        event_bus.subscribe(PlanetDispositionChanged, self.on_planet_disposition_changed, self.coords)
+        
+        self.ship_info_counts:Dict[Starship, Dict[Tuple[bool, str], int]] = {}
+        """How much each ship in this sub sector adds to the counts in the player and enemy SubSectorInfo. The keys of the inner dictionaries are whether the count is in the enemy SubSectorInfo, and the name of the count.
+        """
+        self.planet_info_counts:Dict[Tuple[bool, str], int] = {}
+        """How much the stars and planets in this sub sector add to the counts in the player and enemy SubSectorInfo.
+        """
     
     @property
     def get_player_subsector_info(self):
@@ -278,10 +628,12 @@ class SubSector:
         
     def random_setup(self, star_number_weights:Iterable[int], star_number_weights_len:int):
 
-        stars = choices(range(star_number_weights_len), cum_weights=star_number_weights)[0]
+        rng = self.rng
+        
+        stars = rng.choices(range(star_number_weights_len), cum_weights=star_number_weights)[0]
 
         for i in range(stars):
-            x, y = SubSector.__grab_random_and_remove(self.safe_spots)
+            x, y = self.safe_spots.take_random_spot()
 
             xy = Coords(x=x,y=y)
 
@@ -290,6 +642,7 @@ class SubSector:
             self.stars_dict[xy] = Star(
                 local_coords=xy, sector_coords=self.coords, system=self
             )
+            self.occupancy[y, x] = OCCUPANCY_STAR
         
         number_of_stars = self.number_of_stars
             
@@ -297,25 +650,25 @@ class SubSector:
             
             if number_of_stars == 1:
                 
-                number_of_planets = randint(0, 4)
+                number_of_planets = rng.randint(0, 4)
             
             elif number_of_stars == 2:
                 
-                number_of_planets = randint(1, 6)
+                number_of_planets = rng.randint(1, 6)
             else:
-                number_of_planets = randint(2, 8)
+                number_of_planets = rng.randint(2, 8)
             
             for p in range(number_of_planets):
-                x,y = SubSector.__grab_random_and_remove(self.safe_spots)
+                x,y = self.safe_spots.take_random_spot()
 
                 local_coords = Coords(x=x, y=y)
                 
-                planet_habbitation = choice(PLANET_TYPES)
+                planet_habbitation = rng.choice(PLANET_TYPES)
                 
                 has_disposition_towards_warp_capiable_civs = planet_habbitation.has_disposition_towards_warp_capiable_civs
                 
                 player_planet_relation, enemy_planet_relation = (
-                    choice(PLANET_RELATIONS), choice(PLANET_RELATIONS)
+                    rng.choice(PLANET_RELATIONS), rng.choice(PLANET_RELATIONS)
                 ) if has_disposition_towards_warp_capiable_civs else (
                     PlanetRelation.HOSTILE, PlanetRelation.HOSTILE
                 )
@@ -327,6 +680,7 @@ class SubSector:
                     system=self
                 )
                 self.planets_dict[local_coords] = p
+                self.occupancy[y, x] = OCCUPANCY_PLANET
                 
                 if has_disposition_towards_warp_capiable_civs:
                     
@@ -341,9 +695,11 @@ class SubSector:
                         self.unfriendly_planets += 1
                 else:
                     self.unfriendly_planets += 1
-
-    def count_planets(self):
         
+        self.count_planets()
+    
+    def count_planets(self):
+
         planet_habitations_for_player = [
             planet.player_display_status for planet in self.planets_dict.values()
         ]
@@ -370,11 +726,31 @@ class SubSector:
         self.planets_hostile_to_enemy = total_planets - (
             self.planets_friendly_to_enemy + self.planets_neutral_to_enemy
         )
-        x, y = self.coords.x, self.coords.y
+        planet_info_counts:Dict[Tuple[bool, str], int] = {
+            (False, "total_stars") : self.total_stars,
+            (True, "total_stars") : self.total_stars,
+            (False, "barren_planets") : self.barren_planets,
+            (True, "barren_planets") : self.barren_planets
+        }
+        for planet in self.planets_dict.values():
         
-        self.game_data.player_subsector_info[y][x].planet_count_needs_updating = True
-        self.game_data.enemy_subsector_info[y][x].planet_count_needs_updating = True
-    
+            if not planet.planet_habbitation.has_disposition_towards_warp_capiable_civs:
+                continue
+            
+            for is_enemy, status in ((False, planet.player_display_status), (True, planet.enemy_display_status)):
+            
+                name = (
+                    "friendly_planets" if status == PLANET_FRIENDLY else
+                    "neutral_planets" if status == PLANET_NEUTRAL else
+                    "unfriendly_planets" if status == PLANET_HOSTILE else None
+                )
+                if name:
+                    planet_info_counts[(is_enemy, name)] = planet_info_counts.get((is_enemy, name), 0) + 1
+        
+        self.push_info_changes(self.planet_info_counts, planet_info_counts)
+        
+        self.planet_info_counts = planet_info_counts
+
     @property
     def number_of_planets(self):
         return len(self.planets_dict)
@@ -383,184 +759,338 @@ class SubSector:
     def number_of_stars(self):
         return len(self.stars_dict)
     
-    def find_random_safe_spot(self, ship_list:Optional[Iterable[Starship]]=None):
-        if ship_list:
-            ship_positions = set(
-                ship.local_coords.create_coords() for ship in ship_list if 
-                ship.sector_coords.x == self.x and ship.sector_coords.y == self.y
-            )
-            okay_spots = [c for c in self.safe_spots if c not in ship_positions]
-            return choice(okay_spots)
-        return choice(self.safe_spots)
-
-    def find_random_safe_spots(self, how_many:int, ship_list:Optional[Iterable[Starship]]=None):
-        if ship_list:
-            ship_positions = set(
-                ship.local_coords.create_coords() for ship in ship_list if ship.sector_coords.x == self.x and 
-                ship.sector_coords.y == self.y
-            )
-            okay_spots = [c for c in self.safe_spots if c not in ship_positions]
-            return choices(okay_spots, k=how_many)
-        return choices(self.safe_spots, k=how_many)
+    def find_random_safe_spot(self):
+        """Picks a random empty spot and removes it from safe_spots, so that it can't be picked again before the ship that it is for is placed there.
+        
+        Returns:
+            Coords: The spot.
+        """
+        return self.safe_spots.take_random_spot()
     
-    def destroy_ship(self, ship:Starship):
-        """This should be called only when a ship is destroyed
+    def find_random_safe_spots(self, how_many:int):
+        """Picks up to how_many different random empty spots and removes them from safe_spots, so that no two ships are placed on the same spot.
+        
+        Args:
+            how_many (int): The number of spots to pick.
+        
+        Returns:
+            List[Coords]: The spots.
+        """
+        return self.safe_spots.take_random_spots(how_many)
+
+    def place_ship(self, ship:Starship):
+        """Marks the spot the ship is at in the occupancy grid.
 
         Args:
             ship (Starship): The ship in question
         """
+        self.occupancy[ship.local_coords.y, ship.local_coords.x] = ship.ship_id
         
-        player_subsector_info = self.get_player_subsector_info
-        enemy_subsector_info = self.get_enemy_subsector_info
+        self.safe_spots.discard(Coords(x=ship.local_coords.x, y=ship.local_coords.y))
 
-        if ship.ship_status == STATUS_DERLICT:
-                        
-            player_subsector_info.needs_updating = True
-            enemy_subsector_info.needs_updating = True
-            
-        elif ship.is_enemy:
-                        
-            player_subsector_info.ship_count_needs_updating = True
-            enemy_subsector_info.allied_ships -= 1
-            
-            if ship.is_mission_critical:
-                
-                enemy_subsector_info.objectives -= 1
-        else:    
-            if ship is ship.game_data.player:
-                
-                self.player_present = False
+    def vacate_ship(self, ship:Starship):
+        """Clears the spot the ship is at in the occupancy grid, if the ship is the one that is recorded there.
+
+        Args:
+            ship (Starship): The ship in question
+        """
+        x, y = ship.local_coords.x, ship.local_coords.y
         
-            player_subsector_info.allied_ships -= 1
-            
-            if ship.is_mission_critical:
-                
-                player_subsector_info.objectives -= 1
+        if self.occupancy[y, x] == ship.ship_id:
+            self.occupancy[y, x] = OCCUPANCY_EMPTY
             
-            enemy_subsector_info.ship_count_needs_updating = True
+            self.safe_spots.add(Coords(x=x, y=y))
+
+    def move_ship(self, ship:Starship, x:int, y:int):
+        """Moves the ship to a new spot in this sub sector and updates the occupancy grid.
+
+        Args:
+            ship (Starship): The ship in question
+            x (int): The new x position
+            y (int): The new y position
+        """
+        old_coords = ship.local_coords.create_coords()
+        
+        self.vacate_ship(ship)
+        
+        ship.local_coords.x = x
+        ship.local_coords.y = y
+        
+        self.place_ship(ship)
+        
+        self.game_data.event_bus.publish(ShipMoved(self.coords, ship, old_coords, Coords(x=x, y=y)))
     
-    def disable_ship(self, ship:Starship):
-                
-        player_subsector_info = self.get_player_subsector_info
+    def get_ray_occupancy(self, coords:Sequence[Coords]):
+        """Looks up what is in each spot along a path with a single index into the occupancy grid.
+
+        Args:
+            coords (Sequence[Coords]): The spots to check, in order. This can also be an array with a shape of (n, 2). The path is cut off at the first spot that is outside of this sub sector.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: An array with a shape of (n, 2) of the x and y positions that are inside this sub sector, and an array of the occupancy values at those positions.
+        """
+        ray = np.array(coords, dtype=np.int32).reshape(-1, 2)
         
-        enemy_subsector_info = self.get_enemy_subsector_info
-                
-        player_subsector_info.ship_count_needs_updating = True
-            
-        enemy_subsector_info.ship_count_needs_updating = True
-            
-        if ship.is_enemy:
-                        
-            enemy_subsector_info.allied_ships -= 1
+        height, width = self.occupancy.shape
+        
+        out_of_bounds = np.flatnonzero(
+            (ray[:, 0] < 0) | (ray[:, 0] >= width) | (ray[:, 1] < 0) | (ray[:, 1] >= height)
+        )
+        if out_of_bounds.size:
+            ray = ray[:out_of_bounds[0]]
+        
+        return ray, self.occupancy[ray[:, 1], ray[:, 0]]
+    
+    def grab_ships_on_path(self, coords:Sequence[Coords], accptable_ship_statuses:Set[ShipStatus]):
+        """Finds the ships along a path.
+
+        Args:
+            coords (Sequence[Coords]): The spots to check, in order.
+            accptable_ship_statuses (Set[ShipStatus]): Only ships with one of these statuses will be included.
+
+        Returns:
+            Dict[Coords, Starship]: A dictionary of positions and ships, in the order they appear along the path.
+        """
+        ray, values = self.get_ray_occupancy(coords)
+        
+        return self.grab_ships_on_ray(ray, values, accptable_ship_statuses)
+    
+    def grab_ships_on_ray(self, ray:np.ndarray, values:np.ndarray, accptable_ship_statuses:Set[ShipStatus]):
+        """Finds the ships along a path that has already been looked up with get_ray_occupancy or get_line_of_fire.
+
+        Args:
+            ray (np.ndarray): An array with a shape of (n, 2) of the x and y positions along the path.
+            values (np.ndarray): The occupancy values at those positions.
+            accptable_ship_statuses (Set[ShipStatus]): Only ships with one of these statuses will be included.
+
+        Returns:
+            Dict[Coords, Starship]: A dictionary of positions and ships, in the order they appear along the path.
+        """
+        ships:Dict[Coords, Starship] = {}
+        
+        for i in np.flatnonzero(values > OCCUPANCY_EMPTY):
             
-            if ship.is_mission_critical:
-                
-                enemy_subsector_info.objectives -= 1
-        else:            
-            player_subsector_info.allied_ships -= 1
+            ship = self.game_data.get_ship_by_id(values[i])
             
-            if ship.is_mission_critical:
+            if ship.ship_status in accptable_ship_statuses:
                 
-                player_subsector_info.objectives -= 1
+                ships[Coords(x=int(ray[i, 0]), y=int(ray[i, 1]))] = ship
+        
+        return ships
     
-    def enable_ship(self, ship:Starship):
+    def get_line_of_fire(self):
+        """Returns the torpedo paths between every pair of ships in this sub sector. They are worked out the first time this is called and are reused until a ship enters, leaves or moves.
+
+        Returns:
+            LineOfFire: The paths.
+        """
+        if self.line_of_fire is None:
+            self.line_of_fire = LineOfFire(self)
         
-        assert ship.ship_status != STATUS_DERLICT
+        return self.line_of_fire
+    
+    def has_ships_hostile_to(self, is_enemy:bool):
+        """Checks if there are any active ships in this sub sector that are on the other side, including cloaked ones.
         
-        is_mission_critical = ship.is_mission_critical
-                
-        enemy_subsector_info = ship.get_sub_sector.get_enemy_subsector_info
+        Args:
+            is_enemy (bool): The side in question, the same as Starship.is_enemy.
         
-        player_subsector_info = ship.get_sub_sector.get_player_subsector_info
+        Returns:
+            bool: True if there is at least one such ship.
+        """
+        return any(
+            ship.is_enemy != is_enemy 
+            for status, ships in self.ships_by_status.buckets.items() if status.is_active for ship in ships
+        )
+    
+    @staticmethod
+    def get_ship_info_counts(ship:Starship):
+        """Works out how much a ship adds to the counts in the player and enemy SubSectorInfo.
         
-        if ship.is_enemy:
-            
-            enemy_subsector_info.allied_ships += 1
-            
-            enemy_subsector_info.derelicts -= 1
-            
-            player_subsector_info.ship_count_needs_updating = True
+        Args:
+            ship (Starship): The ship in question
+        
+        Returns:
+            Dict[Tuple[bool, str], int]: The keys are whether the count is in the enemy SubSectorInfo, and the name of the count.
+        """
+        status = ship.ship_status
+        
+        if status == STATUS_DERLICT:
+            return {
+                (False, "derelicts") : 1,
+                (True, "derelicts") : 1
+            }
+        if not status.is_active:
+            return {}
+        
+        is_enemy = ship.is_enemy
+        
+        counts = {
+            (is_enemy, "allied_ships") : 1
+        }
+        if ship.is_mission_critical:
+            counts[(is_enemy, "objectives")] = 1
+        
+        # cloaked ships don't show up for the other side
+        if status.is_visible:
+            counts[(not is_enemy, "hostile_ships")] = 1
+        
+        return counts
+    
+    def push_info_changes(
+        self, old_counts:Dict[Tuple[bool, str], int], new_counts:Dict[Tuple[bool, str], int]
+    ):
+        """Pushes the difference between old_counts and new_counts into the player and enemy SubSectorInfo. Counts in LIVE_SUBSECTOR_INFO_COUNTS are changed right away, and the rest are held back until a ship of that side scans this sub sector.
+        
+        Args:
+            old_counts (Dict[Tuple[bool, str], int]): The counts that were pushed before.
+            new_counts (Dict[Tuple[bool, str], int]): The counts as they are now.
+        """
+        game_data = self.game_data
+        
+        x, y = self.coords.x, self.coords.y
+        
+        for key in old_counts.keys() | new_counts.keys():
+
+            amount = new_counts.get(key, 0) - old_counts.get(key, 0)
             
-            if is_mission_critical:
-                
-                enemy_subsector_info.objectives += 1
-        else:
-            player_subsector_info.allied_ships += 1
+            if not amount:
+                continue
             
-            player_subsector_info.derelicts -= 1
+            is_enemy, name = key
             
-            enemy_subsector_info.ship_count_needs_updating = True
+            (
+                game_data.enemy_sector_knowledge if is_enemy else game_data.player_sector_knowledge
+            ).push_change(name, x, y, amount)
+
+    def update_ship_info(self, ship:Starship):
+        """Updates the player and enemy SubSectorInfo after something about the ship has changed, such as its status or which side it is on. This does nothing if the ship was not added with add_ship_to_sec.
+        
+        Args:
+            ship (Starship): The ship in question
+        """
+        try:
+            old_counts = self.ship_info_counts[ship]
+        except KeyError:
+            return
+        
+        new_counts = self.get_ship_info_counts(ship)
+        
+        if new_counts != old_counts:
+        
+            self.push_info_changes(old_counts, new_counts)
             
-            if is_mission_critical:
-                
-                player_subsector_info.objectives += 1
+            self.ship_info_counts[ship] = new_counts
+    
+    def on_ship_status_changed(self, event:ShipStatusChanged):
+        """Moves the ship to its new status in ships_by_status and updates the SubSectorInfo counts. This does nothing if the ship was not added with add_ship_to_sec.
+        
+        Args:
+            event (ShipStatusChanged): The event.
+        """
+        ship = event.ship
+        
+        if ship not in self.ships_by_status:
+            return
+        
+        self.ships_by_status.move(ship, event.new_status)
+        
+        self.tactical_context = None
+        self.line_of_fire = None
+        
+        self.update_ship_info(ship)
+    
+    def on_ship_changed_nation(self, event:ShipChangedNation):
+    
+        self.tactical_context = None
+        
+        self.update_ship_info(event.ship)
+    
+    def on_ship_moved(self, event:ShipMoved):
+    
+        self.tactical_context = None
+        self.line_of_fire = None
+    
+    def on_ship_destroyed(self, event:ShipDestroyed):
+    
+        self.destroy_ship(event.ship)
+    
+    def on_planet_disposition_changed(self, event:PlanetDispositionChanged):
+    
+        self.count_planets()
+    
+    def destroy_ship(self, ship:Starship):
+        """This should be called only when a ship is destroyed
+        
+        Args:
+            ship (Starship): The ship in question
+        """
+        if ship is ship.game_data.player:
+        
+            self.player_present = False
+        
+        self.update_ship_info(ship)
+    
+    def disable_ship(self, ship:Starship):
+    
+        self.update_ship_info(ship)
+    
+    def enable_ship(self, ship:Starship):
+    
+        assert ship.ship_status != STATUS_DERLICT
+        
+        self.update_ship_info(ship)
     
     def add_ship_to_sec(self, ship:Starship):
-        """This should be called only when a ship is warping from one are to another
-
+        """This should be called only when a ship is warping from one are to another, or is placed at the start of the game
+        
         Args:
             ship (Starship): The ship in question
         """
-                
-        is_mission_critical = ship.is_mission_critical
+        if ship not in self.ships:
+            self.ships.append(ship)
         
-        is_cloaked = ship.ship_status == STATUS_CLOAKED
+        self.ships_by_status.add(ship)
         
-        player_subsector_info = self.get_player_subsector_info
-        enemy_subsector_info = self.get_enemy_subsector_info
+        self.tactical_context = None
+        self.line_of_fire = None
         
-        if ship.is_enemy:
-            
-            enemy_subsector_info.allied_ships += 1
-            
-            if is_mission_critical:
-                enemy_subsector_info.objectives += 1
-            
-            if not is_cloaked:
-                player_subsector_info.ship_count_needs_updating = True
-        else:
-            if ship.is_controllable:
-                
-                self.player_present = True
-                            
-            player_subsector_info.allied_ships += 1
-            
-            if is_mission_critical:
-                player_subsector_info.objectives += 1
-            
-            if not is_cloaked:
-                enemy_subsector_info.ship_count_needs_updating = True
-
+        if ship.is_controllable:
+        
+            self.player_present = True
+        
+        new_counts = self.get_ship_info_counts(ship)
+        
+        self.push_info_changes(self.ship_info_counts.get(ship, {}), new_counts)
+        
+        self.ship_info_counts[ship] = new_counts
+        
+        self.game_data.event_bus.publish(ShipWarped(self.coords, ship, True))
+    
     def remove_ship_from_sec(self, ship:Starship):
         """This should be called only when a ship is warping from one are to another
-
+        
         Args:
             ship (Starship): The ship in question
         """
+        try:
+            self.ships.remove(ship)
+        except ValueError:
+            pass
+        self.ships_by_status.discard(ship)
         
-        player_subsector_info = self.get_player_subsector_info
-        enemy_subsector_info = self.get_enemy_subsector_info
-
-        if ship.is_enemy:
-                        
-            player_subsector_info.ship_count_needs_updating = True
-            enemy_subsector_info.allied_ships -= 1
-            
-            if ship.is_mission_critical:
-                
-                enemy_subsector_info.objectives -= 1
-        else:    
-            if ship is ship.game_data.player:
-                
-                self.player_present = False
+        self.vacate_ship(ship)
         
-            player_subsector_info.allied_ships -= 1
-            
-            if ship.is_mission_critical:
-                
-                player_subsector_info.objectives -= 1
-            
-            enemy_subsector_info.ship_count_needs_updating = True
+        self.tactical_context = None
+        self.line_of_fire = None
+        
+        if ship is ship.game_data.player:
+        
+            self.player_present = False
+        
+        self.push_info_changes(self.ship_info_counts.pop(ship, {}), {})
+        
+        self.game_data.event_bus.publish(ShipWarped(self.coords, ship, False))
 
 class Planet(InterstellerObject, CanDockWith):
 
@@ -577,7 +1107,7 @@ class Planet(InterstellerObject, CanDockWith):
         self.player_planet_relation = player_planet_relation
         self.enemy_planet_relation = enemy_planet_relation
 
-        self.infastructure = self.planet_habbitation.generate_development()
+        self.infastructure = self.planet_habbitation.generate_development(system.rng)
         
         self.player_display_status:PlanetHabitation = PLANET_RELATION_DICT[
             self.player_planet_relation
@@ -650,7 +1180,7 @@ class Planet(InterstellerObject, CanDockWith):
         """Somebody did a bad, bad, thing (and it was probably you).
 
         Args:
-            is_player (bool): Did the player fire a torpedo? Or was it someone else?
+            guilty_party (Starship): The ship that fired the torpedo. This may be the player or someone else.
             game_data (GameData): [description]
             torpedo (Torpedo): The torpedo object. This contains the amount of damage to do to the planet.
         """
@@ -668,7 +1198,7 @@ class Planet(InterstellerObject, CanDockWith):
             if is_player and self.planet_habbitation is PLANET_BOMBED_OUT:
                 message_log.add_message('Now you are just being petty.')
         else:
-            infrustructure_damage = uniform(
+            infrustructure_damage = self.system.rng.uniform(
                 torpedo.infrastructure * 0.5, torpedo.infrastructure) * 10 * self.infastructure
 
             if is_player:
@@ -709,7 +1239,7 @@ class Planet(InterstellerObject, CanDockWith):
                 #self.player_display_status = PLANET_BOMBED_OUT
                 
                 self.set_planet_disposition()
-                self.system.count_planets()
+                game_data.event_bus.publish(PlanetDispositionChanged(self.sector_coords, self))
 
             elif self.planet_habbitation is PLANET_WARP_CAPABLE:
                 
@@ -747,7 +1277,7 @@ class Planet(InterstellerObject, CanDockWith):
                     ] if self.planet_habbitation.has_disposition_towards_warp_capiable_civs else self.planet_habbitation
                     
                     self.set_planet_disposition()
-                    self.system.count_planets()
+                    game_data.event_bus.publish(PlanetDispositionChanged(self.sector_coords, self))
                             
                 elif planet_disposition == PlanetRelation.NEUTRAL:
                     
@@ -773,7 +1303,7 @@ class Planet(InterstellerObject, CanDockWith):
                         self.player_planet_relation
                     ] if self.planet_habbitation.has_disposition_towards_warp_capiable_civs else self.planet_habbitation
                     
-                    self.system.count_planets()
+                    game_data.event_bus.publish(PlanetDispositionChanged(self.sector_coords, self))
                 else:
                     if is_player:
                         
@@ -792,7 +1322,7 @@ class Planet(InterstellerObject, CanDockWith):
 
                     message_log.add_message('This is a grevous viloation of the prime directive!', colors.red)
                     self.set_planet_disposition()
-                    self.system.count_planets()
+                    game_data.event_bus.publish(PlanetDispositionChanged(self.sector_coords, self))
             else:
                 if player_is_in_same_system:
                     message_log.add_message(f'The torpedo struck the planet, killing {how_many_killed}.')
@@ -800,7 +1330,7 @@ class Planet(InterstellerObject, CanDockWith):
                     
                     message_log.add_message('You will probably be charged with a war crime.', colors.red)
                     self.set_planet_disposition()
-                    self.system.count_planets()
+                    game_data.event_bus.publish(PlanetDispositionChanged(self.sector_coords, self))
                     
                 raise ValueError("You should not see this ")
         
@@ -1,8 +1,10 @@
 from __future__ import annotations
 from copy import copy
-from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple, Type, Union
-from random import choice, uniform, random, randint
+from typing import TYPE_CHECKING, Dict, Final, Iterable, Mapping, Optional, Tuple, Type, Union
+from random import choice
 from math import ceil
+import numpy as np
+from frozendict import frozendict
 from components.beam_array import BeamArray
 from components.cannon import Cannon
 from components.cloak import Cloak
@@ -13,16 +15,18 @@ from components.power_generator import PowerGenerator
 from components.scanner import Scanner
 from components.sensors import Sensors
 from components.shields import Shields
+from components.starship_system import FleetColumn, versioned_property
 from components.torpedo_launcher import TorpedoLauncher
 from components.transporter import Transporter
 from components.warp_drive import WarpDrive
 
-from get_config import get_lookup_table
-from global_functions import ajust_system_integrity, calculate_polarization, inverse_square_law, scan_assistant
-from ship_class import ShipClass
+from combat_simulation import chance_to_hit, chance_to_hit_array, estimate_energy_hit, estimate_ram_attack, estimate_self_destruct, estimate_torpedo_hit, simulate_energy_hit_batch, simulate_ram_attack_batch, simulate_self_destruct_batch, simulate_torpedo_hit_batch
+from global_functions import ajust_system_integrity, average_polarization, calculate_polarization, inverse_square_law, scan_assistant
+from ship_class import ShipCapability, ShipClass
 from space_objects import SubSector, CanDockWith
 from torpedo import Torpedo
 from coords import Coords, MutableCoords
+from game_events import ShipChangedNation, ShipDamaged, ShipDestroyed, ShipStatusChanged
 import colors
 from data_globals import DAMAGE_BEAM, DAMAGE_CANNON, DAMAGE_EXPLOSION, DAMAGE_RAMMING, DAMAGE_TORPEDO, PRECISION_SCANNING_VALUES, REPAIR_DEDICATED, REPAIR_DOCKED, REPAIR_PER_TURN, STATUS_AT_WARP, DamageType, RepairStatus, ShipStatus, STATUS_ACTIVE, STATUS_DERLICT, STATUS_CLOAKED, STATUS_CLOAK_COMPRIMISED,STATUS_HULK, STATUS_OBLITERATED, CloakStatus
 
@@ -30,6 +34,30 @@ if TYPE_CHECKING:
     from game_data import GameData
     from ai import BaseAi
     from nation import Nation
+    from fleet_state import FleetState
+
+# the name of each system, the key that it uses in scan_this_ship and scan_for_print, and what the ship class needs to have the system. Systems with a capability of None are on every ship.
+SHIP_SYSTEMS:Final = (
+    ("warp_drive", "sys_warp_drive", ShipCapability.WARP_DRIVE),
+    ("impulse_engine", "sys_impulse", ShipCapability.IMPULSE),
+    ("beam_array", "sys_beam_array", ShipCapability.BEAM_ARRAY),
+    ("cannons", "sys_cannon_weapon", ShipCapability.CANNONS),
+    ("polarized_hull", "sys_polarize", ShipCapability.POLARIZED_HULL),
+    ("shield_generator", "sys_shield", ShipCapability.SHIELDS),
+    ("sensors", "sys_sensors", None),
+    ("scanner", "sys_scanners", None),
+    ("torpedo_launcher", "sys_torpedos", ShipCapability.TORPEDOS),
+    ("cloak", "sys_cloak", ShipCapability.CLOAK),
+    ("transporter", "sys_transporter", ShipCapability.CREW),
+    ("power_generator", "sys_warp_core", None)
+)
+# the order that systems are repaired in by handle_repair_and_energy_consumption
+REPAIRED_SYSTEMS:Final = (
+    "sensors", "warp_drive", "impulse_engine", "beam_array", "cannons", "shield_generator", "polarized_hull", 
+    "power_generator", "transporter", "torpedo_launcher"
+)
+# the systems that use up energy every turn
+ENERGY_USING_SYSTEMS:Final = ("polarized_hull", "cloak", "shield_generator")
 
 def randomNeumeral(n:int) -> str:
     for i in range(n):
@@ -40,7 +68,17 @@ class Starship(CanDockWith):
     """
 
     game_data: GameData
-
+    
+    # set by FleetState.add_ship
+    fleet_state:Optional[FleetState] = None
+    fleet_row:int = 0
+    
+    _hull = FleetColumn("hull")
+    _hull_damage = FleetColumn("hull_damage")
+    docked = FleetColumn("docked")
+    turn_repairing = FleetColumn("turn_repairing")
+    version = FleetColumn("version")
+    
     def __init__(self, 
         ship_class:ShipClass, 
         ai_cls: Type[BaseAi],
@@ -55,6 +93,10 @@ class Starship(CanDockWith):
         
         self.ship_class:ShipClass = ship_class
         
+        self.version = 0
+        """This goes up by one every time the hull, crew, cloak, warp factor or the integrety of a system changes. Values that depend on these, such as hull_percentage, are kept until it changes (see versioned_property).
+        """
+        
         self.name = name if name else self.ship_class.create_name()
         
         self.proper_name = (
@@ -74,22 +116,28 @@ class Starship(CanDockWith):
         self.scanner = Scanner()
         self.scanner.starship = self
         
-        if ship_class.polarized_hull:
+        capabilities = ship_class.capabilities
+        
+        self.capabilities:ShipCapability = capabilities
+        """The optional systems that this ship has. Check this instead of catching AttributeError when a system might be missing.
+        """
+
+        if capabilities & ShipCapability.POLARIZED_HULL:
             
             self.polarized_hull = PolarizedHull(ship_class)
             self.polarized_hull.starship = self
         
-        if ship_class.max_shields:#if has shields
+        if capabilities & ShipCapability.SHIELDS:#if has shields
             
             self.shield_generator = Shields(ship_class)
             self.shield_generator.starship = self
         
-        if ship_class.ship_type_can_fire_torps:#if has torpedos
+        if capabilities & ShipCapability.TORPEDOS:#if has torpedos
             
             self.torpedo_launcher = TorpedoLauncher(ship_class)
             self.torpedo_launcher.starship = self
 
-        if ship_class.max_crew:#if has crew
+        if capabilities & ShipCapability.CREW:#if has crew
             
             self.life_support = LifeSupport(ship_class)
             self.life_support.starship = self
@@ -97,29 +145,40 @@ class Starship(CanDockWith):
             self.transporter = Transporter()
             self.transporter.starship = self
         
-        if ship_class.cloak_strength:#if can cloak
+        if capabilities & ShipCapability.CLOAK:#if can cloak
             
             self.cloak = Cloak()
             self.cloak.starship = self
 
-        if ship_class.max_beam_energy:
+        if capabilities & ShipCapability.BEAM_ARRAY:
             
             self.beam_array = BeamArray(ship_class)
             self.beam_array.starship = self
         
-        if ship_class.max_cannon_energy:
+        if capabilities & ShipCapability.CANNONS:
             
             self.cannons = Cannon(ship_class)
             self.cannons.starship = self
         
-        if ship_class.evasion:
+        if capabilities & ShipCapability.IMPULSE:
             
             self.impulse_engine = ImpulseEngine()
             self.impulse_engine.starship = self
         
-        if ship_class.max_warp:
+        if capabilities & ShipCapability.WARP_DRIVE:
             self.warp_drive = WarpDrive()
             self.warp_drive.starship = self
+        
+        self.scanned_systems = tuple(
+            (scan_key, getattr(self, name)) for name, scan_key, capability in SHIP_SYSTEMS 
+            if capability is None or capabilities & capability
+        )
+        """The key and system for each of the systems that this ship has, in the order that they are scanned.
+        """
+        self.repaired_systems = tuple(getattr(self, name) for name in REPAIRED_SYSTEMS if hasattr(self, name))
+        self.energy_using_systems = tuple(getattr(self, name) for name in ENERGY_USING_SYSTEMS if hasattr(self, name))
+        
+        self._ship_status = self.compute_ship_status()
 
         self.override_nation = override_nation
         
@@ -129,6 +188,19 @@ class Starship(CanDockWith):
 
         self.turn_repairing = 0
         
+        # this is set by GameData when the ship is added to total_starships, and is what SubSector.occupancy stores
+        self.ship_id = 0
+        
+        # scans are cached until the ship changes or the turn ends, so that many ships looking at this one during 
+        # the same turn will all get the same scan
+        self.scan_cache:Dict[Tuple, frozendict] = {}
+        
+        self.rng = np.random.default_rng()
+        """The ship's own random number generator. It is used for the damage, to hit rolls and repairs of this ship. GameData replaces this with one that is seeded from the seed of the game and the ship_id, so that the same game always plays out the same way, no matter what order the ships decide in.
+        """
+        self.decision_rng = np.random.default_rng()
+        """Used by the AI when it picks an order and runs its simulations. This is kept apart from rng so that a replay can carry out the recorded orders without running the AI, and still get the same rolls from rng.
+        """
         self.ai: Optional[BaseAi] = ai_cls(entity=self)
     
     @property
@@ -143,6 +215,14 @@ class Starship(CanDockWith):
             self.override_nation = value
         else:
             self.override_nation = None
+        try:
+            event_bus = self.game_data.event_bus
+        except AttributeError:
+            # the ship has not been added to the game yet
+            return
+        
+        # the ship has changed sides, so the lists of friendly and hostile ships are out of date
+        event_bus.publish(ShipChangedNation(self.sector_coords.create_coords(), self))
     
     @property
     def ship_is_captured(self):
@@ -157,6 +237,7 @@ class Starship(CanDockWith):
         self._hull_damage = value
         if self._hull_damage < 0.0:
             self._hull_damage = 0.0
+        self.version += 1
     
     @property
     def get_max_hull(self):
@@ -171,8 +252,10 @@ class Starship(CanDockWith):
         self._hull = round(value)
         if self._hull > self.get_max_hull:
             self._hull = self.get_max_hull
-
-    @property
+        self.version += 1
+        self.update_ship_status()
+    
+    @versioned_property
     def hull_percentage(self):
         try:
             return self.hull / self.ship_class.max_hull
@@ -222,31 +305,21 @@ class Starship(CanDockWith):
         
         total = (self.hull / self.ship_class.max_hull) * 2
         divisor = 1
-        try:
+        if self.capabilities & ShipCapability.CREW:
             total += self.life_support.crew_readyness
             divisor += 1
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.BEAM_ARRAY:
             total += self.beam_array.get_max_effective_beam_firepower
             divisor += 1
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.CANNONS:
             total += self.cannons.get_max_effective_cannon_firepower
             divisor += 1
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.SHIELDS:
             total += self.shield_generator.get_max_effective_shields
             divisor += 1
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.TORPEDOS:
             total += self.torpedo_launcher.get_effective_value
             divisor += 1
-        except AttributeError:
-            pass
         
         return total / divisor
 
@@ -257,27 +330,27 @@ class Starship(CanDockWith):
 
         hull_value = hull * self.hull_percentage
         
-        try:
+        if self.capabilities & ShipCapability.SHIELDS:
             shields_value = shields * self.shield_generator.get_effective_value
-        except AttributeError:
+        else:
             shields_value = 0
             
         energy_value = energy * self.power_generator.get_effective_value
-        try:
+        if self.capabilities & ShipCapability.CREW:
             crew_value = crew * self.life_support.crew_readyness
-        except AttributeError:
+        else:
             crew_value = 1
-        try:
+        if self.capabilities & ShipCapability.BEAM_ARRAY:
             beam_energy_value = beam_energy * self.beam_array.get_effective_value
-        except AttributeError:
+        else:
             beam_energy_value = 0
-        try:
+        if self.capabilities & ShipCapability.CANNONS:
             cannon_energy_value = cannon_energy * self.cannons.get_effective_value
-        except AttributeError:
+        else:
             cannon_energy_value = 0
-        try:
+        if self.capabilities & ShipCapability.TORPEDOS:
             torpedo_value_value = torpedo_value * self.torpedo_launcher.get_effective_value
-        except AttributeError:
+        else:
             torpedo_value_value = 0
         return (
             hull_value + shields_value + energy_value + crew_value + 
@@ -288,6 +361,73 @@ class Starship(CanDockWith):
     def get_ship_value(self):
         return (self.hull + self.ship_class.max_hull) * 0.5 if self.ship_status.is_active else 0.0
 
+    @versioned_property
+    def stragic_value(self):
+        """The value of the ship as it is now, before any of the multipliers in calculate_ship_stragic_value are applied. This depends on the hull, crew and the integrety of the systems, so it is kept until the ship's version changes.
+        """
+        hull, shields, polarize, energy, power_generated_per_turn, max_warp, crew, beam_energy, cannon_energy, torpedo_value, detect, cloak, engine, targeting, scan_range = self.ship_class.get_stragic_values
+        
+        hull_value = hull * self.hull_percentage
+        if self.capabilities & ShipCapability.SHIELDS:
+            shields_value = shields * self.shield_generator.get_effective_value
+        else:
+            shields_value = 0
+        if self.capabilities & ShipCapability.POLARIZED_HULL:
+            polarise_value = polarize * self.polarized_hull.get_effective_value
+        else:
+            polarise_value = 0
+        
+        energy_value = energy * self.power_generator.get_effective_value
+        
+        power_generation_value = power_generated_per_turn * self.power_generator.get_effective_value
+        if self.capabilities & ShipCapability.CREW:
+            crew_value = crew * self.life_support.crew_readyness
+        else:
+            crew_value = 0
+        if self.capabilities & ShipCapability.IMPULSE:
+            dodge_value = engine * self.impulse_engine.get_effective_value
+        else:
+            dodge_value = 0
+        if self.capabilities & ShipCapability.WARP_DRIVE:
+            warp_value = max_warp * self.warp_drive.get_effective_value
+        else:
+            warp_value = 0
+        if self.capabilities & ShipCapability.BEAM_ARRAY:
+            weapon_energy_value = beam_energy * self.beam_array.get_effective_value if beam_energy else 0
+        else:
+            weapon_energy_value = 0
+        if self.capabilities & ShipCapability.CANNONS:
+            cannon_energy_value = cannon_energy * self.cannons.get_effective_value if cannon_energy else 0
+        else:
+            cannon_energy_value = 0
+        if self.capabilities & ShipCapability.TORPEDOS:
+            torpedo_value_value = torpedo_value * self.torpedo_launcher.get_effective_value if torpedo_value else 0
+        else:
+            torpedo_value_value = 0
+        if self.capabilities & ShipCapability.CREW:
+            transporter_value = self.transporter.get_effective_value
+        else:
+            transporter_value = 0
+        if self.capabilities & ShipCapability.CLOAK:
+            cloak_value = cloak * self.cloak.get_effective_value
+        else:
+            cloak_value = 0
+        
+        scan_value = scan_range * self.scanner.get_effective_value
+        
+        detect_value = detect * self.sensors.get_effective_value
+        
+        targeting = self.sensors.get_effective_value * targeting if any(
+            (weapon_energy_value, cannon_energy_value, torpedo_value_value)
+        ) else 0
+        
+        return (
+            hull_value + shields_value + polarise_value + energy_value + power_generation_value + 
+            crew_value + weapon_energy_value + cannon_energy_value + torpedo_value_value + targeting + 
+            dodge_value + transporter_value + 
+            warp_value + scan_value + cloak_value + detect_value
+        )
+    
     def calculate_ship_stragic_value(
         self, 
         *, 
@@ -296,89 +436,12 @@ class Starship(CanDockWith):
         value_multiplier_for_active:float=1.0
     ):
         """Calculates to point value of the ship and returns a tuple containing the maximum possible value, and the acutal value.
-
+        
         Args:
             value_multiplier_for_destroyed (float, optional): How much the value of destroyed ships should be multiplied by. Defaults to 0.0.
             value_multiplier_for_derlict (float, optional): How much the value of derlict ships should be multiplied by. Defaults to 0.0.
             value_multiplier_for_active (float, optional): How much the value of active ships should be multiplied by. Defaults to 1.0.
         """
-        
-        def calculate_value(
-            *,
-            hull:float, shields:float, polarize:float, energy:float, power_generated_per_turn:float, max_warp:float,
-            crew:int, engine:float, cloak:float, detect:float, scan_range:float, targeting:float,
-            beam_energy:int, cannon_energy:int, torpedo_value:int, multiplier_value:float
-        ):
-            if multiplier_value == 0.0:
-                return 0.0
-            
-            hull_value = hull * self.hull_percentage
-            try:
-                shields_value = shields * self.shield_generator.get_effective_value
-            except AttributeError:
-                shields_value = 0
-            try:
-                polarise_value = polarize * self.polarized_hull.get_effective_value
-            except AttributeError:
-                polarise_value = 0
-            
-            energy_value = energy * self.power_generator.get_effective_value
-            
-            power_generation_value = power_generated_per_turn * self.power_generator.get_effective_value
-            try:
-                crew_value = crew * self.life_support.crew_readyness
-            except AttributeError:
-                crew_value = 0
-            try:
-                dodge_value = engine * self.impulse_engine.get_effective_value
-            except AttributeError:
-                dodge_value = 0
-            try:
-                warp_value = max_warp * self.warp_drive.get_effective_value
-            except AttributeError:
-                warp_value = 0
-            try:
-                weapon_energy_value = beam_energy * self.beam_array.get_effective_value if beam_energy else 0
-            except AttributeError:
-                weapon_energy_value = 0
-            try:
-                cannon_energy_value = cannon_energy * self.cannons.get_effective_value if cannon_energy else 0
-            except AttributeError:
-                cannon_energy_value = 0
-            try:
-                torpedo_value_value = torpedo_value * self.torpedo_launcher.get_effective_value if torpedo_value else 0
-            except AttributeError:
-                torpedo_value_value = 0
-            try:
-                transporter_value = self.transporter.get_effective_value
-            except AttributeError:
-                transporter_value = 0
-            try:
-                cloak_value = cloak * self.cloak.get_effective_value
-            except AttributeError:
-                cloak_value = 0
-            
-            scan_value = scan_range * self.scanner.get_effective_value
-            
-            detect_value = detect * self.sensors.get_effective_value
-            
-            targeting = self.sensors.get_effective_value * targeting if any(
-                (weapon_energy_value, cannon_energy_value, torpedo_value_value)
-            ) else 0
-            
-            return (
-                hull_value + shields_value + polarise_value + energy_value + power_generation_value + 
-                crew_value + weapon_energy_value + cannon_energy_value + torpedo_value_value + targeting + 
-                dodge_value + transporter_value + 
-                warp_value + scan_value + cloak_value + detect_value
-            ) * multiplier_value
-        
-        hull, shields, polarized_hull, energy, power_generated_per_turn, max_warp, crew, beam_energy, cannon_energy, torpedo_value, detection_strength, cloaking, evasion, targeting, scanner_range = self.ship_class.get_stragic_values
-        
-        max_possible_value = sum(
-            (hull, shields, energy, crew, beam_energy, cannon_energy, torpedo_value, 1), 
-            start= 0.0
-        )
         ship_status = self.ship_status
         
         value_used_in_calculation = (
@@ -386,15 +449,10 @@ class Starship(CanDockWith):
                 value_multiplier_for_derlict if ship_status.is_recrewable else value_multiplier_for_active
             )
         )
-        value_to_be_returned = calculate_value(
-            hull=hull, shields=shields, polarize=polarized_hull, 
-            energy=energy, power_generated_per_turn=power_generated_per_turn, max_warp=max_warp,
-            crew=crew, cloak=cloaking, detect=detection_strength, scan_range=scanner_range, targeting=targeting,
-            beam_energy=beam_energy, cannon_energy=cannon_energy, torpedo_value=torpedo_value, engine=evasion,
-            multiplier_value=value_used_in_calculation
-        )
-        return max_possible_value, value_to_be_returned
+        value_to_be_returned = self.stragic_value * value_used_in_calculation if value_used_in_calculation != 0.0 else 0.0
         
+        return self.ship_class.max_stragic_value, value_to_be_returned
+
     def scan_for_print(self, precision: int=1):
         
         if isinstance(precision, float):
@@ -404,6 +462,12 @@ class Starship(CanDockWith):
                 f"The intiger 'precision' MUST be one of the following: 1, 2, 5, 10, 15, 20, 25, 50, 100, 200, or 500. It's actually value is {precision}."
             )
 
+        key = ("print", precision)
+        try:
+            return self.scan_cache[key]
+        except KeyError:
+            pass
+
         def print_color(amount:float, base:float, inverse:bool=False):
             a = amount / base
             
@@ -439,97 +503,54 @@ class Starship(CanDockWith):
             "hull" : (hull, print_color(hull, ship_class.max_hull)),
             "energy" : (energy, print_color(energy, ship_class.max_energy))
         }
-        try:
+        if self.capabilities & ShipCapability.SHIELDS:
             shields = scan_assistant(self.shield_generator.read_shields, precision)
             d["shields"] = (shields, print_color(shields, ship_class.max_shields))
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.POLARIZED_HULL:
             hull_polarization = scan_assistant(self.polarized_hull.read_polarization, precision)
             d["polarization"] = (hull_polarization, colors.white)
-        except AttributeError:
-            pass
         if hull_damage:
             d["hull_damage"] = hull_damage, print_color(hull_damage, ship_class.max_hull)
-        try:
+        if self.capabilities & ShipCapability.TORPEDOS:
             total_torps = tuple(self.torpedo_launcher.get_number_of_torpedos(precision))
             
             all_torps = sum([v for k,v in total_torps])
             
             d["number_of_torps"] = tuple(self.torpedo_launcher.get_number_of_torpedos(precision))
             d["torpedo_color"] = colors.white if all_torps == self.ship_class.max_torpedos else colors.planet_hostile
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.CREW:
             able_crew = scan_assistant(self.life_support.able_crew, precision)
             injured_crew = scan_assistant(self.life_support.injured_crew, precision)
             d["able_crew"] = (able_crew, print_color(able_crew, ship_class.max_crew))
             if injured_crew:
                 d["injured_crew"] = (injured_crew, print_color(injured_crew, ship_class.max_crew, True))
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.CLOAK:
             d["cloak_cooldown"] = (
                 self.cloak.cloak_cooldown, print_color(self.cloak.cloak_cooldown, ship_class.cloak_cooldown, True)
             )
-        except AttributeError:
-            pass
-        try:
-            if self.life_support.has_boarders:
-                d["boarders"] = tuple(self.life_support.get_boarding_parties(self.nation, precision))
-        except AttributeError:
-            pass
-        try:
-            d["sys_impulse"] = self.impulse_engine.print_info(precision), self.impulse_engine.get_color(), self.impulse_engine.name
-        except AttributeError:
-            pass
-        try:
-            d["sys_warp_drive"] = self.warp_drive.print_info(precision), self.warp_drive.get_color(), self.warp_drive.name
-        except AttributeError:
-            pass
-        try:
-            d["sys_beam_array"] = self.beam_array.print_info(precision), self.beam_array.get_color(), self.beam_array.name
-        except AttributeError:
-            pass
-        try:
-            d["sys_cannon_weapon"] = self.cannons.print_info(precision), self.cannons.get_color(), self.cannons.name
-        except AttributeError:
-            pass
-        try:
-            d["sys_polarize"] = self.polarized_hull.print_info(precision), self.polarized_hull.get_color(), self.polarized_hull.name
-        except AttributeError:
-            pass
-        try:
-            d["sys_shield"] = self.shield_generator.print_info(precision), self.shield_generator.get_color(), self.shield_generator.name
-        except AttributeError:
-            pass
-        d["sys_sensors"] = self.sensors.print_info(precision), self.sensors.get_color(), self.sensors.name
-        d["sys_scanners"] = self.scanner.print_info(precision), self.scanner.get_color(), self.scanner.name
-        try:
-            d["sys_torpedos"] = self.torpedo_launcher.print_info(precision), self.torpedo_launcher.get_color(), self.torpedo_launcher.name
-        except AttributeError:
-            pass
-        try:
-            d["sys_cloak"] = self.cloak.print_info(precision), self.cloak.get_color(), self.cloak.name
-        except AttributeError:
-            pass
-        try:
-            d["sys_transporter"] = self.transporter.print_info(precision), self.transporter.get_color(), self.transporter.name
-        except AttributeError:
-            pass
-        d["sys_warp_core"] = self.power_generator.print_info(precision), self.power_generator.get_color(), self.power_generator.name
-        try:
+        if self.capabilities & ShipCapability.CREW and self.life_support.has_boarders:
+            d["boarders"] = tuple(self.life_support.get_boarding_parties(self.nation, precision))
+        for scan_key, system in self.scanned_systems:
+            d[scan_key] = system.print_info(precision), system.get_color(), system.name
+        if self.capabilities & ShipCapability.TORPEDOS:
             torps = tuple(self.torpedo_launcher.get_number_of_torpedos(precision))
             for k, v in torps:
                 d[k] = v
-        except AttributeError:
-            pass
-        return d
+        scan = frozendict(d)
+        
+        self.scan_cache[key] = scan
+        
+        return scan
+    
+    def clear_scan_cache(self):
+        """Throws away any cached scans of this ship. This should be called whenever something about the ship changes.
+        """
+        self.scan_cache.clear()
     
     def scan_this_ship(
         self, precision: int=1, *, scan_for_crew:bool=True, scan_for_systems:bool=True, use_effective_values=False
-    )->Dict[str,Union[int,Tuple,ShipStatus,ShipClass]]:
-        """Scans the ship based on the precision value.
+    )->Mapping[str,Union[int,Tuple,ShipStatus,ShipClass]]:
+        """Scans the ship based on the precision value. The scan is cached until clear_scan_cache is called, so the same scan will be returned to every ship that looks at this one during the turn.
 
         Args:
             precision (int, optional): Used to see how precise the scan wiil be. lower values are better. Defaults to 1.
@@ -541,7 +562,7 @@ class Starship(CanDockWith):
             ValueError: if precision is not in the following
 
         Returns:
-            Dict[str,Union[int,Tuple,ShipStatus]]: A dictionary containing enteries for the ships hull, shield, energy, torpedos, 
+            Mapping[str,Union[int,Tuple,ShipStatus]]: A frozendict containing enteries for the ships hull, shield, energy, torpedos, 
         """
 
         if isinstance(precision, float):
@@ -550,6 +571,12 @@ class Starship(CanDockWith):
             raise ValueError(
                 f"The intiger 'precision' MUST be one of the following: 1, 2, 5, 10, 15, 20, 25, 50, 100, 200, or 500. It's actually value is {precision}."
             )
+        key = (precision, scan_for_crew, scan_for_systems)
+        try:
+            return self.scan_cache[key]
+        except KeyError:
+            pass
+        
         hull = scan_assistant(self.hull, precision)
         
         status = STATUS_ACTIVE if hull > 0 else (
@@ -560,20 +587,14 @@ class Starship(CanDockWith):
             "energy" : scan_assistant(self.power_generator.energy, precision),
             "class" : self.ship_class
         }
-        try:
+        if self.capabilities & ShipCapability.SHIELDS:
             d["shields"] = scan_assistant(self.shield_generator.shields, precision)
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.POLARIZED_HULL:
             d["polarization"] = scan_assistant(self.polarized_hull.polarization_amount, precision)
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.TORPEDOS:
             d["number_of_torps"] = tuple(self.torpedo_launcher.get_number_of_torpedos(precision))
-        except AttributeError:
-            pass
         if scan_for_crew:
-            try:
+            if self.capabilities & ShipCapability.CREW:
                 able_crew = scan_assistant(self.life_support.able_crew, precision)
                 injured_crew = scan_assistant(self.life_support.injured_crew, precision)
                 d["able_crew"] = able_crew
@@ -581,63 +602,24 @@ class Starship(CanDockWith):
                 
                 if status is STATUS_ACTIVE and not self.ship_class.is_automated and able_crew + injured_crew <= 0:
                     status = STATUS_DERLICT
-            except AttributeError:
-                pass
 
-        try:
+        if self.capabilities & ShipCapability.CLOAK:
             d["cloak_cooldown"] = self.cloak.cloak_cooldown
-        except AttributeError:
-            pass
 
         if scan_for_systems:
-            try:
-                d["sys_warp_drive"] = self.warp_drive.get_info(precision)
-            except AttributeError:
-                pass
-            try:
-                d["sys_impulse"] = self.impulse_engine.get_info(precision)
-            except AttributeError:
-                pass
-            try:
-                d["sys_beam_array"] = self.beam_array.get_info(precision)
-            except AttributeError:
-                pass
-            try:
-                d["sys_cannon_weapon"] = self.cannons.get_info(precision)
-            except AttributeError:
-                pass
-            try:
-                d["sys_polarize"] = self.polarized_hull.get_info(precision)
-            except AttributeError:
-                pass
-            try:
-                d["sys_shield"] = self.shield_generator.get_info(precision)
-            except AttributeError:
-                pass
-            d["sys_sensors"] = self.sensors.get_info(precision)
-            d["sys_scanners"] = self.scanner.get_info(precision)
-            try:
-                d["sys_torpedos"] = self.torpedo_launcher.get_info(precision)
-            except AttributeError:
-                pass
-            try:
-                d["sys_cloak"] = self.cloak.get_info(precision)
-            except AttributeError:
-                pass
-            try:
-                d["sys_transporter"] = self.transporter.get_info(precision)
-            except AttributeError:
-                pass
-            d["sys_warp_core"] = self.power_generator.get_info(precision)
+            for scan_key, system in self.scanned_systems:
+                d[scan_key] = system.get_info(precision)
             
         d["status"] = status
-        try:
+        if self.capabilities & ShipCapability.TORPEDOS:
             torps = tuple(self.torpedo_launcher.get_number_of_torpedos(precision))
             for k, v in torps:
                 d[k] = v
-        except AttributeError:
-            pass
-        return d
+        scan = frozendict(d)
+        
+        self.scan_cache[key] = scan
+        
+        return scan
 
     def get_random_ajacent_empty_coord(self):
         
@@ -647,7 +629,7 @@ class Starship(CanDockWith):
         
         a2 = [a_ for a_ in star_system.safe_spots if a_.is_ajacent(self.local_coords) and a_ not in ships]
         
-        return choice(a2)
+        return a2[self.rng.integers(len(a2))]
 
     def destroy(self, cause:str, *, warp_core_breach:bool=False, self_destruct:bool=False):
         """Destroys the ship. I hope this wasn't you!
@@ -664,57 +646,37 @@ class Starship(CanDockWith):
 
         if self.is_controllable:
             self.game_data.cause_of_damage = cause
-        try:
+        if self.capabilities & ShipCapability.CREW:
             self.life_support.able_crew = 0
             self.life_support.injured_crew = 0
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.TORPEDOS:
             for k in self.torpedo_launcher.torps.keys():
                 self.torpedo_launcher.torps[k] = 0
             self.torpedo_launcher.integrety = 0.0
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.SHIELDS:
             self.shield_generator.shields = 0
             self.shield_generator.shields_up = False
             self.shield_generator.integrety = 0.0
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.POLARIZED_HULL:
             self.polarized_hull.polarization_amount = 0
             self.polarized_hull.is_polarized = False
             self.polarized_hull.integrety = 0.0
-        except AttributeError:
-            pass
         self.power_generator.energy = 0
         self.power_generator.integrety = 0
-        try:
+        if self.capabilities & ShipCapability.WARP_DRIVE:
             self.warp_drive.integrety = 0.0
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.BEAM_ARRAY:
             self.beam_array.integrety = 0.0
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.CANNONS:
             self.cannons.integrety = 0.0
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.IMPULSE:
             self.impulse_engine.integrety = 0.0
-        except AttributeError:
-            pass
         self.sensors.integrety = 0.0
-        try:
+        if self.capabilities & ShipCapability.CLOAK:
             self.cloak.cloak_status = CloakStatus.INACTIVE
             self.cloak.integrety = 0.0
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.CREW:
             self.transporter.integrety = 0.0
-        except AttributeError:
-            pass
 
         if is_controllable:
             gd.engine.message_log.print_messages = False
@@ -723,11 +685,8 @@ class Starship(CanDockWith):
         
             self.warp_core_breach(self_destruct)
             self.hull = -self.ship_class.max_hull
-                
-        if self is self.game_data.selected_ship_planet_or_star:
-            self.game_data.selected_ship_planet_or_star = None
         
-        self.get_sub_sector.destroy_ship(self)
+        gd.event_bus.publish(ShipDestroyed(self.sector_coords.create_coords(), self, cause))
         
     def warp_core_breach(self, self_destruct=False):
 
@@ -764,7 +723,7 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
 
     def simulate_self_destruct(
         self, target:Starship, *, scan:Optional[Dict]=None, number_of_simulations:int=1, 
-        simulate_systems:bool=False, simulate_crew:bool=False
+        simulate_systems:bool=False, simulate_crew:bool=False, use_estimate:bool=False
         ):
         """Calculates the damage that this ship would inflict on the target if it were auto-destructed.
 
@@ -774,6 +733,7 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
             number_of_simulations (int, optional): How many times the simulation will be preformed. Defaults to 1.
             simulate_systems (bool, optional): If true, damage to the systems will be taken into account. Defaults to False.
             simulate_crew (bool, optional): If True, crew fatalities and injuries will be taken into account. Defaults to False.
+            use_estimate (bool, optional): If True, the expected result will be worked out directly instead of being simulated. Defaults to False.
 
         Returns:
             Tuple[float, float, float, float, float, float]: A tuple containing floats
@@ -786,44 +746,47 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         )
         amount = self.warp_core_breach_damage_based_on_distance(target)
         
-        averaged_shield = 0
-        averaged_hull = 0
-        averaged_shield_damage = 0
-        averaged_hull_damage = 0
-        averaged_crew_readyness = 0
-        
-        scan_target_crew = not target.ship_class.is_automated and simulate_crew
-                
-        for i in range(number_of_simulations):
-        
-            new_shields, new_hull, shields_dam, hull_dam, new_shields_as_a_percent, new_hull_as_a_percent, killed_outright, killed_in_sickbay, wounded, shield_sys_damage, impulse_sys_damage, warp_drive_sys_damage, sensors_sys_damage, warp_core_sys_damage, energy_weapons_sys_damage, cannon_sys_damage,             torpedo_sys_damage, cloak_sys_damage, transporter_sys_damage, polarized_hull_damage, scanners_damage = self.calculate_damage(
-                amount, scan_dict=scan, precision=precision, calculate_crew=simulate_crew, 
-                calculate_systems=simulate_systems, damage_type=DAMAGE_EXPLOSION
+        if use_estimate:
+            return estimate_self_destruct(
+                target, amount, scan, precision=precision, 
+                simulate_systems=simulate_systems, simulate_crew=simulate_crew
             )
-            averaged_shield += new_shields
-            averaged_hull += new_hull
-            averaged_shield_damage += shields_dam
-            averaged_hull_damage += hull_dam
-            
-            if scan_target_crew:
-                
-                averaged_crew_readyness += target.life_support.caluclate_crew_readyness(
-                    scan["able_crew"], scan["injured_crew"]
-                )
-        averaged_shield /= number_of_simulations
-        averaged_hull /= number_of_simulations
-        averaged_shield_damage /= number_of_simulations
-        averaged_hull_damage /= number_of_simulations
-        
-        if scan_target_crew:
-            averaged_crew_readyness /= number_of_simulations
-        else:
-            averaged_crew_readyness = 1.0
-                
-        return averaged_shield, averaged_hull, averaged_shield_damage, averaged_hull_damage, averaged_hull <= 0, averaged_crew_readyness
+        return simulate_self_destruct_batch(
+            self, target, amount, number_of_simulations, scan, precision=precision, 
+            simulate_systems=simulate_systems, simulate_crew=simulate_crew,
+            rng=self.decision_rng
+        )
 
     @property
     def ship_status(self):
+        """The status of the ship. This is stored on the ship, and is only changed by update_ship_status.
+        
+        Returns:
+            ShipStatus: The status of the ship.
+        """
+        return self._ship_status
+    
+    def update_ship_status(self):
+        """Works out the status of the ship, and if it has changed, stores it and publishes a ShipStatusChanged event so that the sub sector and game data can move the ship to the right status in their indexes. This is called by the setters of the hull, the crew, the cloak and the warp factor, so take_damage, destroy, crew loss, cloaking, decloaking, going to and dropping out of warp, and boarding all go through here.
+        
+        Returns:
+            bool: True if the status changed.
+        """
+        old_status = self._ship_status
+        new_status = self.compute_ship_status()
+        
+        if new_status == old_status:
+            return False
+        
+        self._ship_status = new_status
+        
+        self.game_data.event_bus.publish(
+            ShipStatusChanged(self.sector_coords.create_coords(), self, old_status, new_status)
+        )
+        
+        return True
+    
+    def compute_ship_status(self):
         """Checks if the ship is relitivly intact. 
         
         If a ship is destroyed but intact ship, then it is a ruined hulk, like the ones we saw in aftermath of the battle of Wolf 389. 
@@ -833,25 +796,16 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         Returns:
             bool: Returns True if the hull is greater then or equal to half the negitive max hit points, and less then or equal to zero.
         """
-        try:
-            if self.warp_drive.is_at_warp:
-                return STATUS_AT_WARP
-        except AttributeError:
-            pass
+        if self.capabilities & ShipCapability.WARP_DRIVE and self.warp_drive.is_at_warp:
+            return STATUS_AT_WARP
         if self.hull < self.ship_class.max_hull * -0.5:
             return STATUS_OBLITERATED
         if self.hull <= 0:
             return STATUS_HULK
-        try:            
-            if self.life_support.is_derlict:
-                return STATUS_DERLICT
-        except AttributeError:
-            pass
-        try:
-            if self.cloak.cloak_is_turned_on:
-                return STATUS_CLOAKED if self.cloak.cloak_status == CloakStatus.ACTIVE else STATUS_CLOAK_COMPRIMISED
-        except AttributeError:
-            pass
+        if self.capabilities & ShipCapability.CREW and self.life_support.is_derlict:
+            return STATUS_DERLICT
+        if self.capabilities & ShipCapability.CLOAK and self.cloak.cloak_is_turned_on:
+            return STATUS_CLOAKED if self.cloak.cloak_status == CloakStatus.ACTIVE else STATUS_CLOAK_COMPRIMISED
         return STATUS_ACTIVE
             
     def ram(self, other_ship:Starship, intentional_ram_attempt:bool):
@@ -866,32 +820,22 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         self_status = self.ship_status
         other_status = other_ship.ship_status
         
-        try:
+        if self.capabilities & ShipCapability.SHIELDS:
             self_hp = (self.shield_generator.shields if self_status.do_shields_work else 0) + self.hull
-        except AttributeError:
+        else:
             self_hp = self.hull
-        try:
+        if other_ship.capabilities & ShipCapability.SHIELDS:
             other_hp = (other_ship.shield_generator.shields if other_status.do_shields_work else 0) + other_ship.hull
-        except AttributeError:
+        else:
             other_hp = other_ship.hull
         
         self_damage = self_hp + self.ship_class.max_hull * 0.5
         #other_damage = other_hp + other_ship.ship_class.max_hull * 0.5
-        try:
-            crew_readyness = self.life_support.crew_readyness
-        except AttributeError:
-            crew_readyness = 1
-        try:
-            target_crew_readyness = other_ship.life_support.crew_readyness
-        except AttributeError:
-            target_crew_readyness = 1
-
+        
         hit_roll = self.roll_to_hit(
             other_ship, 
-            systems_used_for_accuray=[self.impulse_engine.get_effective_value, self.ship_class.evasion],
             damage_type=DAMAGE_RAMMING,
-            crew_readyness=crew_readyness,
-            target_crew_readyness=target_crew_readyness
+            **self.get_to_hit_arguments(other_ship, DAMAGE_RAMMING)
         )
         if hit_roll:
 
@@ -919,10 +863,9 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
                 spot for spot in self.get_sub_sector.safe_spots if other_ship.local_coords.is_adjacent(other=spot) and
                 spot not in bad_spots
             ]
-            spot = choice(safe_spots)
+            spot = safe_spots[self.rng.integers(len(safe_spots))]
             
-            self.local_coords.x = spot.x
-            self.local_coords.y = spot.y
+            self.get_sub_sector.move_ship(self, spot.x, spot.y)
 
         return hit_roll
 
@@ -961,7 +904,7 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         random_varation = damage_type.damage_variation
         
         if random_varation > 0.0:
-            amount = round(amount * uniform(1.0 - random_varation, 1.0))
+            amount = round(amount * self.rng.uniform(1.0 - random_varation, 1.0))
         
         old_scan = scan_dict if scan_dict else self.scan_this_ship(
             precision, scan_for_crew=calculate_crew, 
@@ -1051,17 +994,17 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         
         if calculate_crew and not is_derlict and not is_hulk:
             
-            crew_killed = hull_dam > 0 and new_hull_as_a_percent < random() and not self.ship_class.is_automated
+            crew_killed = hull_dam > 0 and new_hull_as_a_percent < self.rng.random() and not self.ship_class.is_automated
             
             if crew_killed:
                 able_crew = old_scan["able_crew"]
                 injured_crew = old_scan["injured_crew"]
                 
-                percentage_of_crew_killed = hull_damage_as_a_percent * random()
+                percentage_of_crew_killed = hull_damage_as_a_percent * self.rng.random()
                 
                 total_crew = able_crew + injured_crew
                 
-                wounded_fac = uniform(0.25, 0.75)
+                wounded_fac = self.rng.uniform(0.25, 0.75)
                 
                 _able_crew_percentage = able_crew / total_crew
                 
@@ -1089,7 +1032,7 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         if calculate_systems and not is_hulk:
             chance_to_damage_system = damage_type.chance_to_damage_system
             
-            systems_damaged = hull_dam > 0 and new_hull_as_a_percent < uniform(
+            systems_damaged = hull_dam > 0 and new_hull_as_a_percent < self.rng.uniform(
                 hull_damage_as_a_percent, 1.25 + hull_damage_as_a_percent)
             
             if systems_damaged:
@@ -1097,12 +1040,12 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
                 
                 def chance_of_system_damage():
                     # this is cumbersome. A better way may be random() * chance_to_damage_system > (old_hull_as_a_percent + new_hull_as_a_percent) * 0.5
-                    return uniform(
+                    return self.rng.uniform(
                         hull_damage_as_a_percent, chance_to_damage_system + hull_damage_as_a_percent
                         ) > new_hull_as_a_percent
                 
                 def random_system_damage():
-                    return uniform(0.0, system_damage_chance * hull_damage_as_a_percent)
+                    return self.rng.uniform(0.0, system_damage_chance * hull_damage_as_a_percent)
                 
                 if self.ship_class.max_shields and chance_of_system_damage():
                     shield_sys_damage = random_system_damage()
@@ -1149,6 +1092,145 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
             torpedo_sys_damage, cloak_sys_damage, transporter_sys_damage, polarized_hull_damage, scanners_damage
         )
 
+    def estimate_damage(
+        self, amount:int, *, 
+        scan_dict:Optional[Dict]=None, 
+        precision:int=1, 
+        calculate_systems:bool=True,  
+        damage_type:DamageType,
+        use_effective_values:bool=True
+    ):
+        """Works out the expected result of damage inflicted on this ship without rolling any dice. This follows the same rules as calculate_damage, except that the rounding is left out, and so are crew casulties and system damage.
+
+        Args:
+            amount (int): The amount of damage
+            damage_type (DamageType): The type of damage
+            scan_dict (Optional[Dict], optional): A dictionary containing values. Defaults to None.
+            precision (int, optional): This is only used if scan_dict is None. Defaults to 1.
+            calculate_systems (bool, optional): If true, the integrety of the shield generator and polarized hull will be taken into account. Defaults to True.
+            use_effective_values (bool, optional): If true, system integrety will be ajusted with ajust_system_integrity. Defaults to True.
+
+        Returns:
+            Tuple[float, float, float, float, float]: A tuple containing the expected new_shields, new_hull, shields_dam, hull_dam, and the chance that the ship will be destroyed
+        """
+        old_scan = scan_dict if scan_dict else self.scan_this_ship(
+            precision, scan_for_crew=False, 
+            scan_for_systems=calculate_systems, 
+            use_effective_values=use_effective_values
+        )
+        try:
+            current_shields:int = old_scan["shields"]
+        except KeyError:
+            current_shields = 0
+        try:
+            polarization:int = old_scan["polarization"]
+            
+            if calculate_systems:
+                
+                polarization = round(polarization * (
+                    ajust_system_integrity(
+                        old_scan["sys_polarize"]
+                    ) if use_effective_values else old_scan["sys_polarize"]
+                ))
+        except KeyError:
+            polarization = 0
+        current_hull:int = old_scan["hull"]
+        
+        if current_hull <= 0:
+            return current_shields, current_hull, 0.0, 0.0, 1.0
+        try:
+            shield_effectiveness = ajust_system_integrity(old_scan["sys_shield"]) if use_effective_values else old_scan["sys_shield"]
+        except KeyError:
+            shield_effectiveness = 1
+        if self.capabilities & ShipCapability.SHIELDS:
+            shields_up = self.shield_generator.shields_up
+        else:
+            shields_up = False
+        
+        shields_are_already_down = (
+            shield_effectiveness <= 0 or current_shields <= 0 or not self.ship_status.do_shields_work or 
+            not shields_up or not self.ship_class.max_shields
+        )
+        random_varation = damage_type.damage_variation
+        
+        lowest_damage = amount * (1.0 - random_varation) if random_varation > 0.0 else amount
+        highest_damage = amount
+        
+        # each part is the lowest and highest damage that it covers, and how the damage is divided between 
+        # the shields and the hull. Every part is a straight line, so the hull damage in each part is evenly 
+        # spread out, just like the damage itself
+        if shields_are_already_down:
+            
+            parts = [(lowest_damage, highest_damage, 0.0, 0.0, damage_type.damage_vs_no_shield_multiplier, 0.0)]
+        else:
+            bleedthru_factor = min(current_shields / self.ship_class.max_shields + 0.5, 1.0)
+            
+            shield_multi = bleedthru_factor * damage_type.damage_vs_shields_multiplier
+            hull_multi = damage_type.damage_vs_hull_multiplier
+            
+            # the amount of damage at which the shields are knocked out
+            try:
+                shields_down_at = current_shields / shield_multi
+            except ZeroDivisionError:
+                shields_down_at = highest_damage
+            
+            parts = [
+                (lowest_damage, min(highest_damage, shields_down_at), shield_multi, 0.0, (1 - bleedthru_factor) * hull_multi, 0.0),
+                (
+                    max(lowest_damage, shields_down_at), highest_damage, 0.0, current_shields, 
+                    (1 - bleedthru_factor + shield_multi) * hull_multi, -current_shields * hull_multi
+                )
+            ]
+        spread = highest_damage - lowest_damage
+        
+        shields_dam = 0.0
+        hull_dam = 0.0
+        
+        for low, high, shield_slope, shield_base, hull_slope, hull_base in parts:
+            
+            if high < low or (spread > 0 and high == low):
+                continue
+            
+            weight = (high - low) / spread if spread > 0 else 1.0
+            
+            shields_dam += weight * (shield_slope * (low + high) * 0.5 + shield_base)
+            
+            hull_dam += weight * average_polarization(
+                hull_slope * low + hull_base, hull_slope * high + hull_base, polarization
+            )
+            if spread <= 0:
+                break
+        
+        def damage_to_hull(damage:float):
+            
+            for low, high, shield_slope, shield_base, hull_slope, hull_base in parts:
+                
+                if low <= damage <= high:
+                    return calculate_polarization(hull_slope * damage + hull_base, polarization)
+            return 0.0
+        
+        # more damage never means less hull damage, so the chance of destroying the ship is the chance that 
+        # the damage will be above the point where the hull damage equals the current hull
+        if damage_to_hull(highest_damage) < current_hull:
+            kill_chance = 0.0
+        elif spread <= 0 or damage_to_hull(lowest_damage) >= current_hull:
+            kill_chance = 1.0
+        else:
+            low, high = lowest_damage, highest_damage
+            
+            for i in range(24):
+                
+                middle = (low + high) * 0.5
+                
+                if damage_to_hull(middle) >= current_hull:
+                    high = middle
+                else:
+                    low = middle
+            
+            kill_chance = (highest_damage - high) / spread
+        
+        return current_shields - shields_dam, current_hull - hull_dam, shields_dam, hull_dam, kill_chance
+
     def take_damage(self, amount, text, *, damage_type:DamageType):
         
         game_data = self.game_data
@@ -1172,60 +1254,43 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         originally_derlict = old_ship_status == STATUS_DERLICT
         
         is_derlict = originally_derlict
-        try:
+        if self.capabilities & ShipCapability.SHIELDS:
             self.shield_generator.shields = new_shields
-        except AttributeError:
-            pass
         self.hull = new_hull
         
         self.hull_damage += hull_dam * 0.15
-        try:
+        
+        if self.capabilities & ShipCapability.CREW:
             self.life_support.injuries_and_deaths(wounded, killed_outright, killed_in_sickbay)
             
             if self.life_support.is_derlict:
                 is_derlict = True
-            
-        except AttributeError:
-            pass            
-        try:
+        
+        if self.capabilities & ShipCapability.SHIELDS:
             self.shield_generator.integrety -= shield_sys_damage
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.POLARIZED_HULL:
             self.polarized_hull.integrety -= polarized_hull_damage
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.BEAM_ARRAY:
             self.beam_array.integrety -= energy_weapons_sys_damage
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.CANNONS:
             self.cannons.integrety -= cannon_sys_damage
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.IMPULSE:
             self.impulse_engine.integrety -= impulse_sys_damage
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.SHIELDS:
             self.shield_generator.integrety -= shield_sys_damage
-        except AttributeError:
-            pass
         self.sensors.integrety -= sensors_sys_damage
-        try:
+        if self.capabilities & ShipCapability.WARP_DRIVE:
             self.warp_drive.integrety -= warp_drive_sys_damage
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.TORPEDOS:
             self.torpedo_launcher.integrety -= torpedo_sys_damage
-        except AttributeError:
-            pass
-        try:
+        if self.capabilities & ShipCapability.CREW:
             self.transporter.integrety -= transporter_sys_damage
-        except AttributeError:
-            pass
         self.scanner.integrety -= scanners_damage
         
+        self.clear_scan_cache()
+        
+        game_data.event_bus.publish(ShipDamaged(self.sector_coords.create_coords(), self, amount))
+        
         new_ship_status = self.ship_status
         
         new_scan = self.scan_this_ship(pre, scan_for_systems=ship_is_player, scan_for_crew=ship_is_player)
@@ -1406,8 +1471,8 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
                 
         elif not ship_originaly_destroyed:
             wc_breach = ((not old_ship_status.is_destroyed and new_ship_status is STATUS_OBLITERATED) or (
-                    random() > 0.85 and random() > self.power_generator.get_effective_value and 
-                    random() > self.power_generator.integrety) or self.power_generator.integrety == 0.0)
+                    self.rng.random() > 0.85 and self.rng.random() > self.power_generator.get_effective_value and 
+                    self.rng.random() > self.power_generator.integrety) or self.power_generator.integrety == 0.0)
             
             if ship_is_player:
                 
@@ -1444,23 +1509,9 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         time_bonus = 1.0 + (self.turn_repairing / 25.0)
         energy_regeneration_bonus = 1.0 + (self.turn_repairing / 5.0)
         
-        energy_cost = 0
-        try:
-            energy_cost += self.polarized_hull.get_energy_cost_per_turn
-        except AttributeError:
-            pass
-        try:
-            energy_cost += self.cloak.get_energy_cost_per_turn
-        except AttributeError:
-            pass
-        try:
-            energy_cost += self.shield_generator.get_energy_cost_per_turn
-        except AttributeError:
-            pass
-        try:
-            crew_readyness = self.life_support.crew_readyness
-        except AttributeError:
-            crew_readyness = 1
+        energy_cost = sum(system.get_energy_cost_per_turn for system in self.energy_using_systems)
+        
+        crew_readyness = self.life_support.crew_readyness if self.capabilities & ShipCapability.CREW else 1
 
         repair_amount = self.ship_class.damage_control * crew_readyness * time_bonus
 
@@ -1476,71 +1527,37 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         self.power_generator.energy += energy_rengerated_this_turn
 
         if not self.ship_class.is_automated:
-            self.life_support.heal_crew(0.2, randint(2, 5))
+            self.life_support.heal_crew(0.2, int(self.rng.integers(2, 6)))
             
-        repair_amount = hull_repair_factor * uniform(0.5, 1.25) * self.ship_class.max_hull
+        repair_amount = hull_repair_factor * self.rng.uniform(0.5, 1.25) * self.ship_class.max_hull
         
         perm_hull_repair = ceil(repair_amount * repair_factor.repair_permanent_hull_damage)
 
         self.hull_damage -= perm_hull_repair
         self.hull += repair_amount
         
-        self.sensors.integrety += system_repair_factor * (0.5 + random() * 0.5)
-        try:
-            self.warp_drive.integrety += system_repair_factor * (0.5 + random() * 0.5)
-        except AttributeError:
-            pass
-        try:
-            self.impulse_engine.integrety += system_repair_factor * (0.5 + random() * 0.5)
-        except AttributeError:
-            pass
-        try:
-            self.beam_array.integrety += system_repair_factor * (0.5 + random() * 0.5)
-        except AttributeError:
-            pass
-        try:
-            self.cannons.integrety += system_repair_factor * (0.5 + random() * 0.5)
-        except AttributeError:
-            pass
-        try:
-            self.shield_generator.integrety += system_repair_factor * (0.5 + random() * 0.5)
-        except AttributeError:
-            pass
-        try:
-            self.polarized_hull.integrety += system_repair_factor * (0.5 + random() * 0.5)
-        except:
-            pass
-        try:
-            self.power_generator.integrety += system_repair_factor * (0.5 + random() * 0.5)
-        except AttributeError:
-            pass
-        try:
-            self.transporter.integrety += system_repair_factor * (0.5 + random() * 0.5)
-        except AttributeError:
-            pass
-        try:            
-            self.torpedo_launcher.integrety += system_repair_factor * (0.5 + random() * 0.5)
-        except AttributeError:
-            pass
+        for system in self.repaired_systems:
+            system.integrety += system_repair_factor * (0.5 + self.rng.random() * 0.5)
     
-    def roll_to_hit(
+    def calculate_to_hit_values(
         self, enemy:Starship, *, 
         systems_used_for_accuray:Iterable[float], precision:int=1, 
-        estimated_enemy_impulse:Optional[float]=None, damage_type:DamageType, crew_readyness:float, target_crew_readyness:float
+        estimated_enemy_impulse:Optional[Union[float,np.ndarray]]=None, damage_type:DamageType, crew_readyness:float, 
+        target_crew_readyness:Union[float,np.ndarray]
     ):
-        """A method that preforms a number of calcuations to see if an attack roll succeded or not.
+        """Calculates the values that are used by roll_to_hit. The attack hits if attack_value plus a random number between 0 and 1 is greater then deffence_value.
 
         Args:
             enemy (Starship): The target that the attacker will be rolling against.
             systems_used_for_accuray (Iterable[float]): An iterable of floats. Often, these will be the effective value of the sensors system, and another system such as cannons, torpedos, or beam arrays.
             damage_type (DamageType): The type of damage. This must be onw of the DamageType constants.
             crew_readyness (float): The readyness of the crew of the attacking ship.
-            target_crew_readyness (float): The readyness of the crew of the defending ship.
+            target_crew_readyness (Union[float,np.ndarray]): The readyness of the crew of the defending ship. This may be an array of values, one for each simulation.
             precision (int, optional): The precision that is used to determin the enemy impulse (see below). Defaults to 1.
-            estimated_enemy_impulse (Optional[float], optional): This value is used to determin the defenders chance of evading the attack. If not present, then it will be estimated using the precision argument. Defaults to None.
+            estimated_enemy_impulse (Optional[Union[float,np.ndarray]], optional): This value is used to determin the defenders chance of evading the attack. If not present, then it will be estimated using the precision argument. This may be an array of values, one for each simulation. Defaults to None.
 
         Returns:
-            bool: Returns True if the attack hit the target ship, False if it missed.
+            Tuple[float, Union[float,np.ndarray]]: The attack_value and the deffence_value. If the attack can't miss, deffence_value will be negative infinity. If either estimated_enemy_impulse or target_crew_readyness were arrays, deffence_value will be an array.
         """
         assert damage_type is not DAMAGE_EXPLOSION
         
@@ -1556,11 +1573,7 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
                 precision, True
             ) * enemy.ship_class.evasion * target_crew_readyness
         else:
-            estimated_enemy_impulse *= enemy.ship_class.evasion * target_crew_readyness
-        
-        # ramming an imobile object always works!
-        if damage_type.autohit_if_target_cant_move and estimated_enemy_impulse == 0.0:
-            return True
+            estimated_enemy_impulse = estimated_enemy_impulse * enemy.ship_class.evasion * target_crew_readyness
         
         enemy_size = enemy.ship_class.size
         
@@ -1574,11 +1587,156 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         
         deffence_value = (estimated_enemy_impulse + distance_penalty) * (1 if enemy_ship_status.is_visible else 8)
         
+        # ramming an imobile object always works!
+        if damage_type.autohit_if_target_cant_move:
+            
+            if isinstance(estimated_enemy_impulse, np.ndarray):
+                deffence_value = np.where(estimated_enemy_impulse == 0.0, -np.inf, deffence_value)
+            
+            elif estimated_enemy_impulse == 0.0:
+                deffence_value = -np.inf
+        
         targeting = (sum(systems_used_for_accuray) / len(systems_used_for_accuray)) * self.ship_class.targeting
         
         attack_value = crew_readyness * targeting * (1 if enemy_ship_status.is_visible else 0.125)
         
-        return attack_value + random() > deffence_value
+        return attack_value, deffence_value
+
+    def get_to_hit_arguments(self, enemy:Starship, damage_type:DamageType):
+        """Returns the keyword arguments that are passed to roll_to_hit when this ship actually attacks the enemy.
+
+        Args:
+            enemy (Starship): The ship that is being attacked.
+            damage_type (DamageType): The type of damage.
+
+        Returns:
+            Dict[str, Union[Tuple, float]]: A dictionary with the keys systems_used_for_accuray, crew_readyness and target_crew_readyness. Energy weapons also have estimated_enemy_impulse.
+        """
+        if self.capabilities & ShipCapability.CREW:
+            crew_readyness = self.life_support.crew_readyness
+        else:
+            crew_readyness = 1
+        if enemy.capabilities & ShipCapability.CREW:
+            target_crew_readyness = enemy.life_support.crew_readyness
+        else:
+            target_crew_readyness = 1
+        
+        arguments = {
+            "crew_readyness" : crew_readyness,
+            "target_crew_readyness" : target_crew_readyness
+        }
+        if damage_type is DAMAGE_TORPEDO:
+            
+            arguments["systems_used_for_accuray"] = (
+                self.sensors.get_effective_value,
+                self.torpedo_launcher.get_effective_value
+            )
+        elif damage_type is DAMAGE_RAMMING:
+            
+            arguments["systems_used_for_accuray"] = (self.impulse_engine.get_effective_value, self.ship_class.evasion)
+        else:
+            arguments["systems_used_for_accuray"] = (
+                self.beam_array.get_effective_value,
+                self.sensors.get_effective_value
+            )
+            arguments["estimated_enemy_impulse"] = -1.0
+        
+        return arguments
+
+    def hit_probability(
+        self, enemy:Starship, damage_type:DamageType, *, 
+        precision:int=1,
+        systems_used_for_accuray:Optional[Iterable[float]]=None, 
+        estimated_enemy_impulse:Optional[float]=None, 
+        crew_readyness:Optional[float]=None, 
+        target_crew_readyness:Optional[float]=None
+    ):
+        """Works out the chance that roll_to_hit will succeed. Any argument that is None will be replaced with the value that this ship would use if it were to actually attack the enemy (see get_to_hit_arguments).
+
+        Args:
+            enemy (Starship): The target that the attacker will be rolling against.
+            damage_type (DamageType): The type of damage. This must be onw of the DamageType constants.
+            precision (int, optional): The precision that is used to determin the enemy impulse. Defaults to 1.
+            systems_used_for_accuray (Optional[Iterable[float]], optional): Defaults to None.
+            estimated_enemy_impulse (Optional[float], optional): Defaults to None.
+            crew_readyness (Optional[float], optional): Defaults to None.
+            target_crew_readyness (Optional[float], optional): Defaults to None.
+
+        Returns:
+            float: A float between 0 and 1 (inclusive)
+        """
+        if damage_type is DAMAGE_EXPLOSION:
+            return 1.0
+        
+        arguments = self.get_to_hit_arguments(enemy, damage_type)
+        
+        if systems_used_for_accuray is not None:
+            arguments["systems_used_for_accuray"] = systems_used_for_accuray
+        if estimated_enemy_impulse is not None:
+            arguments["estimated_enemy_impulse"] = estimated_enemy_impulse
+        if crew_readyness is not None:
+            arguments["crew_readyness"] = crew_readyness
+        if target_crew_readyness is not None:
+            arguments["target_crew_readyness"] = target_crew_readyness
+        
+        return chance_to_hit(*self.calculate_to_hit_values(
+            enemy, precision=precision, damage_type=damage_type, **arguments
+        ))
+    
+    def hit_probabilities(self, enemies:Iterable[Starship], damage_type:DamageType, *, precision:int=1):
+        """Works out the chance that this ship will hit each of the enemies.
+
+        Args:
+            enemies (Iterable[Starship]): The targets.
+            damage_type (DamageType): The type of damage.
+            precision (int, optional): The precision that is used to determin the enemy impulse. Defaults to 1.
+
+        Returns:
+            np.ndarray: An array of floats between 0 and 1 (inclusive), in the same order as enemies.
+        """
+        enemies = tuple(enemies)
+        
+        if damage_type is DAMAGE_EXPLOSION:
+            return np.ones(len(enemies))
+        
+        to_hit_values = np.array([
+            self.calculate_to_hit_values(
+                enemy, precision=precision, damage_type=damage_type, 
+                **self.get_to_hit_arguments(enemy, damage_type)
+            ) for enemy in enemies
+        ], dtype=float).reshape(len(enemies), 2)
+        
+        return chance_to_hit_array(to_hit_values[:,0], to_hit_values[:,1])
+
+    def roll_to_hit(
+        self, enemy:Starship, *, 
+        systems_used_for_accuray:Iterable[float], precision:int=1, 
+        estimated_enemy_impulse:Optional[float]=None, damage_type:DamageType, crew_readyness:float, target_crew_readyness:float
+    ):
+        """A method that preforms a number of calcuations to see if an attack roll succeded or not.
+
+        Args:
+            enemy (Starship): The target that the attacker will be rolling against.
+            systems_used_for_accuray (Iterable[float]): An iterable of floats. Often, these will be the effective value of the sensors system, and another system such as cannons, torpedos, or beam arrays.
+            damage_type (DamageType): The type of damage. This must be onw of the DamageType constants.
+            crew_readyness (float): The readyness of the crew of the attacking ship.
+            target_crew_readyness (float): The readyness of the crew of the defending ship.
+            precision (int, optional): The precision that is used to determin the enemy impulse (see below). Defaults to 1.
+            estimated_enemy_impulse (Optional[float], optional): This value is used to determin the defenders chance of evading the attack. If not present, then it will be estimated using the precision argument. Defaults to None.
+
+        Returns:
+            bool: Returns True if the attack hit the target ship, False if it missed.
+        """
+        attack_value, deffence_value = self.calculate_to_hit_values(
+            enemy,
+            systems_used_for_accuray=systems_used_for_accuray,
+            precision=precision,
+            estimated_enemy_impulse=estimated_enemy_impulse,
+            damage_type=damage_type,
+            crew_readyness=crew_readyness,
+            target_crew_readyness=target_crew_readyness
+        )
+        return attack_value + self.rng.random() > deffence_value
     
     def attack_energy_weapon(self, enemy:Starship, amount:float, energy_cost:float,  damage_type:DamageType):
         
@@ -1598,25 +1756,10 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
             if attacker_is_player else 
             f"The {self.name} has fired on {'us' if target_is_player else f'the {enemy.name}'}!"
         )
-        try:
-            crew_readyness=self.life_support.crew_readyness
-        except AttributeError:
-            crew_readyness=1
-        try:
-            target_crew_readyness=enemy.life_support.crew_readyness
-        except AttributeError:
-            target_crew_readyness=1
-        
         if self.roll_to_hit(
             enemy, 
-            estimated_enemy_impulse=-1.0, 
-            systems_used_for_accuray=(
-                self.beam_array.get_effective_value,
-                self.sensors.get_effective_value
-            ),
             damage_type=damage_type,
-            crew_readyness=crew_readyness,
-            target_crew_readyness=target_crew_readyness
+            **self.get_to_hit_arguments(enemy, damage_type)
         ):
             target_name = "We're" if target_is_player else f'The {enemy.name} is'
 
@@ -1641,24 +1784,10 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         
         gd = self.game_data
         
-        try:
-            crew_readyness = self.life_support.crew_readyness
-        except AttributeError:
-            crew_readyness = 1
-        try:
-            target_crew_readyness = enemy.life_support.crew_readyness
-        except AttributeError:
-            target_crew_readyness = 1
-        
         if self.roll_to_hit(
             enemy, 
-            systems_used_for_accuray=(
-                self.sensors.get_effective_value,
-                self.torpedo_launcher.get_effective_value
-            ),
             damage_type=DAMAGE_TORPEDO,
-            crew_readyness = crew_readyness,
-            target_crew_readyness = target_crew_readyness
+            **self.get_to_hit_arguments(enemy, DAMAGE_TORPEDO)
         ):
             gd.engine.message_log.add_message(f'{enemy.name} was hit by a {torp.name} torpedo from {self.name}.')
 
@@ -1683,7 +1812,8 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         simulate_systems:bool=False, 
         simulate_crew:bool=False,
         use_effective_values:bool=False,
-        target_scan:Optional[Dict[str,Union[Tuple,int,ShipStatus,ShipClass]]]
+        target_scan:Optional[Dict[str,Union[Tuple,int,ShipStatus,ShipClass]]],
+        use_estimate:bool=False
     ):
         precision = self.sensors.determin_precision
         
@@ -1693,117 +1823,24 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
             scan_for_systems=simulate_systems, 
             use_effective_values=use_effective_values
         )
-        ship_class = target_scan["class"]
-        
-        damage = torpdeo.damage
-
-        total_shield_dam = 0
-        total_hull_dam = 0
-        
-        averaged_hull = 0
-        averaged_shields = 0
-        averaged_crew_readyness = 0
-        
-        number_of_ship_kills = 0
-        
-        number_of_crew_kills = 0
-        try:
-            crew_readyness = self.life_support.crew_readyness
-        except AttributeError:
-            crew_readyness = 1
-        
-        scan_target_crew = not target.ship_class.is_automated and simulate_crew        
-
-        for s in range(number_of_simulations):
-            
-            new_scan = copy(target_scan)
-            
-            new_hull = new_scan["hull"]
-            new_shields = new_scan["shields"]
-            
-            hull_dam  = 0
-            shield_dam = 0
-            
-            for attack in range(times_to_fire):
-                try:
-                    target_crew_readyness = target.life_support.caluclate_crew_readyness(
-                        new_scan["able_crew"], new_scan["injured_crew"]
-                    ) if scan_target_crew else 1.0
-                except AttributeError:
-                    target_crew_readyness = 1.0
-                except KeyError:
-                    target_crew_readyness = 1.0
-                try:
-                    estimated_enemy_impulse = (ajust_system_integrity(
-                        new_scan["sys_impulse"]
-                    ) if use_effective_values else new_scan["sys_impulse"])
-                except KeyError:
-                    estimated_enemy_impulse = 1.0 if ship_class.evasion else 0.0
-                
-                if self.roll_to_hit(
-                    target, 
-                    estimated_enemy_impulse=estimated_enemy_impulse, 
-                    systems_used_for_accuray=(
-                        self.sensors.get_effective_value,
-                        self.torpedo_launcher.get_effective_value
-                    ),
-                    damage_type=DAMAGE_TORPEDO,
-                    crew_readyness=crew_readyness,
-                    target_crew_readyness=target_crew_readyness
-                ):
-                    new_shields, new_hull, shields_dam, hull_dam, new_shields_as_a_percent, new_hull_as_a_percent, killed_outright, killed_in_sickbay, wounded, shield_sys_damage, impulse_sys_damage, warp_drive_sys_damage, sensors_sys_damage, warp_core_sys_damage, energy_weapons_sys_damage, cannon_sys_damage, torpedo_sys_damage, cloak_sys_damage, transporter_sys_damage, polarized_hull_damage, scanners_damage = target.calculate_damage(
-                        damage, precision=precision, calculate_crew=simulate_crew, 
-                        calculate_systems=simulate_systems, scan_dict=new_scan, damage_type=DAMAGE_TORPEDO
-                    )
-                    new_scan["shields"] = new_shields
-                    new_scan["hull"] = new_hull
-                    
-                    shield_dam += shields_dam
-                    hull_dam += hull_dam
-                    
-                    if simulate_systems:
-                        
-                        new_scan["sys_impulse"] -= impulse_sys_damage
-                        new_scan["sys_shield"] -= shield_sys_damage
-                        new_scan["sys_warp_drive"] -= warp_drive_sys_damage
-                        new_scan["sys_warp_core"] -= warp_core_sys_damage
-                        new_scan["sys_polarize"] -= polarized_hull_damage
-                                                
-                    if scan_target_crew:
-                        
-                        new_scan["able_crew"] -= wounded + killed_outright
-                        new_scan["injured_crew"] += wounded - killed_in_sickbay
-                        
-                        target_crew_readyness = target.life_support.caluclate_crew_readyness(
-                            new_scan["able_crew"], new_scan["injured_crew"]
-                        )
-            total_shield_dam += shield_dam
-            total_hull_dam += hull_dam
-            
-            if new_hull <= 0:
-                number_of_ship_kills +=1
-            
-            averaged_hull += new_scan["hull"]
-            averaged_shields += new_scan["shields"]
-            
-            if scan_target_crew:
-                _crew_readyness = target.life_support.caluclate_crew_readyness(
-                    new_scan["able_crew"], new_scan["injured_crew"]
-                )
-                if _crew_readyness == 0.0:
-                    number_of_crew_kills += 1
-        
-        averaged_shields /= number_of_simulations
-        averaged_hull /= number_of_simulations
-        total_shield_dam /= number_of_simulations
-        total_hull_dam /= number_of_simulations
-        
-        if scan_target_crew:
-            averaged_crew_readyness /= number_of_simulations
-        else:
-            averaged_crew_readyness = 1.0
-        
-        return averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, number_of_ship_kills / number_of_simulations, number_of_crew_kills / number_of_simulations, averaged_crew_readyness
+        if use_estimate:
+            return estimate_torpedo_hit(
+                self, target, torpdeo.damage, target_scan, 
+                times_to_fire=times_to_fire, 
+                precision=precision, 
+                simulate_systems=simulate_systems, 
+                simulate_crew=simulate_crew, 
+                use_effective_values=use_effective_values
+            )
+        return simulate_torpedo_hit_batch(
+            self, target, torpdeo.damage, number_of_simulations, target_scan, 
+            times_to_fire=times_to_fire, 
+            precision=precision, 
+            simulate_systems=simulate_systems, 
+            simulate_crew=simulate_crew, 
+            use_effective_values=use_effective_values,
+            rng=self.decision_rng
+        )
 
     def simulate_energy_hit(
         self, target:Starship, number_of_simulations:int, energy:float, cannon:bool=False, 
@@ -1811,7 +1848,8 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         simulate_systems:bool=False, 
         simulate_crew:bool=False, 
         use_effective_values:bool=False,
-        target_scan:Optional[Dict[str,Union[Tuple,int,ShipStatus,ShipClass]]]
+        target_scan:Optional[Dict[str,Union[Tuple,int,ShipStatus,ShipClass]]],
+        use_estimate:bool=False
     ):
         """Run a number of simulations of energy weapon hits against the target ship and returns the avaraged result.
 
@@ -1822,6 +1860,7 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
             cannon (bool, optional): If true, it will simulat a cannon attack. Defaults to False.
             simulate_systems (bool, optional): If true, systems damage will be taken into account. Defaults to False.
             simulate_crew (bool, optional): If true, crew deaths and injuries will be taken into account. Defaults to False.
+            use_estimate (bool, optional): If true, the expected result will be worked out directly instead of being simulated. Defaults to False.
 
         Returns:
             tuple[float, float, float, float, float, float, float]: A tuple containing float values for the following: averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, averaged_number_of_ship_kills, averaged_number_of_crew_kills, averaged_crew_readyness
@@ -1834,110 +1873,31 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
             scan_for_crew=simulate_crew, 
             use_effective_values=use_effective_values
         )
-        ship_class = target_scan["class"]
-        try:
-            targ_shield = target_scan["shields"]
-        except KeyError:
-            targ_shield = 0
-            
-        targ_hull = target_scan["hull"]
-
-        total_shield_dam = 0
-        total_hull_dam = 0
-        
-        averaged_shields = 0
-        averaged_hull = 0
-        
-        averaged_crew_readyness = 0
-        
-        number_of_ship_kills = 0
-        
-        number_of_crew_kills = 0
-        
         damage_type, _amount = (
             DAMAGE_CANNON, self.cannons.get_max_effective_cannon_firepower
         ) if cannon else (
             DAMAGE_BEAM, self.beam_array.get_max_effective_beam_firepower
         )
         amount = min(self.power_generator.energy, _amount, energy)
-        try:
-            crew_readyness = self.life_support.crew_readyness
-        except AttributeError:
-            crew_readyness = 1
         
-        scan_target_crew = not target.ship_class.is_automated and simulate_crew
-        try:
-            target_crew_readyness = target.life_support.caluclate_crew_readyness(
-                target_scan["able_crew"], target_scan["injured_crew"]
-            ) if scan_target_crew else 1.0
-        except AttributeError:
-            target_crew_readyness = 1.0
-        except KeyError:
-            target_crew_readyness = 1.0
-        try:
-            estimated_enemy_impulse = (ajust_system_integrity(
-                target_scan["sys_impulse"]
-            ) if use_effective_values else target_scan["sys_impulse"])
-        except KeyError:
-            estimated_enemy_impulse = 1.0 if ship_class.evasion else 0.0
-                
-        for i in range(number_of_simulations):
-            
-            if self.roll_to_hit(
-                target, 
+        if use_estimate:
+            return estimate_energy_hit(
+                self, target, amount, target_scan, 
+                damage_type=damage_type, 
                 precision=precision, 
-                systems_used_for_accuray=(
-                    self.sensors.get_effective_value,
-                    self.beam_array.get_effective_value
-                ),
-                damage_type=damage_type,
-                crew_readyness=crew_readyness,
-                target_crew_readyness=target_crew_readyness
-            ):
-                new_shields, new_hull, shields_dam, hull_dam, new_shields_as_a_percent, new_hull_as_a_percent, killed_outright, killed_in_sickbay, wounded, shield_sys_damage, impulse_sys_damage, warp_drive_sys_damage, sensors_sys_damage,warp_core_sys_damage, energy_weapons_sys_damage, cannon_sys_damage, torpedo_sys_damage, cloak_sys_damage, transporter_sys_damage, polarized_hull_damage, scanners_damage = target.calculate_damage(
-                    amount, precision=precision, calculate_crew=scan_target_crew, 
-                    calculate_systems=simulate_systems, 
-                    use_effective_values=use_effective_values,
-                    scan_dict=target_scan, damage_type=damage_type
-                )
-                averaged_shields += new_shields
-                averaged_hull += new_hull
-                total_shield_dam += shields_dam
-                total_hull_dam += hull_dam
-                
-                if new_hull <= 0:
-                    number_of_ship_kills+=1
-                
-                if scan_target_crew:
-                    able_crew = target_scan["able_crew"] - (wounded + killed_outright)
-                    injured_crew = target_scan["injured_crew"] - killed_in_sickbay
-                    try:
-                        averaged_crew_readyness += target.life_support.caluclate_crew_readyness(able_crew, injured_crew)
-                    except AttributeError:
-                        averaged_crew_readyness += 1
-                    
-                    if able_crew + injured_crew == 0:
-                        
-                        number_of_crew_kills += 1
-                else:
-                    averaged_crew_readyness += 1
-            else:
-                averaged_shields += targ_shield
-                averaged_hull += targ_hull
-                
-        averaged_shields /= number_of_simulations
-        averaged_hull /= number_of_simulations
-        total_shield_dam /= number_of_simulations
-        total_hull_dam /= number_of_simulations
-        averaged_number_of_ship_kills = number_of_ship_kills / number_of_simulations
-        averaged_number_of_crew_kills = number_of_crew_kills / number_of_simulations
-        
-        if scan_target_crew:
-            averaged_crew_readyness /= number_of_simulations
-        else:
-            averaged_crew_readyness = 1.0
-        
-        return averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, averaged_number_of_ship_kills, averaged_number_of_crew_kills, averaged_crew_readyness
+                simulate_systems=simulate_systems, 
+                simulate_crew=simulate_crew, 
+                use_effective_values=use_effective_values
+            )
+        return simulate_energy_hit_batch(
+            self, target, amount, number_of_simulations, target_scan, 
+            damage_type=damage_type, 
+            precision=precision, 
+            simulate_systems=simulate_systems, 
+            simulate_crew=simulate_crew, 
+            use_effective_values=use_effective_values,
+            rng=self.decision_rng
+        )
 
     def simulate_ram_attack(
         self, target:Starship, number_of_simulations:int, 
@@ -1945,7 +1905,8 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         simulate_systems:bool=False, 
         simulate_crew:bool=False,
         use_effective_values:bool=False,
-        target_scan:Optional[Dict[str,Union[Tuple,int,ShipStatus,ShipClass]]]
+        target_scan:Optional[Dict[str,Union[Tuple,int,ShipStatus,ShipClass]]],
+        use_estimate:bool=False
     ):
         precision = self.sensors.determin_precision
 
@@ -1953,100 +1914,30 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
             precision, scan_for_systems=simulate_systems, scan_for_crew=simulate_crew, 
             use_effective_values=use_effective_values
         )
-        ship_class = target_scan["class"]
-        
-        targ_shield = target_scan["shields"]
-        targ_hull = target_scan["hull"]
-
-        total_shield_dam = 0
-        total_hull_dam = 0
-        
-        averaged_shields = 0
-        averaged_hull = 0
-        
-        averaged_crew_readyness = 0
-        
-        number_of_ship_kills = 0
-        
-        number_of_crew_kills = 0
-        
         self_status = self.ship_status
+        if self.capabilities & ShipCapability.SHIELDS:
+            self_shields = self.shield_generator.shields if self_status.do_shields_work else 0
+        else:
+            self_shields = 0
         
-        self_hp = (self.shield_generator.shields if self_status.do_shields_work else 0) + self.hull
-        
-        self_damage = self_hp + self.ship_class.max_hull * 0.5
-        try:
-            crew_readyness = self.life_support.crew_readyness
-        except AttributeError:
-            crew_readyness = 1
-        try:
-            target_crew_readyness = target.life_support.caluclate_crew_readyness(
-                target_scan["able_crew"], target_scan["injured_crew"]
-            ) if scan_target_crew else 1.0
-        except AttributeError:
-            target_crew_readyness = 1.0
-        except KeyError:
-            target_crew_readyness = 1.0
-        try:
-            estimated_enemy_impulse = (ajust_system_integrity(
-                target_scan["sys_impulse"]
-            ) if use_effective_values else target_scan["sys_impulse"])
-        except KeyError:
-            estimated_enemy_impulse = 1.0 if ship_class.evasion else 0.0
+        self_damage = self_shields + self.hull + self.ship_class.max_hull * 0.5
         
-        scan_target_crew = not target.ship_class.is_automated and simulate_crew
-                
-        for i in range(number_of_simulations):
-            
-            to_hit = self.roll_to_hit(
-                target, 
-                damage_type=DAMAGE_RAMMING,
-                crew_readyness=crew_readyness,
-                target_crew_readyness=target_crew_readyness,
-                systems_used_for_accuray=[self.impulse_engine.get_effective_value, self.ship_class.evasion],
-                estimated_enemy_impulse=estimated_enemy_impulse
+        if use_estimate:
+            return estimate_ram_attack(
+                self, target, self_damage, target_scan, 
+                precision=precision, 
+                simulate_systems=simulate_systems, 
+                simulate_crew=simulate_crew, 
+                use_effective_values=use_effective_values
             )
-            if to_hit:
-                
-                new_shields, new_hull, shields_dam, hull_dam, new_shields_as_a_percent, new_hull_as_a_percent, killed_outright, killed_in_sickbay, wounded, shield_sys_damage, impulse_sys_damage, warp_drive_sys_damage, sensors_sys_damage, warp_core_sys_damage, energy_weapons_sys_damage, cannon_sys_damage, torpedo_sys_damage, cloak_sys_damage, transporter_sys_damage, polarized_hull_damage, scanners_damage = target.calculate_damage(
-                    self_damage, 
-                    scan_dict=target_scan, 
-                    damage_type=DAMAGE_RAMMING
-                )
-                averaged_shields += new_shields
-                averaged_hull += new_hull
-                total_shield_dam += shields_dam
-                total_hull_dam += hull_dam
-                
-                if new_hull <= 0:
-                    number_of_ship_kills+=1
-                
-                if scan_target_crew:
-                    able_crew = target_scan["able_crew"] - (wounded + killed_outright)
-                    injured_crew = target_scan["injured_crew"] - killed_in_sickbay
-                    
-                    averaged_crew_readyness += target.life_support.caluclate_crew_readyness(able_crew, injured_crew)
-                    
-                    if able_crew + injured_crew == 0:
-                        
-                        number_of_crew_kills += 1
-            else:
-                averaged_shields += targ_shield
-                averaged_hull += targ_hull
-                
-        averaged_shields /= number_of_simulations
-        averaged_hull /= number_of_simulations
-        total_shield_dam /= number_of_simulations
-        total_hull_dam /= number_of_simulations
-        averaged_number_of_ship_kills = number_of_ship_kills / number_of_simulations
-        averaged_number_of_crew_kills = number_of_crew_kills / number_of_simulations
-        
-        if scan_target_crew:
-            averaged_crew_readyness /= number_of_simulations
-        else:
-            averaged_crew_readyness = 1.0
-        
-        return averaged_shields, averaged_hull, total_shield_dam, total_hull_dam, averaged_number_of_ship_kills, averaged_number_of_crew_kills, averaged_crew_readyness
+        return simulate_ram_attack_batch(
+            self, target, self_damage, number_of_simulations, target_scan, 
+            precision=precision, 
+            simulate_systems=simulate_systems, 
+            simulate_crew=simulate_crew, 
+            use_effective_values=use_effective_values,
+            rng=self.decision_rng
+        )
 
     def check_torpedo_los(self, target:Starship):
         """Returns a float that examins the chance of a torpedo hitting an intended target.
@@ -2059,42 +1950,21 @@ f'Caught in the {"auto destruct radius" if self_destruct else "warp core breach"
         """
         game_data = self.game_data
 
-        # Normalize the x and y direction
-        c:Coords = Coords(
-            target.local_coords.x - self.local_coords.x, target.local_coords.y - self.local_coords.y
+        # the paths between ships are shared by every ship in the sub sector, and are only worked out again after something moves
+        ship_ids = self.get_sub_sector.get_line_of_fire().get_ships_hit(
+            self, target.local_coords.x, target.local_coords.y
         )
-        dirX, dirY  = c.normalize()
         
-        g:SubSector = self.get_sub_sector
-
-        torp_positions = get_lookup_table(
-            direction_x=dirX, direction_y=dirY, normalise_direction=False
-        )
-        # Create dictionary of positions and ships for ships in the same system that are are not obliterated
-        ship_positions = {
-            ship.local_coords.create_coords() : ship for ship in 
-            game_data.grab_ships_in_same_sub_sector(self, accptable_ship_statuses={STATUS_ACTIVE, STATUS_DERLICT, STATUS_HULK})
-        }
         score = []
-
-        for pos in torp_positions:
-            x = pos.x + self.local_coords.x
-            y = pos.y + self.local_coords.y
+        
+        for ship_id in ship_ids:
             
-            if x not in game_data.subsec_size_range_x or y not in game_data.subsec_size_range_y:
-                break
-
-            ajusted_pos = Coords(x=pos.x+self.local_coords.x, y=pos.y+self.local_coords.y)
-
-            if ajusted_pos in g.stars_dict or ajusted_pos in g.planets_dict:
-                break
-            try:
-                hit_ship = ship_positions[ajusted_pos]
+            hit_ship = game_data.get_ship_by_id(ship_id)
+            
+            if hit_ship is not self and hit_ship.ship_status in {STATUS_ACTIVE, STATUS_DERLICT, STATUS_HULK}:
                 score.append(
                     0 if hit_ship.is_controllable == self.is_controllable else 1
                 )
-            except KeyError:
-                pass
         
         number_of_ship_hits = len(score)
                 
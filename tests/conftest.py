@@ -0,0 +1,33 @@
+import pytest
+
+from ai import AllyAI, MediumEnemy
+from engine import set_up_game
+from scenario import ALL_SCENERIOS
+
+@pytest.fixture
+def new_game():
+    """Returns a function that sets up a game of DOM_STRIKE with the same settings as headless.py uses. Any keyword arguments are passed on to set_up_game.
+    """
+    def _new_game(**kwargs):
+        
+        scenario = ALL_SCENERIOS["DOM_STRIKE"]
+        
+        engine = set_up_game(
+            easy_aim=False,
+            easy_move=False,
+            easy_warp=False,
+            torpedo_warning=False,
+            crash_warning=False,
+            three_d_movment=False,
+            ship_name=scenario.default_ship_name,
+            captain_name=scenario.default_captain_name,
+            scenario=scenario,
+            difficulty=MediumEnemy,
+            allied_ai=AllyAI,
+            **kwargs
+        )
+        engine.message_log.print_messages = False
+        
+        return engine
+    
+    return _new_game
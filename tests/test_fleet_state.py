@@ -0,0 +1,52 @@
+from math import floor
+
+def damage_power_generators(ships):
+    """Damages the power generators of the ships, so that their max energy usualy isn't a whole number, and fills them up to it.
+    """
+    for ship in ships:
+        
+        # an integrety of 0.5 has an effective value of 0.625
+        ship.power_generator.integrety = 0.5
+        ship.power_generator.energy = ship.ship_class.max_energy
+    
+    assert any(ship.power_generator.get_max_energy % 1 for ship in ships)
+
+def test_energy_is_capped_at_a_whole_number(new_game):
+    
+    engine = new_game()
+    ships = engine.game_data.total_starships
+    
+    damage_power_generators(ships)
+    
+    for ship in ships:
+    
+        assert ship.power_generator.energy == floor(ship.power_generator.get_max_energy)
+
+def test_upkeep_with_damaged_power_generators(new_game):
+    
+    engine = new_game(use_fleet_state=True)
+    game_data = engine.game_data
+    ships = game_data.total_starships
+    
+    damage_power_generators(ships)
+    
+    game_data.fleet_state.handle_repair_and_energy_consumption(ship.fleet_row for ship in ships)
+    
+    for ship in ships:
+    
+        energy = ship.power_generator.energy
+        
+        assert isinstance(energy, int)
+        assert 0 <= energy <= floor(ship.power_generator.get_max_energy)
+
+def test_upkeep_matches_starship_with_damaged_power_generators(new_game):
+    
+    engine = new_game(use_fleet_state=True)
+    game_data = engine.game_data
+    ships = game_data.total_starships
+    
+    damage_power_generators(ships)
+    
+    for ship in ships:
+    
+        assert game_data.fleet_state.compare_upkeep(ship) == {}
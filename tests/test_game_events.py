@@ -0,0 +1,57 @@
+from ai import NEARBYE_SHIP_STATUSES
+from get_config import CONFIG_OBJECT
+from order import WarpOrder, WarpTravelOrder
+
+def expected_ships_near_player(game_data):
+    
+    player = game_data.player
+    
+    ships = [
+        ship for ship in game_data.grid[player.sector_coords.y][player.sector_coords.x].ships 
+        if ship is not player and ship.ship_status in NEARBYE_SHIP_STATUSES
+    ]
+    return ships, [ship for ship in ships if ship.ship_status.is_visible]
+
+def check_ships_near_player(game_data):
+    
+    ships, visible_ships = expected_ships_near_player(game_data)
+    
+    assert game_data.ships_in_same_sub_sector_as_player == ships
+    assert game_data.visible_ships_in_same_sub_sector_as_player == visible_ships
+
+def test_ships_near_player_follow_warp(new_game):
+    
+    engine = new_game()
+    game_data = engine.game_data
+    player = engine.player
+    
+    check_ships_near_player(game_data)
+    
+    # warp to the far side of the map, so that the player passes through several sub sectors on the way
+    x = 0 if player.sector_coords.x >= CONFIG_OBJECT.sector_width // 2 else CONFIG_OBJECT.sector_width - 1
+    y = player.sector_coords.y
+    
+    player.power_generator.energy = player.ship_class.max_energy
+    
+    engine.perform_order(
+        WarpOrder.from_coords(
+            entity=player, x=x, y=y, speed=1, start_x=player.sector_coords.x, start_y=player.sector_coords.y
+        )
+    )
+    engine.advance_turn()
+    
+    check_ships_near_player(game_data)
+    
+    sub_sectors_visited = {player.sector_coords.create_coords()}
+    
+    while player.warp_drive.is_at_warp:
+        
+        engine.perform_order(WarpTravelOrder(player))
+        engine.advance_turn()
+        
+        check_ships_near_player(game_data)
+        
+        sub_sectors_visited.add(player.sector_coords.create_coords())
+    
+    assert player.sector_coords.x == x and player.sector_coords.y == y
+    assert len(sub_sectors_visited) > 2